@@ -1,82 +1,3581 @@
+import time
+
+_T_START = time.perf_counter()  # process start, for the time-to-first-paint metric
+
+import argparse
+import ast
+import bisect
+import json
+import os
+import platform
+import queue
+import sys
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict, deque
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+
+import numpy as np
+
+# Matplotlib (and its Tk backend) is imported where it is first used, so the
+# window can appear before the plotting stack has loaded.
+
+
+# -----------------------------
+# Math helpers (Unit 2 focused)
+# -----------------------------
+
+def parabola_xy(t, a=1.0, h=0.0, k=0.0):
+    # y = a(x-h)^2 + k, param x = t
+    x = t
+    y = a * (t - h) ** 2 + k
+    return x, y
+
+def ellipse_xy(theta, a=3.0, b=2.0, h=0.0, k=0.0):
+    # (x-h)^2/a^2 + (y-k)^2/b^2 = 1
+    x = h + a * np.cos(theta)
+    y = k + b * np.sin(theta)
+    return x, y
+
+def hyperbola_xy(t, a=2.0, b=1.5, h=0.0, k=0.0, branch=1):
+    # (x-h)^2/a^2 - (y-k)^2/b^2 = 1
+    # param: x = h + branch*a*cosh(t), y = k + b*sinh(t)
+    x = h + branch * a * np.cosh(t)
+    y = k + b * np.sinh(t)
+    return x, y
+
+def motion_ellipse(t, a=3.0, b=2.0, omega=1.0, h=0.0, k=0.0):
+    # x = h + a cos(omega t), y = k + b sin(omega t)
+    x = h + a * np.cos(omega * t)
+    y = k + b * np.sin(omega * t)
+    return x, y
+
+def motion_ellipse_v(t, a=3.0, b=2.0, omega=1.0):
+    # dx/dt = -a*omega*sin(omega t), dy/dt = b*omega*cos(omega t)
+    vx = -a * omega * np.sin(omega * t)
+    vy =  b * omega * np.cos(omega * t)
+    return vx, vy
+
+def motion_ellipse_a(t, a=3.0, b=2.0, omega=1.0):
+    # d2x/dt2 = -a*omega^2*cos(omega t), d2y/dt2 = -b*omega^2*sin(omega t)
+    ax = -a * (omega ** 2) * np.cos(omega * t)
+    ay = -b * (omega ** 2) * np.sin(omega * t)
+    return ax, ay
+
+def motion_parabola_param(t, p=1.0, speed=1.0, h=0.0, k=0.0):
+    # A simple param curve shaped like a parabola:
+    # x = h + speed*t, y = k + p*(speed*t)^2
+    u = speed * t
+    x = h + u
+    y = k + p * (u ** 2)
+    return x, y
+
+def motion_parabola_v(t, p=1.0, speed=1.0):
+    # x = speed*t, y = p*(speed*t)^2
+    # vx = speed
+    # vy = 2p*(speed*t)*speed = 2p*speed^2*t
+    vx = speed
+    vy = 2.0 * p * (speed ** 2) * t
+    return vx, vy
+
+def motion_parabola_a(t, p=1.0, speed=1.0):
+    # ax = 0
+    # ay = 2p*speed^2
+    ax = 0.0
+    ay = 2.0 * p * (speed ** 2)
+    return ax, ay
+
+
+# -----------------------------
+# Batched helpers (curve families)
+# -----------------------------
+# Same formulas as above, but a, b, h, k, ... may be arrays of shape (N,).
+# They broadcast against the sample grid t of shape (M,) and every result
+# is (N, M): one row per curve, evaluated in a single vectorized call.
+
+def _per_curve(*params):
+    # (N,) -> (N, 1) so parameters run down the rows and samples across
+    return [np.asarray(v, dtype=float)[..., np.newaxis] for v in params]
+
+def parabola_xy_batch(t, a=1.0, h=0.0, k=0.0):
+    a, h, k = _per_curve(a, h, k)
+    y = a * (t - h) ** 2 + k
+    return np.broadcast_arrays(np.asarray(t, dtype=float), y)
+
+def ellipse_xy_batch(theta, a=3.0, b=2.0, h=0.0, k=0.0):
+    a, b, h, k = _per_curve(a, b, h, k)
+    c, s = np.cos(theta), np.sin(theta)  # shared by every curve in the family
+    return np.broadcast_arrays(h + a * c, k + b * s)
+
+def hyperbola_xy_batch(t, a=2.0, b=1.5, h=0.0, k=0.0, branch=1):
+    a, b, h, k, branch = _per_curve(a, b, h, k, branch)
+    return np.broadcast_arrays(h + branch * a * np.cosh(t), k + b * np.sinh(t))
+
+def motion_ellipse_batch(t, a=3.0, b=2.0, omega=1.0, h=0.0, k=0.0):
+    a, b, omega, h, k = _per_curve(a, b, omega, h, k)
+    wt = omega * t
+    return np.broadcast_arrays(h + a * np.cos(wt), k + b * np.sin(wt))
+
+def motion_ellipse_v_batch(t, a=3.0, b=2.0, omega=1.0):
+    a, b, omega = _per_curve(a, b, omega)
+    wt = omega * t
+    return np.broadcast_arrays(-a * omega * np.sin(wt), b * omega * np.cos(wt))
+
+def motion_ellipse_a_batch(t, a=3.0, b=2.0, omega=1.0):
+    a, b, omega = _per_curve(a, b, omega)
+    wt = omega * t
+    w2 = omega ** 2
+    return np.broadcast_arrays(-a * w2 * np.cos(wt), -b * w2 * np.sin(wt))
+
+def motion_parabola_param_batch(t, p=1.0, speed=1.0, h=0.0, k=0.0):
+    p, speed, h, k = _per_curve(p, speed, h, k)
+    u = speed * t
+    return np.broadcast_arrays(h + u, k + p * (u ** 2))
+
+def motion_parabola_v_batch(t, p=1.0, speed=1.0):
+    p, speed = _per_curve(p, speed)
+    t = np.asarray(t, dtype=float)
+    return np.broadcast_arrays(speed, 2.0 * p * (speed ** 2) * t)
+
+def motion_parabola_a_batch(t, p=1.0, speed=1.0):
+    p, speed = _per_curve(p, speed)
+    t = np.asarray(t, dtype=float)
+    return np.broadcast_arrays(np.zeros_like(t), 2.0 * p * (speed ** 2) + 0.0 * t)
+
+def curve_family_collection(x, y, **kwargs):
+    # (N, M) x and y -> one LineCollection with N polylines (one artist, one draw call)
+    from matplotlib.collections import LineCollection
+
+    return LineCollection(np.stack((x, y), axis=-1), **kwargs)
+
+
+# -----------------------------
+# Sample tables (unit curves)
+# -----------------------------
+# Each curve above is a scale + shift of a fixed unit curve, so the trig
+# only runs once per (kind, n, range); renders apply a, b, h, k in place.
+
+PIXEL_TOL = 0.1  # max chord-to-curve distance in screen pixels for adaptive sampling
+
+def _unit_xy(kind, t):
+    if kind == "ellipse":
+        return np.cos(t), np.sin(t)
+    if kind == "hyperbola":
+        return np.cosh(t), np.sinh(t)
+    if kind == "parabola":
+        return t, t ** 2
+    raise ValueError(f"Unknown curve kind: {kind}")
+
+def _freeze(t, ux, uy):
+    for arr in (t, ux, uy):
+        arr.flags.writeable = False
+    return t, ux, uy
+
+def _unit_table(kind, n, t0, t1):
+    t = np.linspace(t0, t1, n)
+    ux, uy = _unit_xy(kind, t)
+    return _freeze(t, ux, uy)
+
+def adaptive_table(xy, t0, t1, wx, wy, tol=PIXEL_TOL, n0=17, max_n=4097):
+    # Start coarse and split every interval whose chord midpoint misses the
+    # curve by more than tol pixels. That miss is ~ curvature * step^2 / 8, so
+    # flat stretches stay coarse and tight bends get refined.
+    # xy(t) -> (ux, uy); wx, wy: screen pixels per unit of ux, uy.
+    if not t1 > t0:
+        empty = np.empty(0)
+        return _freeze(empty, empty, empty)
+    t = np.linspace(t0, t1, n0)
+    ux, uy = xy(t)
+    while t.size < max_n:
+        tm = 0.5 * (t[:-1] + t[1:])
+        mx, my = xy(tm)
+        ex = wx * (mx - 0.5 * (ux[:-1] + ux[1:]))
+        ey = wy * (my - 0.5 * (uy[:-1] + uy[1:]))
+        err = ex * ex + ey * ey
+        split = np.flatnonzero(err > tol * tol)
+        if split.size == 0:
+            break
+        room = max_n - t.size
+        if split.size > room:
+            # Out of budget: spend what is left on the worst intervals
+            split = np.sort(split[np.argsort(err[split])[::-1][:room]])
+        t = np.insert(t, split + 1, tm[split])
+        ux = np.insert(ux, split + 1, mx[split])
+        uy = np.insert(uy, split + 1, my[split])
+    return _freeze(t, ux, uy)
+
+def adaptive_unit_table(kind, t0, t1, wx, wy, tol=PIXEL_TOL, n0=17, max_n=4097):
+    # wx, wy: curve scale times axes scale
+    return adaptive_table(lambda t: _unit_xy(kind, t), t0, t1, wx, wy, tol, n0, max_n)
+
+def _quantize_up(w):
+    # Round a pixel scale up to the next 1/8 octave so nearby zooms share a table
+    return float(2.0 ** (np.ceil(8.0 * np.log2(max(w, 1e-9))) / 8.0))
+
+class SampleTableCache:
+    # (kind, n, t0, t1) -> (t, ux, uy), least recently used table evicted first.
+    # Shared by the Tk thread and the compute worker, hence the lock.
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.tables = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def _lookup(self, key, build):
+        with self._lock:
+            table = self.tables.get(key)
+            if table is not None:
+                self.tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+            table = build()
+            self.tables[key] = table
+            if len(self.tables) > self.maxsize:
+                self.tables.popitem(last=False)
+            return table
+
+    def get(self, kind, n, t0, t1):
+        n, t0, t1 = int(n), float(t0), float(t1)
+        return self._lookup((kind, n, t0, t1), lambda: _unit_table(kind, n, t0, t1))
+
+    def get_adaptive(self, kind, t0, t1, wx, wy, tol=PIXEL_TOL):
+        # Range is widened to a 1e-3 grid and scales rounded up, so the cached
+        # table always covers the request at least as finely as asked.
+        t0 = float(np.floor(t0 * 1000.0) / 1000.0)
+        t1 = float(np.ceil(t1 * 1000.0) / 1000.0)
+        wx, wy = _quantize_up(wx), _quantize_up(wy)
+        key = ("adaptive", kind, t0, t1, wx, wy, float(tol))
+        return self._lookup(key, lambda: adaptive_unit_table(kind, t0, t1, wx, wy, tol))
+
+    def get_custom(self, fx, fy, args, t0, t1, ppu, tol=PIXEL_TOL):
+        # Custom x(t), y(t) samples (not a unit curve): keyed by the expression
+        # text and the parameter values it reads, in data units before h, k.
+        t0, t1, ppu = float(t0), float(t1), _quantize_up(ppu)
+        key = ("custom", fx.text, fy.text, args, t0, t1, ppu, float(tol))
+
+        def xy(t):
+            with np.errstate(all="ignore"):
+                return fx.f(t, *args), fy.f(t, *args)
+        return self._lookup(key, lambda: adaptive_table(xy, t0, t1, ppu, ppu, tol))
+
+SAMPLE_TABLES = SampleTableCache()
+
+
+# -----------------------------
+# Viewport clipping
+# -----------------------------
+# Parameter intervals that keep a curve inside (slightly padded) axes limits,
+# solved in closed form so no samples are spent off-screen. None = not visible.
+
+def _pad_limits(xlim, ylim, frac=0.05):
+    dx = frac * (xlim[1] - xlim[0])
+    dy = frac * (ylim[1] - ylim[0])
+    return (xlim[0] - dx, xlim[1] + dx), (ylim[0] - dy, ylim[1] + dy)
+
+def hyperbola_t_range(a, b, h, k, branch, xlim, ylim):
+    # x = h + branch*a*cosh(t) within xlim  ->  cosh(t) <= X
+    # y = k + b*sinh(t) within ylim        ->  t between the two asinh roots
+    (xmin, xmax), (ymin, ymax) = _pad_limits(xlim, ylim)
+    if a == 0:
+        return None
+    X = ((xmax - h) if branch * a > 0 else (h - xmin)) / abs(a)
+    if X < 1.0:
+        return None
+    tx = float(np.arccosh(X))
+    if b == 0:
+        if not ymin <= k <= ymax:
+            return None
+        ty0, ty1 = -tx, tx
+    else:
+        ty0, ty1 = sorted((float(np.arcsinh((ymin - k) / b)), float(np.arcsinh((ymax - k) / b))))
+    t0, t1 = max(-tx, ty0), min(tx, ty1)
+    return (t0, t1) if t0 < t1 else None
+
+def parabola_t_range(a, h, k, xlim, ylim):
+    # x = t within xlim, y = a(t-h)^2 + k within ylim  ->  |t - h| <= r
+    (xmin, xmax), (ymin, ymax) = _pad_limits(xlim, ylim)
+    t0, t1 = xmin, xmax
+    if a != 0:
+        reach = (ymax - k) / a if a > 0 else (ymin - k) / a
+        if reach < 0:
+            return None
+        r = float(np.sqrt(reach))
+        t0, t1 = max(t0, h - r), min(t1, h + r)
+    else:
+        if not ymin <= k <= ymax:
+            return None
+    return (t0, t1) if t0 < t1 else None
+
+def motion_parabola_t_range(p, speed, h, k, xlim, ylim, t_min=-3.0, t_max=3.0):
+    # x = h + u, y = k + p*u^2 with u = speed*t: clip u like a parabola with vertex (h, k)
+    rng = parabola_t_range(p, h, k, xlim, ylim)
+    if rng is None or speed == 0:
+        return None
+    u0, u1 = rng[0] - h, rng[1] - h
+    t0, t1 = sorted((u0 / speed, u1 / speed))
+    t0, t1 = max(t0, t_min), min(t1, t_max)
+    return (t0, t1) if t0 < t1 else None
+
+def curve_xy_into(kind, table, out_x, out_y, a=1.0, b=1.0, h=0.0, k=0.0, branch=1):
+    # Same curves as parabola_xy / ellipse_xy / hyperbola_xy, written into out_x, out_y
+    _t, ux, uy = table
+    if kind == "parabola":
+        # y = a(t-h)^2 + k = a t^2 - 2ah t + (ah^2 + k), x = t
+        np.multiply(ux, -2.0 * a * h, out=out_x)
+        np.multiply(uy, a, out=out_y)
+        out_y += out_x
+        out_y += a * h * h + k
+        np.copyto(out_x, ux)
+    elif kind == "ellipse":
+        np.multiply(ux, a, out=out_x)
+        out_x += h
+        np.multiply(uy, b, out=out_y)
+        out_y += k
+    else:  # hyperbola
+        np.multiply(ux, branch * a, out=out_x)
+        out_x += h
+        np.multiply(uy, b, out=out_y)
+        out_y += k
+    return out_x, out_y
+
+def motion_parabola_into(table, out_x, out_y, p=1.0, speed=1.0, h=0.0, k=0.0):
+    # Same path as motion_parabola_param, from a "parabola" table over t
+    _t, ut, ut2 = table
+    np.multiply(ut, speed, out=out_x)
+    out_x += h
+    np.multiply(ut2, p * (speed ** 2), out=out_y)
+    out_y += k
+    return out_x, out_y
+
+
+# -----------------------------
+# General conics
+# -----------------------------
+# Ax^2 + Bxy + Cy^2 + Dx + Ey + F = 0. Real ellipses, parabolas and
+# hyperbolas are rotated and translated onto the parametric curves above;
+# anything else (a pair of lines, a point) is extracted from a grid of
+# values with marching squares.
+
+GENERAL_CONIC = "General conic"
+CURVE_TYPES = ["Parabola", "Ellipse", "Hyperbola", GENERAL_CONIC]
+CONIC_COEFS = ("A", "B", "C", "D", "E", "F")
+CONIC_DEFAULTS = {"A": 1.0, "B": 1.0, "C": 1.0, "D": 0.0, "E": 0.0, "F": -9.0}  # a rotated ellipse
+CONIC_EPS = 1e-9        # relative size below which a determinant counts as zero
+CONIC_CELL_PX = 2.0     # marching-squares cell size in screen pixels
+CONIC_MAX_CELLS = 1024  # per side
+CONIC_DOT_PX = 4.0      # a one-point conic is drawn as a dot this wide
+
+def shift_conic(coefs, h, k):
+    # The same conic moved by (h, k): substitute x - h, y - k
+    A, B, C, D, E, F = coefs
+    return (A, B, C, D - 2*A*h - B*k, E - B*h - 2*C*k, F + A*h*h + B*h*k + C*k*k - D*h - E*k)
+
+def conic_value(coefs, x, y):
+    A, B, C, D, E, F = coefs
+    return A*x*x + B*x*y + C*y*y + D*x + E*y + F
+
+def classify_conic(coefs):
+    # -> (name, form). With form = (kind, center, R, args) the curve is
+    # center + R @ u for u on a centered helper curve:
+    #   ("ellipse", ..., (a, b))     u = ellipse_xy(theta, a, b)
+    #   ("hyperbola", ..., (a, b))   u = hyperbola_xy(t, a, b), both branches
+    #   ("parabola", ..., (a, h, k)) u = parabola_xy(t, a, h, k)
+    #   ("point", ..., ())           u = (0, 0)
+    #   ("line", ..., ())            u = (0, v), a double line
+    # R's columns are the conic's axes. form is None for the other degenerate
+    # cases, which cross zero and are traced from a grid. A point or double
+    # line only touches zero, so no grid would find it.
+    A, B, C, D, E, F = (float(c) for c in coefs)
+    scale = max(abs(c) for c in (A, B, C, D, E, F))
+    if scale == 0:
+        return "not a curve", None
+    eps = CONIC_EPS * scale
+    M = np.array([[A, B / 2], [B / 2, C]])
+    w, V = np.linalg.eigh(M)  # eigenvalues ascending, orthonormal axes
+    det2 = A * C - B * B / 4
+    if np.max(np.abs(w)) < eps:
+        return ("line" if abs(D) + abs(E) > eps else "not a curve"), None
+
+    if abs(det2) > eps * scale:
+        # Central conic: lambda1 u^2 + lambda2 v^2 + f(center) = 0
+        center = np.linalg.solve(M, [-D / 2, -E / 2])
+        f0 = F + (D * center[0] + E * center[1]) / 2
+        if abs(f0) < eps:
+            if det2 > 0:
+                return "point", ("point", center, V, ())
+            return "pair of lines", None
+        r = -f0 / w
+        if det2 > 0:
+            if r[0] < 0:
+                return "no real points", None
+            name = "circle" if abs(w[1] - w[0]) < eps else "ellipse"
+            return name, ("ellipse", center, V, (float(np.sqrt(r[0])), float(np.sqrt(r[1]))))
+        i = int(np.argmax(r))  # the transverse axis
+        R = V[:, [i, 1 - i]]
+        return "hyperbola", ("hyperbola", center, R, (float(np.sqrt(r[i])), float(np.sqrt(-r[1 - i]))))
+
+    # One zero eigenvalue: lambda u^2 + d1 u + d2 v + F = 0 is a parabola unless d2 = 0
+    i = int(np.argmax(np.abs(w)))
+    lam = float(w[i])
+    R = V[:, [i, 1 - i]]
+    d1, d2 = R.T @ [D, E]
+    if abs(d2) < eps:
+        # lambda u^2 + d1 u + F = 0: two lines u = const, one double line or none
+        disc = d1 * d1 - 4 * lam * F
+        if abs(disc) < eps * scale:
+            return "line", ("line", R @ [-d1 / (2 * lam), 0.0], R, ())
+        return ("parallel lines" if disc > 0 else "no real points"), None
+    a, h = -lam / d2, -d1 / (2 * lam)
+    k = -(F - d1 * d1 / (4 * lam)) / d2
+    return "parabola", ("parabola", np.zeros(2), R, (float(a), float(h), float(k)))
+
+def conic_axis_angle(form):
+    # Angle of the conic's first axis to the x axis, in degrees within [0, 180)
+    R = form[2]
+    return float(np.degrees(np.arctan2(R[1, 0], R[0, 0])) % 180.0)
+
+def _join(parts):
+    # Polylines -> one x and one y array with NaN between them
+    xs, ys = [], []
+    for x, y in parts:
+        if x.size:
+            if xs:
+                xs.append([np.nan])
+                ys.append([np.nan])
+            xs.append(x)
+            ys.append(y)
+    if not xs:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(xs), np.concatenate(ys)
+
+def conic_xy(coefs, xlim, ylim, ppu):
+    # Curve samples inside the view, pixel-adaptive like the other curves,
+    # plus the classification name
+    name, form = classify_conic(coefs)
+    if form is None:
+        return (*conic_contour(coefs, xlim, ylim, ppu), name)
+    kind, center, R, args = form
+    # The view's corners in the conic's own frame bound what can be visible
+    corners = (np.array([[xlim[0], ylim[0]], [xlim[1], ylim[0]], [xlim[0], ylim[1]], [xlim[1], ylim[1]]]) - center) @ R
+    ulim = (corners[:, 0].min(), corners[:, 0].max())
+    vlim = (corners[:, 1].min(), corners[:, 1].max())
+    if kind == "ellipse":
+        a, b = args
+        table = SAMPLE_TABLES.get_adaptive("ellipse", 0, 2*np.pi, a * ppu, b * ppu)
+        parts = [curve_xy_into("ellipse", table, *_new_buffers("u", table[0].size), a=a, b=b)]
+    elif kind == "hyperbola":
+        a, b = args
+        parts = []
+        for branch in (1, -1):
+            table = clipped_table("hyperbola", hyperbola_t_range(a, b, 0.0, 0.0, branch, ulim, vlim), a * ppu, b * ppu)
+            parts.append(curve_xy_into("hyperbola", table, *_new_buffers("u", table[0].size), a=a, b=b, branch=branch))
+    elif kind == "parabola":
+        a, h, k = args
+        table = clipped_table("parabola", parabola_t_range(a, h, k, ulim, vlim), ppu, abs(a) * ppu)
+        parts = [curve_xy_into("parabola", table, *_new_buffers("u", table[0].size), a=a, h=h, k=k)]
+    elif kind == "point":
+        # A dot of fixed screen size, when the point is in view
+        theta = np.linspace(0, 2*np.pi, 17)
+        r = 0.5 * CONIC_DOT_PX / ppu
+        parts = [(r * np.cos(theta), r * np.sin(theta))] if ulim[0] <= 0 <= ulim[1] and vlim[0] <= 0 <= vlim[1] else []
+    else:  # line: u = 0 across the view
+        pad = 0.05 * (vlim[1] - vlim[0])
+        parts = [(np.zeros(2), np.array([vlim[0] - pad, vlim[1] + pad]))] if ulim[0] <= 0 <= ulim[1] else []
+    u, v = _join(parts)
+    return center[0] + R[0, 0] * u + R[0, 1] * v, center[1] + R[1, 0] * u + R[1, 1] * v, name
+
+def conic_contour(coefs, xlim, ylim, ppu):
+    # Zero set on a grid over the (padded) view, about CONIC_CELL_PX per cell
+    (x0, x1), (y0, y1) = _pad_limits(xlim, ylim)
+    nx = int(np.clip(round((x1 - x0) * ppu / CONIC_CELL_PX), 16, CONIC_MAX_CELLS))
+    ny = int(np.clip(round((y1 - y0) * ppu / CONIC_CELL_PX), 16, CONIC_MAX_CELLS))
+    xs, ys = np.linspace(x0, x1, nx + 1), np.linspace(y0, y1, ny + 1)
+    return marching_squares(conic_value(coefs, xs[None, :], ys[:, None]), xs, ys)
+
+def conic_frame(coefs, x, y):
+    # frenet_frame() arrays from the implicit equation: the tangent is
+    # perpendicular to the gradient, and the level-set curvature is
+    # (fxx fy^2 - 2 fxy fx fy + fyy fx^2) / |grad f|^3, bending away from
+    # the gradient when positive
+    A, B, C, D, E, _F = coefs
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    fx, fy = 2*A*x + B*y + D, B*x + 2*C*y + E
+    g = np.hypot(fx, fy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tx, ty = -fy / g, fx / g
+        signed = (2*A * fy * fy - 2*B * fx * fy + 2*C * fx * fx) / g**3
+    side = np.where(signed < 0, 1.0, -1.0)
+    return x, y, tx, ty, side * fx / g, side * fy / g, np.abs(signed)
+
+# Corners (dy, dx) of a cell's bottom, right, top and left edges
+_EDGE_CORNERS = np.array([[[0, 0], [0, 1]], [[0, 1], [1, 1]], [[1, 0], [1, 1]], [[0, 0], [1, 0]]])
+
+def marching_squares(values, xs, ys):
+    # Zero contour of values[iy, ix], sampled at (xs[ix], ys[iy]), as
+    # NaN-separated polylines. Every cell is classified at once from the
+    # signs of its corners; saddle cells are split by the sign at their
+    # center. Only the final chaining of segments walks them one by one.
+    f = np.asarray(values, dtype=float)
+    ny, nx = f.shape
+    pos = f > 0
+    s00, s10, s11, s01 = pos[:-1, :-1], pos[:-1, 1:], pos[1:, 1:], pos[1:, :-1]
+    cross = np.stack((s00 != s10, s10 != s11, s01 != s11, s00 != s01))
+    count = cross.sum(axis=0)
+    # Two crossed edges: one segment between them
+    iy, ix = np.nonzero(count == 2)
+    crossed = cross[:, iy, ix]
+    first, last = np.argmax(crossed, axis=0), 3 - np.argmax(crossed[::-1], axis=0)
+    # Four: two segments, cutting off the corners whose sign differs from the center's
+    sy, sx = np.nonzero(count == 4)
+    center = 0.25 * (f[sy, sx] + f[sy, sx + 1] + f[sy + 1, sx + 1] + f[sy + 1, sx])
+    joined = (center > 0) == s00[sy, sx]  # corners 00 and 11 connect through the center
+    edge_a = np.concatenate((first, np.where(joined, 0, 3), np.where(joined, 2, 1)))
+    edge_b = np.concatenate((last, np.where(joined, 1, 0), np.where(joined, 3, 2)))
+    cy, cx = np.concatenate((iy, sy, sy)), np.concatenate((ix, sx, sx))
+
+    def points(edge):
+        ay, by = (cy[:, None] + _EDGE_CORNERS[edge, :, 0]).T
+        ax, bx = (cx[:, None] + _EDGE_CORNERS[edge, :, 1]).T
+        fa, fb = f[ay, ax], f[by, bx]
+        w = fa / (fa - fb)  # the signs differ, so fa != fb
+        return np.column_stack((xs[ax] + w * (xs[bx] - xs[ax]), ys[ay] + w * (ys[by] - ys[ay])))
+
+    def edge_ids(edge):
+        # Shared by the two cells on either side
+        horizontal = (cy + (edge == 2)) * (nx - 1) + cx
+        vertical = ny * (nx - 1) + cy * nx + cx + (edge == 1)
+        return np.where((edge == 0) | (edge == 2), horizontal, vertical)
+
+    return _chain_segments(points(edge_a), points(edge_b), edge_ids(edge_a), edge_ids(edge_b))
+
+def _chain_segments(pa, pb, ida, idb):
+    # Segments whose ends share a grid edge are joined into polylines
+    m = len(ida)
+    if m == 0:
+        return np.empty(0), np.empty(0)
+    ends = np.concatenate((ida, idb))  # slot s < m is segment s's first end, s + m its second
+    order = np.argsort(ends, kind="stable")
+    partner = np.full(2 * m, -1)
+    same = np.flatnonzero(ends[order[1:]] == ends[order[:-1]])
+    partner[order[same]] = order[same + 1]
+    partner[order[same + 1]] = order[same]
+    partner = partner.tolist()
+    used = bytearray(m)
+    path = []  # slots in drawing order, 2m (a NaN row) between polylines
+    # Open chains from their free ends first, then the closed loops
+    for start in [s for s in range(2 * m) if partner[s] < 0] + list(range(m)):
+        if used[start % m]:
+            continue
+        path.append(start)
+        slot = start
+        while True:
+            used[slot % m] = 1
+            out = slot + m if slot < m else slot - m
+            path.append(out)
+            slot = partner[out]
+            if slot < 0 or used[slot % m]:
+                break
+        path.append(2 * m)
+    pts = np.concatenate((pa, pb, [[np.nan, np.nan]]))[path[:-1]]
+    return pts[:, 0], pts[:, 1]
+
+
+# -----------------------------
+# Instrumentation
+# -----------------------------
+# Opt-in timing of the render hot paths, split into stages (params, eval,
+# artists, legend, draw). Turn it on with SDL2_PROFILE=1 or Tools > Profile
+# rendering; SDL2_PROFILE_LOG=<file> also appends one JSON line per frame.
+
+class _Stage:
+    __slots__ = ("timer", "name", "t0")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *_exc):
+        self.timer._add(self.name, time.perf_counter() - self.t0)
+        return False
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *_exc):
+        return False
+
+_NO_STAGE = _NoStage()
+
+class StageTimer:
+    def __init__(self, enabled=False, log_path=None, window=240):
+        self.enabled = enabled
+        self.window = window      # rolling percentiles over the last `window` frames
+        self.history = {}         # scope -> {stage: deque of ms}
+        self._frame = None
+        self._depth = 0
+        self._log = None
+        self.set_log(log_path)
+
+    def set_log(self, path):
+        if self._log is not None:
+            self._log.close()
+        self._log = open(path, "a", buffering=1) if path else None
+
+    def begin(self, scope):
+        # Nested begin/end pairs (a render called from a render) fold into the outer frame
+        self._depth += 1
+        if self._depth == 1 and self.enabled:
+            self._scope = scope
+            self._frame = {}
+            self._t0 = time.perf_counter()
+
+    def stage(self, name):
+        if self._frame is None:
+            return _NO_STAGE
+        return _Stage(self, name)
+
+    def _add(self, name, seconds):
+        self._frame[name] = self._frame.get(name, 0.0) + 1000.0 * seconds
+
+    def add(self, name, seconds):
+        # A stage timed elsewhere (e.g. on the compute thread); it also counts
+        # toward the frame total
+        if self._frame is not None:
+            self._add(name, seconds)
+            self._t0 -= seconds
+
+    def end(self):
+        self._depth = max(self._depth - 1, 0)
+        frame = self._frame
+        if self._depth or frame is None:
+            return
+        self._frame = None
+        frame["total"] = 1000.0 * (time.perf_counter() - self._t0)
+        stages = self.history.setdefault(self._scope, {})
+        for name, ms in frame.items():
+            stages.setdefault(name, deque(maxlen=self.window)).append(ms)
+        if self._log is not None:
+            record = {"scope": self._scope, "time": round(time.time(), 4),
+                      "ms": {name: round(ms, 4) for name, ms in frame.items()}}
+            self._log.write(json.dumps(record) + "\n")
+
+    def percentiles(self, scope, q=(50, 95, 99)):
+        # {stage: [p50, p95, p99]} in ms over the rolling window
+        return {name: np.percentile(np.fromiter(ms, float), q).tolist()
+                for name, ms in self.history.get(scope, {}).items() if ms}
+
+    def summary(self, scope):
+        pct = self.percentiles(scope, (50, 95))
+        order = ["total", "params", "eval", "artists", "legend", "draw"]
+        names = [n for n in order if n in pct] + sorted(n for n in pct if n not in order)
+        return "  ".join(f"{n} {pct[n][0]:.1f}/{pct[n][1]:.1f}" for n in names) + "  ms p50/p95"
+
+NULL_TIMER = StageTimer(enabled=False)
+
+
+# -----------------------------
+# Custom expressions
+# -----------------------------
+# x(t), y(t) typed into the Motion tab. The text is parsed once against a
+# whitelist, differentiated symbolically (twice) and compiled to vectorized
+# NumPy lambdas. Compiled expressions are cached by text, so slider drags and
+# animation ticks never re-parse.
+
+CUSTOM_PATH = "Custom x(t), y(t)"
+
+# Name typed -> NumPy function
+EXPR_FUNCS = {
+    "sin": "sin", "cos": "cos", "tan": "tan",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh",
+    "exp": "exp", "log": "log", "ln": "log", "sqrt": "sqrt",
+    "atan": "arctan", "arctan": "arctan", "abs": "abs", "sign": "sign",
+}
+EXPR_CONSTS = {"pi": np.pi, "e": np.e}
+EXPR_PARAMS = ("a", "b", "omega", "p", "speed")  # slider values usable in expressions
+
+_EXPR_OPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.Pow: "**"}
+
+# Expression trees are plain tuples:
+#   ("const", value), ("var", name), (op, left, right), ("neg", u), ("call", func, u)
+_ZERO = ("const", 0.0)
+_ONE = ("const", 1.0)
+
+def _const(value):
+    # Literals and folded constants; inf/nan would not survive _source()
+    try:
+        value = float(value)
+    except OverflowError:
+        value = np.inf
+    if not np.isfinite(value):
+        raise ValueError("Number out of range in expression.")
+    return ("const", value)
+
+def _is_const(u):
+    return u[0] == "const"
+
+def _add(u, v):
+    if u == _ZERO:
+        return v
+    if v == _ZERO:
+        return u
+    if _is_const(u) and _is_const(v):
+        return _const(u[1] + v[1])
+    return ("+", u, v)
+
+def _sub(u, v):
+    if v == _ZERO:
+        return u
+    if u == _ZERO:
+        return _neg(v)
+    if _is_const(u) and _is_const(v):
+        return _const(u[1] - v[1])
+    return ("-", u, v)
+
+def _mul(u, v):
+    if u == _ZERO or v == _ZERO:
+        return _ZERO
+    if u == _ONE:
+        return v
+    if v == _ONE:
+        return u
+    if _is_const(u) and _is_const(v):
+        return _const(u[1] * v[1])
+    return ("*", u, v)
+
+def _div(u, v):
+    if u == _ZERO:
+        return _ZERO
+    if v == _ONE:
+        return u
+    if _is_const(u) and _is_const(v) and v[1] != 0:
+        return _const(u[1] / v[1])
+    return ("/", u, v)
+
+def _pow(u, v):
+    if v == _ZERO:
+        return _ONE
+    if v == _ONE:
+        return u
+    if _is_const(u) and _is_const(v) and (u[1] > 0 or float(v[1]).is_integer()):
+        try:
+            return _const(u[1] ** v[1])
+        except OverflowError:
+            raise ValueError("Number out of range in expression.") from None
+        except ZeroDivisionError:
+            raise ValueError("Division by zero in expression.") from None
+    return ("**", u, v)
+
+def _neg(u):
+    if _is_const(u):
+        return _const(-u[1])
+    if u[0] == "neg":
+        return u[1]
+    return ("neg", u)
+
+def _call(func, u):
+    if _is_const(u):
+        with np.errstate(all="ignore"):
+            value = float(getattr(np, EXPR_FUNCS[func])(u[1]))
+        if np.isfinite(value):
+            return _const(value)
+    return ("call", func, u)
+
+_BUILD = {"+": _add, "-": _sub, "*": _mul, "/": _div, "**": _pow}
+
+def _tree(node):
+    # ast node -> expression tree, rejecting anything outside the whitelist
+    if isinstance(node, ast.Expression):
+        return _tree(node.body)
+    if isinstance(node, ast.BinOp) and type(node.op) in _EXPR_OPS:
+        return _BUILD[_EXPR_OPS[type(node.op)]](_tree(node.left), _tree(node.right))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        u = _tree(node.operand)
+        return _neg(u) if isinstance(node.op, ast.USub) else u
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return _const(node.value)
+    if isinstance(node, ast.Name):
+        if node.id == "t" or node.id in EXPR_PARAMS:
+            return ("var", node.id)
+        if node.id in EXPR_CONSTS:
+            return _const(EXPR_CONSTS[node.id])
+        raise ValueError(f"Unknown name '{node.id}' (use t, {', '.join(EXPR_PARAMS)}, pi, e).")
+    if isinstance(node, ast.Call):
+        name = node.func.id if isinstance(node.func, ast.Name) else None
+        if name not in EXPR_FUNCS:
+            raise ValueError(f"Unknown function '{name or ast.unparse(node.func)}'.")
+        if len(node.args) != 1 or node.keywords:
+            raise ValueError(f"{name}() takes exactly one argument.")
+        return _call(name, _tree(node.args[0]))
+    raise ValueError(f"Not allowed in an expression: '{ast.unparse(node)}'.")
+
+def parse_expr(text):
+    # "^" is accepted as a power, as typed on a calculator
+    try:
+        node = ast.parse(text.strip().replace("^", "**"), mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Could not parse expression: {text!r}") from None
+    return _tree(node)
+
+def _uses_t(u):
+    if u[0] == "var":
+        return u[1] == "t"
+    return any(_uses_t(arg) for arg in u[1:] if isinstance(arg, tuple))
+
+def diff_expr(u):
+    # d/dt of an expression tree (parameters are constants)
+    op = u[0]
+    if op == "const":
+        return _ZERO
+    if op == "var":
+        return _ONE if u[1] == "t" else _ZERO
+    if op == "neg":
+        return _neg(diff_expr(u[1]))
+    if op == "call":
+        func, arg = u[1], u[2]
+        darg = diff_expr(arg)
+        if darg == _ZERO:
+            return _ZERO
+        if func == "sin":
+            outer = _call("cos", arg)
+        elif func == "cos":
+            outer = _neg(_call("sin", arg))
+        elif func == "tan":
+            outer = _div(_ONE, _pow(_call("cos", arg), _const(2)))
+        elif func == "sinh":
+            outer = _call("cosh", arg)
+        elif func == "cosh":
+            outer = _call("sinh", arg)
+        elif func == "tanh":
+            outer = _sub(_ONE, _pow(_call("tanh", arg), _const(2)))
+        elif func == "exp":
+            outer = u
+        elif func in ("log", "ln"):
+            outer = _div(_ONE, arg)
+        elif func == "sqrt":
+            outer = _div(_const(0.5), u)
+        elif func in ("atan", "arctan"):
+            outer = _div(_ONE, _add(_ONE, _pow(arg, _const(2))))
+        elif func == "abs":
+            outer = _call("sign", arg)
+        else:  # sign: flat away from 0
+            return _ZERO
+        return _mul(outer, darg)
+
+    left, right = u[1], u[2]
+    dl, dr = diff_expr(left), diff_expr(right)
+    if op == "+":
+        return _add(dl, dr)
+    if op == "-":
+        return _sub(dl, dr)
+    if op == "*":
+        return _add(_mul(dl, right), _mul(left, dr))
+    if op == "/":
+        if dr == _ZERO:
+            return _div(dl, right)
+        return _div(_sub(_mul(dl, right), _mul(left, dr)), _pow(right, _const(2)))
+    # "**"
+    if not _uses_t(right):
+        # power rule
+        return _mul(_mul(right, _pow(left, _sub(right, _ONE))), dl)
+    # u^v = exp(v log u)
+    return _mul(u, _add(_mul(dr, _call("log", left)), _div(_mul(right, dl), left)))
+
+def _source(u):
+    op = u[0]
+    if op == "const":
+        return repr(u[1])
+    if op == "var":
+        return u[1]
+    if op == "neg":
+        return f"(-{_source(u[1])})"
+    if op == "call":
+        return f"np.{EXPR_FUNCS[u[1]]}({_source(u[2])})"
+    return f"({_source(u[1])} {op} {_source(u[2])})"
+
+def _compile_tree(u):
+    # Source is generated from the whitelisted tree only, never from user text.
+    # Expressions without t still return an array shaped like t.
+    body = _source(u) if _uses_t(u) else f"np.full(np.shape(t), {_source(u)})"
+    return eval(f"lambda t, {', '.join(EXPR_PARAMS)}: {body}", {"np": np, "__builtins__": {}})
+
+class CompiledExpr:
+    # One expression and its first two t-derivatives as NumPy callables,
+    # each called as f(t, a, b, omega, p, speed)
+    def __init__(self, text):
+        self.text = text
+        tree = parse_expr(text)
+        d1 = diff_expr(tree)
+        d2 = diff_expr(d1)
+        self.trees = (tree, d1, d2)
+        self.f, self.df, self.d2f = (_compile_tree(u) for u in self.trees)
+
+class ExpressionCache:
+    # Expression text -> CompiledExpr, least recently used evicted first
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.exprs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def get(self, text):
+        text = text.strip()
+        with self._lock:
+            expr = self.exprs.get(text)
+            if expr is not None:
+                self.exprs.move_to_end(text)
+                self.hits += 1
+                return expr
+            self.misses += 1
+            expr = CompiledExpr(text)
+            self.exprs[text] = expr
+            if len(self.exprs) > self.maxsize:
+                self.exprs.popitem(last=False)
+            return expr
+
+CUSTOM_EXPRS = ExpressionCache()
+
+def custom_path(params):
+    # (x expression, y expression, parameter values) for the custom path
+    fx = CUSTOM_EXPRS.get(params["x_expr"])
+    fy = CUSTOM_EXPRS.get(params["y_expr"])
+    return fx, fy, tuple(float(params[name]) for name in EXPR_PARAMS)
+
+def custom_motion(params, t):
+    # Position, velocity and acceleration of the custom path at t
+    fx, fy, args = custom_path(params)
+    with np.errstate(all="ignore"):
+        return (params["h"] + fx.f(t, *args), params["k"] + fy.f(t, *args),
+                fx.df(t, *args), fy.df(t, *args),
+                fx.d2f(t, *args), fy.d2f(t, *args))
+
+
+# -----------------------------
+# Motion frames
+# -----------------------------
+# One frame of the Parametric Motion tab, shared by the app and the
+# headless renderer below.
+
+MOTION_PATHS = ["Ellipse/Circle", "Parabola-like", CUSTOM_PATH]
+MOTION_DEFAULTS = {
+    "h": 0.0, "k": 0.0,
+    "a": 3.0, "b": 2.0, "omega": 1.0,   # ellipse/circle
+    "p": 0.25, "speed": 1.0,             # parabola-like
+    "x_expr": "a*cos(omega*t)", "y_expr": "b*sin(2*omega*t)",   # custom
+    "t_min": 0.0, "t_max": round(2*np.pi, 4),
+    "v_scale": 1.0, "a_scale": 0.3,
+}
+MOTION_LIM = (-7, 7)
+MOTION_VIEW = (MOTION_LIM, MOTION_LIM)  # (xlim, ylim) before any toolbar zoom or pan
+MOTION_TITLE = "Parametric Motion (Position, Velocity, Acceleration)"
+
+def _new_buffers(_name, n):
+    return np.empty(n), np.empty(n)
+
+def pixels_per_unit(ax, span):
+    # Screen pixels per data unit for an equal-aspect axes showing `span` units
+    bbox = ax.bbox
+    return max(min(bbox.width, bbox.height), 1.0) / span
+
+def view_ppu(ax, view):
+    # pixels_per_unit for a (xlim, ylim) view; the longer side sets the scale
+    (x0, x1), (y0, y1) = view
+    return pixels_per_unit(ax, max(x1 - x0, y1 - y0))
+
+def axes_limits(ax):
+    return tuple(ax.get_xlim()), tuple(ax.get_ylim())
+
+def clipped_table(kind, t_range, wx, wy):
+    if t_range is None:
+        return adaptive_unit_table(kind, 0.0, 0.0, wx, wy)  # empty: curve is off-screen
+    return SAMPLE_TABLES.get_adaptive(kind, t_range[0], t_range[1], wx, wy)
+
+def motion_path_xy(mtype, params, ppu, view=MOTION_VIEW, buffers=_new_buffers):
+    # Path samples for the motion track: curvature-adaptive, clipped to the view
+    if mtype == "Ellipse/Circle":
+        table = SAMPLE_TABLES.get_adaptive("ellipse", 0, 2*np.pi, abs(params["a"]) * ppu, abs(params["b"]) * ppu)
+        x, y = curve_xy_into("ellipse", table, *buffers("path", table[0].size),
+                             a=params["a"], b=params["b"], h=params["h"], k=params["k"])
+        return x, y, "path (ellipse)"
+    if mtype == CUSTOM_PATH:
+        if not params["t_min"] < params["t_max"]:
+            raise ValueError("t min must be less than t max.")
+        fx, fy, args = custom_path(params)
+        t, cx, cy = SAMPLE_TABLES.get_custom(fx, fy, args, params["t_min"], params["t_max"], ppu)
+        x, y = buffers("path", t.size)
+        np.add(cx, params["h"], out=x)
+        np.add(cy, params["k"], out=y)
+        return x, y, "path (custom)"
+    p, spd = params["p"], params["speed"]
+    t_range = motion_parabola_t_range(p, spd, params["h"], params["k"], *view)
+    table = clipped_table("parabola", t_range, abs(spd) * ppu, abs(p) * spd * spd * ppu)
+    x, y = motion_parabola_into(table, *buffers("path", table[0].size),
+                                p=p, speed=spd, h=params["h"], k=params["k"])
+    return x, y, "path (parabola-like)"
+
+def motion_state(mtype, params, t0):
+    # Point, velocity and acceleration at time t0 for the current path
+    if mtype == "Ellipse/Circle":
+        a, b, omega, h, k = params["a"], params["b"], params["omega"], params["h"], params["k"]
+        px, py = motion_ellipse(t0, a=a, b=b, omega=omega, h=h, k=k)
+        vx, vy = motion_ellipse_v(t0, a=a, b=b, omega=omega)
+        ax, ay = motion_ellipse_a(t0, a=a, b=b, omega=omega)
+    elif mtype == CUSTOM_PATH:
+        px, py, vx, vy, ax, ay = custom_motion(params, t0)
+    else:
+        p, spd, h, k = params["p"], params["speed"], params["h"], params["k"]
+        px, py = motion_parabola_param(t0, p=p, speed=spd, h=h, k=k)
+        vx, vy = motion_parabola_v(t0, p=p, speed=spd)
+        ax, ay = motion_parabola_a(t0, p=p, speed=spd)
+    return px, py, vx, vy, ax, ay
+
+def advance_motion_time(mtype, t, dt, omega=1.0, t_range=(0.0, 2*np.pi)):
+    t += dt
+    # Keep time from growing forever (wrap)
+    if mtype == "Ellipse/Circle":
+        # Wrap by 2π/omega (period)
+        period = (2*np.pi / omega) if omega != 0 else 2*np.pi
+        if t > period:
+            t -= period
+    elif mtype == CUSTOM_PATH:
+        # Loop over the chosen t interval
+        if t > t_range[1]:
+            t = t_range[0]
+    else:
+        # Keep parabola time bounded for display
+        if t > 3:
+            t = -3
+    return t
+
+def motion_frame_data(mtype, params, t0, ppu, buffers=_new_buffers, path_speed=None, physics=None,
+                      view=MOTION_VIEW):
+    # Path curve + instantaneous vectors at t0: (x, y, label, state)
+    x, y, label = motion_path_xy(mtype, params, ppu, view, buffers)
+    if physics is not None:
+        px, py, vx, vy, ax, ay, _speed = physics.lookup(t0)
+    else:
+        px, py, vx, vy, ax, ay = motion_state(mtype, params, t0)
+    if path_speed is not None:
+        vx, vy, ax, ay = constant_speed_state(vx, vy, ax, ay, path_speed)
+    return x, y, label, (px, py, vx, vy, ax, ay)
+
+def draw_motion_frame(ax2, mtype, params, t0, ppu, buffers=_new_buffers, animated=False, timer=NULL_TIMER,
+                      path_speed=None, trail=None, swarm=None, physics=None, data=None, view=MOTION_VIEW):
+    # Full frame on a cleared axes. Returns the point and the two quivers
+    # (flagged animated for blitting when asked) plus the speed at t0.
+    # With path_speed, the vectors are those of constant-speed motion.
+    # With a ParticleSwarm, its scatter and quiver replace them (qa is None).
+    # With a PhysicsTable, the point follows (and the plot adds) the
+    # integrated trajectory. `data` is a precomputed motion_frame_data().
+    # `view` is the (xlim, ylim) drawn; the path is clipped to it.
+    (xmin, xmax), (ymin, ymax) = view
+    with timer.stage("eval"):
+        if data is None:
+            data = motion_frame_data(mtype, params, t0, ppu, buffers, path_speed, physics, view)
+        x, y, label, (px, py, vx, vy, ax, ay) = data
+
+    with timer.stage("artists"):
+        ax2.clear()
+        ax2.grid(True)
+        ax2.set_aspect("equal", adjustable="box")
+        ax2.set_title(MOTION_TITLE)
+        ax2.plot(x, y, linewidth=2, label=label)
+        if physics is not None:
+            ax2.plot(physics.rows[:, 0], physics.rows[:, 1], linestyle="--", linewidth=1.5,
+                     label=f"integrated ({physics.method.upper()})")
+        if trail is not None:
+            ax2.add_collection(trail.make_collection(animated), autolim=False)
+
+        # Point + vectors
+        vs, ac = params["v_scale"], params["a_scale"]
+        if swarm is not None:
+            point, qv, speed = swarm.make_artists(ax2, mtype, params, t0, vs, animated)
+            qa = None
+        else:
+            point = ax2.scatter([px], [py], s=40, label="moving point", animated=animated)
+            qv = ax2.quiver(px, py, vs*vx, vs*vy, angles="xy", scale_units="xy", scale=1, animated=animated)
+            qa = ax2.quiver(px, py, ac*ax, ac*ay, angles="xy", scale_units="xy", scale=1, animated=animated)
+
+        ax2.set_xlim(xmin, xmax)
+        ax2.set_ylim(ymin, ymax)
+        ax2.set_xlabel("x")
+        ax2.set_ylabel("y")
+
+    with timer.stage("legend"):
+        ax2.legend(loc="upper right")
+
+    if swarm is None:
+        speed = float(np.sqrt(vx*vx + vy*vy))
+    return point, qv, qa, speed
+
+
+# -----------------------------
+# Trajectory tables
+# -----------------------------
+
+MOTION_KEYS = {
+    "Ellipse/Circle": ("a", "b", "omega", "h", "k"),
+    "Parabola-like": ("p", "speed", "h", "k"),
+    CUSTOM_PATH: ("x_expr", "y_expr") + EXPR_PARAMS + ("t_min", "t_max", "h", "k"),
+}
+
+def motion_cycle(mtype, params):
+    # (t0, t1, periodic): one ellipse period, or the parabola's display window
+    if mtype == "Ellipse/Circle":
+        omega = params["omega"]
+        period = abs(2*np.pi / omega) if omega != 0 else 2*np.pi
+        return 0.0, period, True
+    if mtype == CUSTOM_PATH:
+        return params["t_min"], params["t_max"], False
+    return -3.0, 3.0, False
+
+class TrajectoryTable:
+    # Position, velocity, acceleration and speed for a whole cycle, built once
+    # per parameter set. Frames interpolate between rows instead of calling
+    # the three motion helpers at a single t every tick.
+    def __init__(self, mtype, params, dt, oversample=4, min_samples=64, max_samples=4096):
+        self.key = self.key_for(mtype, params, dt)
+        t0, t1, self.periodic = motion_cycle(mtype, params)
+        # dt/oversample spacing, but bounded so small omega or dt can't blow up memory
+        n = int(np.ceil((t1 - t0) / dt * oversample)) + 1
+        n = max(min_samples, min(n, max_samples))
+        self.t0 = t0
+        self.step = (t1 - t0) / (n - 1)
+        self.n = n
+
+        t = np.linspace(t0, t1, n)
+        rows = np.empty((n, 7))  # px, py, vx, vy, ax, ay, speed
+        for col, arr in enumerate(motion_state(mtype, params, t)):
+            rows[:, col] = arr  # parabola vx, ax, ay are scalars and broadcast
+        np.hypot(rows[:, 2], rows[:, 3], out=rows[:, 6])
+        self.rows = rows
+        # Per-frame lookups touch two rows; plain floats beat tiny NumPy ops there
+        self._row_list = rows.tolist()
+
+    @staticmethod
+    def key_for(mtype, params, dt):
+        return (mtype, tuple(params[name] for name in MOTION_KEYS[mtype]), dt)
+
+    def lookup(self, t):
+        # Linear interpolation on the uniform grid; periodic tables wrap
+        u = (t - self.t0) / self.step
+        last = self.n - 1
+        if self.periodic:
+            u %= last
+        elif u < 0:
+            u = 0.0
+        elif u > last:
+            u = float(last)
+        i = min(int(u), last - 1)
+        f = u - i
+        lo, hi = self._row_list[i], self._row_list[i + 1]
+        return [x0 + f * (x1 - x0) for x0, x1 in zip(lo, hi)]
+
+
+# -----------------------------
+# Physics
+# -----------------------------
+# Force-based alternative to the closed-form motion. The path's start point
+# and velocity are integrated under a force with a fixed-step RK4 or
+# velocity-Verlet integrator. Without drag the forces reproduce the
+# kinematic paths: the parabola's constant acceleration, or a Hooke central
+# force omega^2 * r for the ellipse. That lets the numerical trajectory be
+# checked against the analytic one. Everything works on arrays of M initial
+# conditions at once; states are (5, M) arrays of x, y, vx, vy and the
+# energy dissipated by drag so far (per unit mass).
+
+FORCE_MODELS = ["Off", "Uniform field", "Uniform + linear drag", "Uniform + quadratic drag", "Central force"]
+
+class ForceField:
+    # Acceleration per unit mass. kind is "uniform" or "central"; drag is None,
+    # "linear" or "quadratic". Parameters may be arrays of shape (M,).
+    def __init__(self, kind, g=(0.0, 0.0), w2=1.0, center=(0.0, 0.0), drag=None, c=0.0):
+        if kind not in ("uniform", "central"):
+            raise ValueError(f"Unknown force: {kind}")
+        if drag not in (None, "linear", "quadratic"):
+            raise ValueError(f"Unknown drag: {drag}")
+        self.kind = kind
+        self.gx, self.gy = g
+        self.w2 = w2
+        self.cx, self.cy = center
+        self.drag = drag
+        self.c = c
+
+    def accel(self, x, y, vx, vy):
+        # (ax, ay, power lost to drag)
+        if self.kind == "central":
+            ax = -self.w2 * (x - self.cx)
+            ay = -self.w2 * (y - self.cy)
+        else:
+            ax = self.gx + 0.0 * x  # broadcast to the state shape
+            ay = self.gy + 0.0 * y
+        if self.drag is None:
+            return ax, ay, 0.0 * x
+        k = self.c if self.drag == "linear" else self.c * np.hypot(vx, vy)
+        return ax - k * vx, ay - k * vy, k * (vx * vx + vy * vy)
+
+    def potential(self, x, y):
+        if self.kind == "central":
+            return 0.5 * self.w2 * ((x - self.cx) ** 2 + (y - self.cy) ** 2)
+        return -(self.gx * x + self.gy * y)
+
+    def energy(self, states):
+        # Kinetic + potential + dissipated: constant for the exact solution
+        x, y, vx, vy, lost = states[..., 0, :], states[..., 1, :], states[..., 2, :], states[..., 3, :], states[..., 4, :]
+        return 0.5 * (vx * vx + vy * vy) + self.potential(x, y) + lost
+
+    def analytic(self, state0, t):
+        # Closed-form (x, y) at times t (broadcast against M), or None where
+        # there is none (quadratic drag, damped central force)
+        x0, y0, vx0, vy0 = state0[0], state0[1], state0[2], state0[3]
+        if self.kind == "central":
+            if self.drag is not None:
+                return None
+            w = np.sqrt(self.w2)
+            cos, sin = np.cos(w * t), np.sin(w * t)
+            return (self.cx + (x0 - self.cx) * cos + vx0 / w * sin,
+                    self.cy + (y0 - self.cy) * cos + vy0 / w * sin)
+        if self.drag is None:
+            return (x0 + vx0 * t + 0.5 * self.gx * t * t,
+                    y0 + vy0 * t + 0.5 * self.gy * t * t)
+        if self.drag == "linear":
+            c = self.c
+            decay = (1.0 - np.exp(-c * t)) / c
+            return (x0 + self.gx * t / c + (vx0 - self.gx / c) * decay,
+                    y0 + self.gy * t / c + (vy0 - self.gy / c) * decay)
+        return None
+
+def _derivative(field, s):
+    ax, ay, power = field.accel(s[0], s[1], s[2], s[3])
+    return np.array([s[2], s[3], ax, ay, power])
+
+def integrate(field, state0, dt, n_steps, method="rk4", record_every=1):
+    # Fixed-step integration of every initial condition at once. dt may be an
+    # array (one step size per condition). Returns the states every
+    # record_every steps: (n_steps // record_every + 1, 5, M).
+    if method == "verlet" and field.drag is not None:
+        raise ValueError("Verlet needs a velocity-independent force (no drag).")
+    if method not in ("rk4", "verlet"):
+        raise ValueError(f"Unknown integrator: {method}")
+    s = np.array(state0, dtype=float)
+    out = np.empty((n_steps // record_every + 1,) + s.shape)
+    out[0] = s
+    if method == "verlet":
+        ax, ay, _power = field.accel(s[0], s[1], s[2], s[3])
+    for i in range(1, n_steps + 1):
+        if method == "rk4":
+            k1 = _derivative(field, s)
+            k2 = _derivative(field, s + 0.5 * dt * k1)
+            k3 = _derivative(field, s + 0.5 * dt * k2)
+            k4 = _derivative(field, s + dt * k3)
+            s = s + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+        else:
+            # Velocity Verlet: symplectic, so energy error stays bounded
+            s[2] += 0.5 * dt * ax
+            s[3] += 0.5 * dt * ay
+            s[0] += dt * s[2]
+            s[1] += dt * s[3]
+            ax, ay, _power = field.accel(s[0], s[1], s[2], s[3])
+            s[2] += 0.5 * dt * ax
+            s[3] += 0.5 * dt * ay
+        if i % record_every == 0:
+            out[i // record_every] = s
+    return out
+
+def force_field(model, mtype, params, drag=0.2):
+    # The force for a FORCE_MODELS entry, matched to the current path: the
+    # uniform field is the path's acceleration at the start of its cycle, the
+    # central force pulls toward (h, k) with strength omega^2.
+    if model == "Central force":
+        return ForceField("central", w2=params["omega"] ** 2, center=(params["h"], params["k"]))
+    t0, _t1, _periodic = motion_cycle(mtype, params)
+    _px, _py, _vx, _vy, ax, ay = motion_state(mtype, params, t0)
+    kinds = {"Uniform field": None, "Uniform + linear drag": "linear", "Uniform + quadratic drag": "quadratic"}
+    if model not in kinds:
+        raise ValueError(f"Unknown force model: {model}")
+    return ForceField("uniform", g=(float(ax), float(ay)), drag=kinds[model], c=drag)
+
+class PhysicsTable(TrajectoryTable):
+    # TrajectoryTable (same rows and lookup) whose rows come
+    # from integrating the force model over one cycle in a single batch,
+    # with at least min_steps integrator steps per cycle.
+    def __init__(self, mtype, params, model, drag, dt, oversample=4, min_samples=64, max_samples=4096,
+                 min_steps=512, method="auto"):
+        self.key = self.key_for(mtype, params, dt, model, drag)
+        t0, t1, periodic = motion_cycle(mtype, params)
+        n = int(np.ceil((t1 - t0) / dt * oversample)) + 1
+        n = max(min_samples, min(n, max_samples))
+        substeps = -(-min_steps // (n - 1))
+        self.t0 = t0
+        self.step = (t1 - t0) / (n - 1)
+        self.n = n
+
+        field = self.field = force_field(model, mtype, params, drag)
+        # Only the drag-free central force closes on itself each cycle
+        self.periodic = periodic and field.kind == "central"
+        self.method = method if method != "auto" else ("verlet" if field.drag is None else "rk4")
+        px, py, vx, vy, _ax, _ay = motion_state(mtype, params, t0)
+        state0 = np.array([[px], [py], [vx], [vy], [0.0]], dtype=float)
+        states = integrate(field, state0, self.step / substeps, (n - 1) * substeps, self.method, substeps)
+
+        rows = np.empty((n, 7))  # px, py, vx, vy, ax, ay, speed
+        rows[:, :4] = states[:, :4, 0]
+        rows[:, 4], rows[:, 5], _power = field.accel(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3])
+        np.hypot(rows[:, 2], rows[:, 3], out=rows[:, 6])
+        self.rows = rows
+        self._row_list = rows.tolist()
+
+        # Energy drift relative to the starting energy (or kinetic energy near E = 0)
+        energy = field.energy(states)[:, 0]
+        scale = max(abs(energy[0]), 0.5 * (vx * vx + vy * vy), 1e-12)
+        self.drift = float(np.max(np.abs(energy - energy[0])) / scale)
+        exact = field.analytic(state0[:, 0], np.arange(n) * self.step)
+        self.error = None if exact is None else float(np.max(np.hypot(rows[:, 0] - exact[0], rows[:, 1] - exact[1])))
+
+    @staticmethod
+    def key_for(mtype, params, dt, model, drag):
+        return TrajectoryTable.key_for(mtype, params, dt) + (model, drag)
+
+def trajectory_for(mtype, params, dt, force=None, current=None):
+    # Trajectory (or physics, with force = (model, drag)) table for these
+    # parameters; `current` is returned as is when it still matches
+    if force is not None:
+        if current is not None and current.key == PhysicsTable.key_for(mtype, params, dt, *force):
+            return current
+        return PhysicsTable(mtype, params, force[0], force[1], dt)
+    if current is not None and current.key == TrajectoryTable.key_for(mtype, params, dt):
+        return current
+    return TrajectoryTable(mtype, params, dt)
+
+def physics_check(model, n_conditions=1000, steps=1000, method="auto", drag=0.2, seed=0):
+    # Integrate many random starts of the matching path (ellipses for the
+    # central force, parabolas otherwise) over one cycle in one vectorized
+    # run, and compare with the closed form and the starting energy.
+    rng = np.random.default_rng(seed)
+    if model == "Central force":
+        a, b, omega = rng.uniform(0.5, 6, n_conditions), rng.uniform(0.5, 6, n_conditions), rng.uniform(0.2, 5, n_conditions)
+        field = ForceField("central", w2=omega ** 2)
+        px, py = motion_ellipse(0.0, a=a, b=b, omega=omega)
+        vx, vy = motion_ellipse_v(0.0, a=a, b=b, omega=omega)
+        span = 2 * np.pi / omega
+    else:
+        p, speed = rng.uniform(0.05, 2.0, n_conditions), rng.uniform(0.2, 3.0, n_conditions)
+        kinds = {"Uniform field": None, "Uniform + linear drag": "linear", "Uniform + quadratic drag": "quadratic"}
+        if model not in kinds:
+            raise ValueError(f"Unknown force model: {model}")
+        _ax, ay = motion_parabola_a(-3.0, p=p, speed=speed)
+        field = ForceField("uniform", g=(0.0, ay), drag=kinds[model], c=drag)
+        px, py = motion_parabola_param(-3.0, p=p, speed=speed)
+        vx, vy = motion_parabola_v(-3.0, p=p, speed=speed)
+        span = 6.0
+    state0 = np.array(np.broadcast_arrays(px, py, vx, vy, np.zeros(n_conditions)), dtype=float)
+    if method == "auto":
+        method = "verlet" if field.drag is None else "rk4"
+
+    t0 = time.perf_counter()
+    states = integrate(field, state0, span / steps, steps, method)
+    seconds = time.perf_counter() - t0
+
+    energy = field.energy(states)
+    scale = np.maximum(np.abs(energy[0]), np.maximum(0.5 * (vx * vx + vy * vy), 1e-12))
+    drift = np.max(np.abs(energy - energy[0]), axis=0) / scale
+    exact = field.analytic(state0, np.arange(steps + 1)[:, None] * (span / steps))
+    result = {
+        "model": model, "method": method, "conditions": n_conditions, "steps": steps,
+        "seconds": seconds, "max_drift": float(drift.max()), "median_drift": float(np.median(drift)),
+        "max_error": None, "median_error": None,
+    }
+    if exact is not None:
+        error = np.max(np.hypot(states[:, 0] - exact[0], states[:, 1] - exact[1]), axis=0)
+        result["max_error"], result["median_error"] = float(error.max()), float(np.median(error))
+    return result
+
+
+# -----------------------------
+# Arc length
+# -----------------------------
+# Distance along the path over one motion cycle, built once per parameter
+# set. Lets the animation move at a constant speed along the path: s -> t is
+# a binary search plus linear interpolation, with no root finding per frame.
+
+class ArcLengthTable:
+    def __init__(self, mtype, params, n=4097):
+        self.key = self.key_for(mtype, params)
+        t0, t1, self.periodic = motion_cycle(mtype, params)
+        t = np.linspace(t0, t1, n)
+        _px, _py, vx, vy, _ax, _ay = motion_state(mtype, params, t)
+        speed = np.broadcast_to(np.hypot(vx, vy), t.shape)  # parabola vx is a scalar
+        # Cumulative trapezoid rule (exact to rounding for the periodic ellipse)
+        s = np.empty(n)
+        s[0] = 0.0
+        np.cumsum(0.5 * (speed[1:] + speed[:-1]) * np.diff(t), out=s[1:])
+        self.t = t
+        self.s = s
+        self.total = float(s[-1])  # perimeter of the ellipse, length of the other paths
+        self.t0 = t0
+        self.step = (t1 - t0) / (n - 1)
+        self.n = n
+        # Per-frame lookups are scalar; plain lists beat tiny NumPy ops there
+        self._t_list = t.tolist()
+        self._s_list = s.tolist()
+
+    @staticmethod
+    def key_for(mtype, params):
+        return (mtype, tuple(params[name] for name in MOTION_KEYS[mtype]))
+
+    def s_at(self, t):
+        # Distance from the start of the cycle to t (uniform t grid: no search)
+        u = (t - self.t0) / self.step
+        last = self.n - 1
+        if self.periodic:
+            u %= last
+        u = min(max(u, 0.0), float(last))
+        i = min(int(u), last - 1)
+        s0, s1 = self._s_list[i], self._s_list[i + 1]
+        return s0 + (u - i) * (s1 - s0)
+
+    def t_at(self, s):
+        # Inverse of s_at; periodic paths wrap, the others clamp to their ends
+        if self.periodic and self.total > 0:
+            s %= self.total
+        i = bisect.bisect_right(self._s_list, s) - 1
+        i = min(max(i, 0), self.n - 2)
+        s0, s1 = self._s_list[i], self._s_list[i + 1]
+        f = (s - s0) / (s1 - s0) if s1 > s0 else 0.0
+        f = min(max(f, 0.0), 1.0)
+        return self._t_list[i] + f * self.step
+
+    def times(self, s):
+        # Vectorized t_at for arrays of distances
+        s = np.asarray(s, dtype=float)
+        if self.periodic and self.total > 0:
+            s = np.mod(s, self.total)
+        i = np.clip(np.searchsorted(self.s, s, side="right") - 1, 0, self.n - 2)
+        s0, s1 = self.s[i], self.s[i + 1]
+        ds = s1 - s0
+        f = np.divide(s - s0, ds, out=np.zeros_like(s), where=ds > 0)
+        return self.t[i] + np.clip(f, 0.0, 1.0) * self.step
+
+    def advance(self, t, distance):
+        # Move `distance` along the path from t. Like advance_motion_time,
+        # paths that are not closed start over once they reach the end.
+        s = self.s_at(t) + distance
+        if not self.periodic and s > self.total:
+            s = 0.0
+        return self.t_at(s)
+
+def arc_length_for(mtype, params, current=None):
+    if current is not None and current.key == ArcLengthTable.key_for(mtype, params):
+        return current
+    return ArcLengthTable(mtype, params)
+
+def constant_speed_state(vx, vy, ax, ay, path_speed):
+    # Velocity and acceleration of the same path traversed at |v| = path_speed.
+    # Only the normal part of the acceleration survives, scaled by (c/|v|)^2.
+    v2 = vx*vx + vy*vy
+    if v2 == 0:
+        return 0.0, 0.0, 0.0, 0.0
+    scale = path_speed / np.sqrt(v2)
+    along = (ax*vx + ay*vy) / v2
+    return (scale*vx, scale*vy,
+            scale*scale * (ax - along*vx), scale*scale * (ay - along*vy))
+
+
+# -----------------------------
+# Motion trail
+# -----------------------------
+
+TRAIL_RGB = (1.0, 0.5, 0.05)  # Matplotlib's second default color ("C1")
+TRAIL_MAX_PATHS = 256          # Agg's per-path overhead dominates long trails
+
+class MotionTrail:
+    # Last `length` positions of the moving point, in preallocated ring
+    # buffers. Points are stored in runs of `chunk` points, one polyline per
+    # run, so even 10k+ points draw as a few hundred paths; each run is
+    # faded by its age. The LineCollection drawing the trail keeps views of
+    # the run rows, so its segments are never rebuilt per frame.
+    def __init__(self, length=500, max_paths=TRAIL_MAX_PATHS):
+        self.length = length = max(int(length), 2)
+        self.chunk = -(-length // max_paths)
+        self.n_runs = -(-length // self.chunk)
+        # Vertex 0 of a run repeats the last point of the run before it.
+        # NaN vertices are not drawn.
+        self.runs = np.full((self.n_runs, self.chunk + 1, 2), np.nan)
+        self.run_speed = np.zeros(self.n_runs)  # latest speed in each run
+        self.rgba = np.zeros((self.n_runs, 4))
+        self.rgba[:, :3] = TRAIL_RGB
+        self.head = 0         # next point slot, 0 .. n_runs * chunk - 1
+        self.filled_runs = 0
+        self.collection = None
+        self._last = None     # previous point; None after clear()
+        self._runs_index = np.arange(self.n_runs)
+        self._scratch = np.empty(self.n_runs)
+        self._index = np.empty(self.n_runs, dtype=np.intp)
+        self._lut = None
+        self._shared = False
+
+    def clear(self):
+        self.runs.fill(np.nan)
+        self.run_speed.fill(0.0)
+        self.head = 0
+        self.filled_runs = 0
+        self._last = None
+
+    def push(self, x, y, speed, connect=True):
+        run, j = divmod(self.head, self.chunk)
+        if not connect and j != 0:
+            # Jump (e.g. the parabola restarting): start a new run so it is not drawn
+            run = (run + 1) % self.n_runs
+            j = 0
+        rows = self.runs[run]
+        if j == 0:
+            # Taking over the oldest run
+            rows.fill(np.nan)
+            if connect and self._last is not None:
+                rows[0] = self._last
+            self.filled_runs = min(self.filled_runs + 1, self.n_runs)
+        rows[j + 1] = (x, y)
+        self.run_speed[run] = speed
+        self._last = (x, y)
+        self.head = (run * self.chunk + j + 1) % (self.n_runs * self.chunk)
+
+    def update_colors(self, by_speed=False):
+        # Alpha fades with run age (newest 1, oldest ~0); RGB is TRAIL_RGB or
+        # the speed through a colormap lookup table. All in place.
+        rgba, tmp = self.rgba, self._scratch
+        if by_speed:
+            top = self.run_speed.max()
+            np.multiply(self.run_speed, (len(self._lut) - 1) / top if top > 0 else 0.0, out=tmp)
+            np.copyto(self._index, tmp, casting="unsafe")
+            np.take(self._lut, self._index, axis=0, out=rgba)
+        else:
+            rgba[:, :3] = TRAIL_RGB
+        newest = (self.head - 1) % (self.n_runs * self.chunk) // self.chunk
+        np.subtract(newest, self._runs_index, out=tmp)
+        np.mod(tmp, self.n_runs, out=tmp)
+        np.multiply(tmp, -1.0 / max(self.filled_runs, 1), out=tmp)
+        tmp += 1.0
+        np.clip(tmp, 0.0, 1.0, out=rgba[:, 3])
+
+    def make_collection(self, animated=False):
+        # New artist for a full redraw (the axes was cleared)
+        import matplotlib
+        from matplotlib.collections import LineCollection
+
+        if self._lut is None:
+            self._lut = matplotlib.colormaps["viridis"](np.linspace(0.0, 1.0, 256))
+        lc = LineCollection(list(self.runs), linewidths=1.5, animated=animated)
+        lc.set_color(self.rgba)
+        # Paths wrap the row views unless Matplotlib copied them; then sync() re-sets them
+        self._shared = np.shares_memory(lc.get_paths()[0].vertices, self.runs)
+        self.collection = lc
+        return lc
+
+    def sync(self):
+        # Push the in-place updates to the artist
+        lc = self.collection
+        if not self._shared:
+            lc.set_segments(self.runs)
+        lc.set_color(self.rgba)
+
+
+# -----------------------------
+# Particles
+# -----------------------------
+# Many points on the same path, each with its own phase and time rate. The
+# state is a few flat arrays, evaluated with one vectorized motion_state call
+# per frame and drawn as one scatter plus one quiver (every k-th particle).
+
+SWARM_MAX_ARROWS = 48
+
+class ParticleSwarm:
+    def __init__(self, n=1000, spread=0.0, max_arrows=SWARM_MAX_ARROWS):
+        self.n = n = max(int(n), 1)
+        self.spread = float(spread)
+        i = np.arange(n)
+        self.phase = i / n  # head start, as a fraction of the cycle
+        self.rate = 1.0 + self.spread * (2.0 * i / max(n - 1, 1) - 1.0)  # rates 1 +- spread
+        self.t = np.empty(n)
+        self.xy = np.empty((n, 2))
+        self.step = -(-n // max_arrows)  # arrow decimation
+        self.scatter = None
+        self.quiver = None
+
+    def update(self, mtype, params, t):
+        # Path time of every particle, wrapped into one cycle, then all
+        # positions and velocities at once. Returns the arrow U, V and the
+        # speed of particle 0.
+        t0, t1, _periodic = motion_cycle(mtype, params)
+        span = t1 - t0
+        ts = self.t
+        np.multiply(self.rate, (t - t0) / span, out=ts)
+        ts += self.phase
+        np.mod(ts, 1.0, out=ts)
+        ts *= span
+        ts += t0
+        px, py, vx, vy, _ax, _ay = motion_state(mtype, params, ts)
+        self.xy[:, 0] = px
+        self.xy[:, 1] = py
+        vx = np.broadcast_to(vx, ts.shape)  # parabola vx is a scalar
+        vy = np.broadcast_to(vy, ts.shape)
+        return vx[::self.step], vy[::self.step], float(np.hypot(vx[0], vy[0]))
+
+    def make_artists(self, ax, mtype, params, t, v_scale, animated=False):
+        # One size and one color keep the scatter on Agg's single-marker fast
+        # path; per-point colors cost ~7 us per particle per frame.
+        u, v, speed = self.update(mtype, params, t)
+        arrows = self.xy[::self.step]
+        self.scatter = ax.scatter(self.xy[:, 0], self.xy[:, 1], s=6, color="C1", linewidths=0, animated=animated,
+                                  label=f"{self.n} particles")
+        self.quiver = ax.quiver(arrows[:, 0], arrows[:, 1], v_scale*u, v_scale*v, angles="xy",
+                                scale_units="xy", scale=1, width=0.003, animated=animated)
+        return self.scatter, self.quiver, speed
+
+    def sync(self, mtype, params, t, v_scale):
+        # Per frame: new offsets and arrows on the existing artists
+        u, v, speed = self.update(mtype, params, t)
+        self.scatter.set_offsets(self.xy)
+        self.quiver.set_offsets(self.xy[::self.step])
+        self.quiver.set_UVC(v_scale*u, v_scale*v)
+        return speed
+
+
+# -----------------------------
+# Headless frame rendering
+# -----------------------------
+
+def motion_times(mtype, params, n_frames, dt=0.03, t_start=0.0):
+    # The t values the animation loop visits, starting from t_start
+    times = np.empty(n_frames)
+    t = t_start
+    for i in range(n_frames):
+        times[i] = t
+        t = advance_motion_time(mtype, t, dt, params["omega"], (params["t_min"], params["t_max"]))
+    return times
+
+def _render_frame_chunk(frame_dir, mtype, params, frames, figsize, dpi):
+    # Process-pool worker: one Agg figure, reused for a run of frames
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ppu = pixels_per_unit(ax, MOTION_LIM[1] - MOTION_LIM[0])
+    paths = []
+    for index, t0 in frames:
+        draw_motion_frame(ax, mtype, params, t0, ppu)
+        path = os.path.join(frame_dir, f"frame_{index:05d}.png")
+        canvas.print_png(path)
+        paths.append(path)
+    return paths
+
+def _write_gif(out, frame_paths, fps):
+    from PIL import Image  # Pillow ships with Matplotlib
+
+    frames = [Image.open(path).convert("RGB").quantize(colors=256) for path in frame_paths]
+    frames[0].save(out, save_all=True, append_images=frames[1:],
+                   duration=max(int(round(1000.0 / fps)), 1), loop=0)
+
+def render_motion_frames(out, n_frames=120, mtype="Ellipse/Circle", params=None, dt=0.03,
+                         t_start=0.0, workers=None, figsize=(7.6, 6.2), dpi=100, fps=None):
+    # Render the Parametric Motion animation without Tk. `out` is a directory
+    # for frame_00000.png, ... or a file path ending in .gif. Frames only
+    # depend on t, so they are split across a process pool.
+    if mtype not in MOTION_PATHS:
+        raise ValueError(f"Unknown motion path: {mtype}")
+    if n_frames < 1:
+        raise ValueError("Need at least one frame.")
+    if dt <= 0:
+        raise ValueError("dt must be positive.")
+    full = dict(MOTION_DEFAULTS)
+    full.update(params or {})
+
+    times = motion_times(mtype, full, n_frames, dt, t_start)
+    indexed = list(enumerate(times.tolist()))
+    workers = max(1, min(workers or os.cpu_count() or 1, n_frames))
+    # Contiguous chunks keep each worker's figure state warm
+    chunks = [indexed[i:i + -(-n_frames // workers)] for i in range(0, n_frames, -(-n_frames // workers))]
+
+    gif = out.lower().endswith(".gif")
+    frame_dir = tempfile.mkdtemp(prefix="sdl2_frames_") if gif else out
+    os.makedirs(frame_dir, exist_ok=True)
+    try:
+        if len(chunks) == 1:
+            paths = _render_frame_chunk(frame_dir, mtype, full, indexed, figsize, dpi)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+                futures = [pool.submit(_render_frame_chunk, frame_dir, mtype, full, chunk, figsize, dpi)
+                           for chunk in chunks]
+                paths = [path for future in futures for path in future.result()]
+        if not gif:
+            return paths
+        _write_gif(out, paths, fps or 1.0 / dt)
+        return [out]
+    finally:
+        if gif:
+            shutil.rmtree(frame_dir, ignore_errors=True)
+
+
+# -----------------------------
+# Data export
+# -----------------------------
+# Sampled curves and trajectories as rows of EXPORT_COLUMNS. The *_export
+# functions return (row count, generator of row chunks); write_export
+# streams the chunks to CSV or a memory-mapped .npy, so exports of
+# millions of rows never hold the whole table in memory.
+
+EXPORT_COLUMNS = ("t", "x", "y", "vx", "vy", "ax", "ay", "speed")
+EXPORT_CHUNK = 65536  # rows per chunk
+CURVE_T_RANGES = {"Parabola": (-6.0, 6.0), "Ellipse": (0.0, 2*np.pi), "Hyperbola": (-3.0, 3.0)}
+
+def curve_state(ctype, t, a=1.0, b=1.0, h=0.0, k=0.0, branch=1):
+    # Point and first/second derivatives in the curve parameter t
+    # (the parametrizations of parabola_xy, ellipse_xy and hyperbola_xy)
+    if ctype == "Parabola":
+        x, y = parabola_xy(t, a=a, h=h, k=k)
+        return x, y, 1.0, 2.0 * a * (t - h), 0.0, 2.0 * a
+    if ctype == "Ellipse":
+        x, y = ellipse_xy(t, a=a, b=b, h=h, k=k)
+        return x, y, -a * np.sin(t), b * np.cos(t), h - x, k - y
+    if ctype == "Hyperbola":
+        x, y = hyperbola_xy(t, a=a, b=b, h=h, k=k, branch=branch)
+        return x, y, branch * a * np.sinh(t), b * np.cosh(t), x - h, y - k
+    raise ValueError(f"Unknown curve type: {ctype}")
+
+def _export_row_count(t_start, t_end, dt):
+    if dt <= 0:
+        raise ValueError("dt must be positive.")
+    if not t_start < t_end:
+        raise ValueError("The export start must be before its end.")
+    return int(np.floor((t_end - t_start) / dt + 1e-9)) + 1
+
+def _rows(t, state):
+    rows = np.empty((t.size, len(EXPORT_COLUMNS)))
+    rows[:, 0] = t
+    for col, arr in enumerate(state, start=1):
+        rows[:, col] = arr  # constant derivatives are scalars and broadcast
+    np.hypot(rows[:, 3], rows[:, 4], out=rows[:, 7])
+    return rows
+
+def _time_chunks(t_start, dt, n_rows, chunk):
+    # t = t_start + i*dt a chunk at a time (no accumulated rounding)
+    for start in range(0, n_rows, chunk):
+        yield t_start + dt * np.arange(start, min(start + chunk, n_rows))
+
+def transform_export(ctype, a=3.0, b=2.0, h=0.0, k=0.0, branch=1, t_start=None, t_end=None, dt=1e-3,
+                     chunk=EXPORT_CHUNK):
+    # The transformed Transform-tab curve against its parameter t
+    if ctype not in CURVE_T_RANGES:
+        raise ValueError(f"Unknown curve type: {ctype}")
+    t0, t1 = CURVE_T_RANGES[ctype]
+    t_start = t0 if t_start is None else t_start
+    t_end = t1 if t_end is None else t_end
+    n_rows = _export_row_count(t_start, t_end, dt)
+    chunks = (_rows(t, curve_state(ctype, t, a, b, h, k, branch))
+              for t in _time_chunks(t_start, dt, n_rows, chunk))
+    return n_rows, chunks
+
+def motion_export(mtype, params=None, t_start=None, t_end=None, dt=0.01, force=None, chunk=EXPORT_CHUNK):
+    # Motion-tab trajectory from t_start to t_end (default: one cycle) every
+    # dt. With force = (model, drag) the rows come from the integrator, run
+    # a chunk at a time from the path's start point with step dt (plus one
+    # shorter step when t_start is off that grid).
+    if mtype not in MOTION_PATHS:
+        raise ValueError(f"Unknown motion path: {mtype}")
+    full = dict(MOTION_DEFAULTS)
+    full.update(params or {})
+    t0, t1, _periodic = motion_cycle(mtype, full)
+    t_start = t0 if t_start is None else t_start
+    t_end = t1 if t_end is None else t_end
+    n_rows = _export_row_count(t_start, t_end, dt)
+    if force is None:
+        chunks = (_rows(t, motion_state(mtype, full, t)) for t in _time_chunks(t_start, dt, n_rows, chunk))
+        return n_rows, chunks
+    if t_start < t0 - 1e-12:
+        raise ValueError(f"Force-model exports start at or after the path's start time ({t0:g}).")
+    field = force_field(force[0], mtype, full, force[1])
+    px, py, vx, vy, _ax, _ay = motion_state(mtype, full, t0)
+    state0 = np.array([[px], [py], [vx], [vy], [0.0]], dtype=float)
+    steps = (t_start - t0) / dt
+    skip, lead = round(steps), 0.0
+    if abs(steps - skip) > 1e-9:
+        skip = int(steps)
+        lead = t_start - t0 - skip * dt
+    return n_rows, _physics_chunks(field, state0, t_start, dt, skip, lead, n_rows, chunk)
+
+def _physics_chunks(field, state, t_start, dt, skip, lead, n_rows, chunk):
+    method = "verlet" if field.drag is None else "rk4"
+    # Integrate up to t_start without keeping the states: whole steps, then
+    # the part step `lead`
+    while skip > 0:
+        n = min(chunk, skip)
+        state = integrate(field, state, dt, n, method)[-1]
+        skip -= n
+    if lead > 0:
+        state = integrate(field, state, lead, 1, method)[-1]
+    for start in range(0, n_rows, chunk):
+        m = min(chunk, n_rows - start)
+        if start == 0:
+            states = integrate(field, state, dt, m - 1, method)  # includes the start state
+        else:
+            states = integrate(field, state, dt, m, method)[1:]
+        state = states[-1]
+        x, y, vx, vy = (states[:, i, 0] for i in range(4))
+        ax, ay, _power = field.accel(x, y, vx, vy)
+        yield _rows(t_start + dt * np.arange(start, start + m), (x, y, vx, vy, ax, ay))
+
+def write_export(path, n_rows, chunks):
+    # Stream chunks to `path`: a .npy file (float64, shape (n_rows, 8), columns
+    # in EXPORT_COLUMNS order, written through a memory map) or CSV with a
+    # header row. Returns the number of rows written.
+    written = 0
+    if path.lower().endswith(".npy"):
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n_rows, len(EXPORT_COLUMNS)))
+        try:
+            for rows in chunks:
+                out[written:written + len(rows)] = rows
+                written += len(rows)
+            out.flush()
+        finally:
+            del out
+        return written
+    with open(path, "w", newline="") as f:
+        f.write(",".join(EXPORT_COLUMNS) + "\n")
+        for rows in chunks:
+            np.savetxt(f, rows, fmt="%.10g", delimiter=",")
+            written += len(rows)
+    return written
+
+
+# -----------------------------
+# Hover readouts
+# -----------------------------
+# Mouse-over inspection: the pointer snaps to the nearest drawn sample
+# through a grid index (motion events come in at a high rate), and the
+# readout is blitted over the last full draw.
+
+def curve_parameter(ctype, x, y, a=1.0, b=1.0, h=0.0, k=0.0):
+    # Inverse of curve_state's parametrization for a point on (or near) the curve
+    if ctype == "Parabola":
+        return x
+    if ctype == "Ellipse":
+        return np.arctan2((y - k) / b, (x - h) / a) % (2*np.pi)
+    return np.arcsinh((y - k) / b)
+
+def curvature(vx, vy, ax, ay):
+    # |v x a| / |v|^3; infinite where the point is at rest
+    speed3 = (vx * vx + vy * vy) ** 1.5
+    return abs(vx * ay - vy * ax) / speed3 if speed3 > 0 else float("inf")
+
+GRID_SIDE = 32        # cells along the longer side of the samples' bounding box
+GRID_BUILD = 1 << 21  # center-to-point distances per chunk while building
+
+class PointGrid:
+    # Nearest-point queries over 2-D points (NaN gaps skipped). A uniform
+    # grid over the points' bounding box keeps, per cell, every point that
+    # can be the nearest to some query inside it: with d the distance from
+    # the cell's center to its nearest point and s the half-diagonal, that
+    # is every point within d + 2s of the center. A query is then one cell
+    # lookup and a scan of its few candidates. Queries outside the box scan
+    # all points.
+    def __init__(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        keep = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        self.x = x.tolist()  # for HoverReadout's interpolation between samples
+        self.y = y.tolist()
+        self.keep, self.z = keep, x[keep] + 1j * y[keep]
+        self.cells = []  # row-major: (indices, points as x + iy) of the candidates
+        if keep.size == 0:
+            return
+        px, py = x[keep], y[keep]
+        self.x0, self.y0 = px.min(), py.min()
+        c = self.cell = max(np.ptp(px), np.ptp(py), 1e-9) / GRID_SIDE
+        self.nx = int(np.ptp(px) // c) + 1
+        self.ny = int(np.ptp(py) // c) + 1
+        centers_x, centers_y = (a.ravel() for a in np.meshgrid(self.x0 + (np.arange(self.nx) + 0.5) * c,
+                                                              self.y0 + (np.arange(self.ny) + 0.5) * c))
+        reach = np.sqrt(2.0) * c  # 2s
+        step = max(GRID_BUILD // keep.size, 1)
+        for lo in range(0, centers_x.size, step):
+            d2 = (centers_x[lo:lo + step, None] - px) ** 2 + (centers_y[lo:lo + step, None] - py) ** 2
+            limit = (np.sqrt(d2.min(axis=1)) + reach) ** 2 * (1 + 1e-9)
+            rows, cols = np.nonzero(d2 <= limit[:, None])
+            bounds = np.searchsorted(rows, np.arange(len(d2) + 1)).tolist()
+            indices, z = keep[cols], self.z[cols]
+            self.cells.extend((indices[a:b], z[a:b]) for a, b in zip(bounds[:-1], bounds[1:]))
+
+    def nearest(self, qx, qy):
+        # Index of the closest point, or None when there are none
+        if not self.cells:
+            return None
+        ix = int((qx - self.x0) // self.cell)
+        iy = int((qy - self.y0) // self.cell)
+        if 0 <= ix < self.nx and 0 <= iy < self.ny:
+            indices, z = self.cells[iy * self.nx + ix]
+        else:
+            indices, z = self.keep, self.z
+        return int(indices[np.abs(z - complex(qx, qy)).argmin()])
+
+class HoverReadout:
+    # Snap-to-curve readout for one axes. set_samples() takes the drawn
+    # samples (NaN separates curves) and describe(i, f) -> (x, y, text) for
+    # the point a fraction f of the way from sample i to i + 1; the grid is
+    # built on the first query after they change. The marker and label are
+    # animated artists blitted over the background saved at the last full
+    # draw, so hovering never calls canvas.draw().
+    def __init__(self, ax, canvas, deferred=None):
+        self.ax = ax
+        self.canvas = canvas
+        self.deferred = deferred  # () -> True while the animation blits (and draws us) every frame
+        self.background = None
+        self.visible = False
+        self.queries = 0
+        self._samples = None
+        self._grid = None
+        self._marker = None
+        self._label = None
+        self._shown = None  # (x, y, text) on screen
+
+    def connect(self):
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+        self.canvas.mpl_connect("motion_notify_event", self.on_move)
+        self.canvas.mpl_connect("axes_leave_event", self.on_leave)
+
+    def set_samples(self, x, y, describe):
+        self._samples = (x, y, describe)
+        self._grid = None
+        self.visible = False  # the old readout is stale
+
+    def on_draw(self, _event):
+        # A full draw leaves out the (animated) readout until the next move
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.visible = False
+
+    def on_move(self, event):
+        if event.inaxes is not self.ax or self._samples is None:
+            self.on_leave(event)
+            return
+        hit = self.query(event.xdata, event.ydata)
+        if hit is None:
+            self.on_leave(event)
+            return
+        if self.visible and hit == self._shown:
+            return  # same snapped point: nothing to redraw
+        self._shown = hit
+        px, py, text = hit
+        marker, label = self._artists()
+        marker.set_data([px], [py])
+        # Keep the label inside the axes (the blit only covers the axes)
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        right, top = px > 0.5 * (x0 + x1), py > 0.5 * (y0 + y1)
+        label.xy = (px, py)
+        label.xyann = (-12 if right else 12, -12 if top else 12)
+        label.set_ha("right" if right else "left")
+        label.set_va("top" if top else "bottom")
+        label.set_text(text)
+        self.visible = True
+        self._blit()
+
+    def on_leave(self, _event):
+        if self.visible:
+            self.visible = False
+            self._blit()
+
+    def query(self, qx, qy):
+        # (x, y, text) for the closest point of the samples, or None
+        x, y, describe = self._samples
+        if self._grid is None:
+            self._grid = PointGrid(x, y)
+        i = self._grid.nearest(qx, qy)
+        if i is None:
+            return None
+        self.queries += 1
+        # Project onto the two segments around the nearest sample
+        xs, ys = self._grid.x, self._grid.y
+        best = (i, 0.0, (xs[i] - qx) ** 2 + (ys[i] - qy) ** 2)
+        for j in (i - 1, i):
+            if j < 0 or j + 1 >= len(xs):
+                continue
+            dx, dy = xs[j + 1] - xs[j], ys[j + 1] - ys[j]
+            length2 = dx * dx + dy * dy
+            if not (np.isfinite(length2) and length2 > 0):
+                continue
+            f = min(max(((qx - xs[j]) * dx + (qy - ys[j]) * dy) / length2, 0.0), 1.0)
+            d2 = (xs[j] + f * dx - qx) ** 2 + (ys[j] + f * dy - qy) ** 2
+            if d2 < best[2]:
+                best = (j, f, d2)
+        return describe(best[0], best[1])
+
+    def _artists(self):
+        # Created on first use and again after the axes was cleared
+        if self._marker is None or self._marker.axes is not self.ax:
+            self._marker, = self.ax.plot([], [], "o", ms=7, mfc="none", mec="k", mew=1.5, animated=True)
+            self._label = self.ax.annotate("", (0, 0), xytext=(12, 12), textcoords="offset points", fontsize=8,
+                                           bbox=dict(boxstyle="round", fc="white", ec="0.6", alpha=0.9),
+                                           animated=True)
+        return self._marker, self._label
+
+    def draw_artists(self):
+        if self.visible and self._marker is not None and self._marker.axes is self.ax:
+            self.ax.draw_artist(self._marker)
+            self.ax.draw_artist(self._label)
+
+    def _blit(self):
+        if self.background is None or (self.deferred is not None and self.deferred()):
+            return  # the animation draws the readout with its next frame
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.ax.bbox)
+
+
+# -----------------------------
+# Curve overlays
+# -----------------------------
+# Tangent, normal, osculating circle and curvature fields along a whole
+# curve, from its analytic derivatives. Arrow density follows the zoom level.
+
+OVERLAYS = (("tangent", "Unit tangent"), ("normal", "Unit normal"),
+            ("osculating", "Osculating circles"), ("curvature", "Curvature colors"))
+OVERLAY_ARROWS = 24       # tangent/normal arrows on screen, whatever the zoom
+OVERLAY_CIRCLES = 5       # osculating circles on screen
+OVERLAY_MIN_GAP = 16      # pixels between neighbouring arrows
+OVERLAY_ARROW_PX = 36     # longest arrow, in pixels
+OVERLAY_COLOR_PATHS = 256  # curvature-colored pieces (Agg's per-path overhead)
+OVERLAY_REFINE = 4096     # most points resampled over the visible part of a curve
+
+def frenet_frame(x, y, vx, vy, ax, ay):
+    # (x, y, tx, ty, nx, ny, curvature) for every sample at once: the unit
+    # tangent, the unit normal turned toward the center of curvature, and
+    # |v x a| / |v|^3. NaN where the point is at rest.
+    x, y, vx, vy, ax, ay = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (x, y, vx, vy, ax, ay)))
+    speed = np.hypot(vx, vy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tx, ty = vx / speed, vy / speed
+        signed = (vx * ay - vy * ax) / speed**3
+    side = np.where(signed < 0, -1.0, 1.0)  # center on the left when turning left
+    return x, y, tx, ty, -side * ty, side * tx, np.abs(signed)
+
+def spaced_samples(sx, sy, inside, budget, min_gap=OVERLAY_MIN_GAP):
+    # Level of detail: indices about evenly spaced along the on-screen part
+    # of a curve sampled at screen points (sx, sy), at most `budget` of them.
+    # Returns (indices, spacing in pixels).
+    seg = np.hypot(np.diff(sx), np.diff(sy))
+    seg[~(inside[:-1] & inside[1:])] = 0.0
+    length = np.concatenate(([0.0], np.cumsum(seg)))
+    total = length[-1]
+    if budget <= 0 or not total > 0:
+        return np.empty(0, dtype=int), float(min_gap)
+    gap = max(total / budget, min_gap)
+    idx = np.searchsorted(length, np.arange(0.5 * gap, total, gap))
+    return np.unique(idx[inside[idx]]), gap
+
+def curvature_collection(frame, max_paths=OVERLAY_COLOR_PATHS):
+    # The curve in at most max_paths pieces, colored by curvature on a log
+    # scale (purple = nearly straight, yellow = tightest)
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import LogNorm
+
+    x, y, *_unit, kappa = frame
+    n = x.size
+    if n < 2:
+        return LineCollection([])
+    bounds = np.linspace(0, n - 1, min(max_paths, n - 1) + 1).astype(int)
+    pieces = [np.column_stack((x[i:j + 1], y[i:j + 1])) for i, j in zip(bounds[:-1], bounds[1:])]
+    values = kappa[(bounds[:-1] + bounds[1:]) // 2]
+    known = kappa[np.isfinite(kappa) & (kappa > 0)]
+    lo, hi = (np.percentile(known, (2, 98)) if known.size else (1.0, 1.0))
+    hi = max(hi, lo * 1.001)
+    lc = LineCollection(pieces, cmap="viridis", norm=LogNorm(lo, hi), linewidths=3)
+    lc.set_array(np.clip(np.nan_to_num(values, nan=lo, posinf=hi), lo, hi))
+    return lc
+
+class CurveOverlays:
+    # Tangent and normal arrows, osculating circles and curvature colors
+    # along one curve, given its sample parameters t and an `evaluate(t)`
+    # returning frenet_frame() arrays. Whenever the axes limits change
+    # (toolbar zoom or pan) the on-screen part of the curve is resampled
+    # and the arrows and circles are picked again, so their number stays
+    # within budget at any zoom level.
+    def __init__(self, ax):
+        self.ax = ax
+        self.t = None
+        self.evaluate = None
+        self.frame = None       # at the samples
+        self.shown = ()
+        self._artists = []      # arrows and circles for the current limits
+        self._colors = None     # curvature LineCollection
+        self._callbacks = None  # registry the limit callbacks are on
+
+    def show(self, t, evaluate, shown):
+        # After the axes was (re)built: the curve (t None for none) and the overlay names to draw
+        self.t, self.evaluate, self.shown = t, evaluate, tuple(shown)
+        self.frame = evaluate(t) if t is not None and self.shown else None
+        self._remove([self._colors])
+        self._colors = None
+        if self.frame is not None and "curvature" in self.shown:
+            self._colors = self.ax.add_collection(curvature_collection(self.frame), autolim=False)
+        if self._callbacks is not self.ax.callbacks:  # ax.clear() starts a new registry
+            self._callbacks = self.ax.callbacks
+            self._callbacks.connect("xlim_changed", self._on_limits)
+            self._callbacks.connect("ylim_changed", self._on_limits)
+        self.update()
+
+    def _on_limits(self, _ax):
+        self.update()
+
+    def _remove(self, artists):
+        for artist in artists:
+            if artist is not None and artist.axes is self.ax:
+                artist.remove()
+
+    def _screen(self, x, y):
+        # Screen points and which of them are inside the axes
+        with np.errstate(invalid="ignore"):
+            sx, sy = self.ax.transData.transform(np.column_stack((x, y))).T
+            x0, y0, x1, y1 = self.ax.bbox.extents
+            return sx, sy, (sx >= x0) & (sx <= x1) & (sy >= y0) & (sy <= y1)
+
+    def _visible_frame(self):
+        # The frame on a parameter grid a few pixels fine over the sample
+        # segments that reach into the axes; NaN rows separate the runs
+        x, y = self.frame[0], self.frame[1]
+        sx, sy, _inside = self._screen(x, y)
+        x0, y0, x1, y1 = self.ax.bbox.extents
+        with np.errstate(invalid="ignore"):
+            near = ((np.minimum(sx[:-1], sx[1:]) <= x1) & (np.maximum(sx[:-1], sx[1:]) >= x0)
+                    & (np.minimum(sy[:-1], sy[1:]) <= y1) & (np.maximum(sy[:-1], sy[1:]) >= y0))
+        seg = np.flatnonzero(near)
+        if seg.size == 0:
+            return None
+        counts = np.ceil(np.hypot(sx[seg + 1] - sx[seg], sy[seg + 1] - sy[seg]) / (0.25 * OVERLAY_MIN_GAP))
+        counts = np.maximum(counts, 1)
+        if counts.sum() > OVERLAY_REFINE:
+            counts = np.maximum(np.floor(counts * OVERLAY_REFINE / counts.sum()), 1)
+        counts = counts.astype(int)
+        rep = np.repeat(seg, counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        f = (np.arange(rep.size) - starts) / np.repeat(counts, counts)
+        t = self.t[rep] + f * (self.t[rep + 1] - self.t[rep])
+        breaks = np.flatnonzero(np.diff(rep) > 1) + 1
+        return self.evaluate(np.insert(t, breaks, np.nan))
+
+    def update(self):
+        self._remove(self._artists)
+        self._artists = []
+        shown = self.shown
+        if self.frame is None or not {"tangent", "normal", "osculating"} & set(shown):
+            return
+        from matplotlib.collections import EllipseCollection
+
+        ax = self.ax
+        ax.apply_aspect()  # the equal-aspect box, as it will be drawn
+        frame = self._visible_frame()
+        if frame is None:
+            return
+        x, y, tx, ty, nx, ny, kappa = frame
+        sx, sy, inside = self._screen(x, y)
+        inside &= np.isfinite(tx)
+        xlim = ax.get_xlim()
+        span = abs(xlim[1] - xlim[0])
+        ppu = ax.bbox.width / span  # equal aspect: the same in y
+
+        if "tangent" in shown or "normal" in shown:
+            idx, gap = spaced_samples(sx, sy, inside, OVERLAY_ARROWS)
+            length = min(0.8 * gap, OVERLAY_ARROW_PX) / ppu
+            for name, ux, uy, color in (("tangent", tx, ty, "tab:green"), ("normal", nx, ny, "tab:red")):
+                if name in shown and idx.size:
+                    self._artists.append(ax.quiver(x[idx], y[idx], length * ux[idx], length * uy[idx], color=color,
+                                                   angles="xy", scale_units="xy", scale=1, width=0.004))
+        if "osculating" in shown:
+            idx, _gap = spaced_samples(sx, sy, inside, OVERLAY_CIRCLES)
+            with np.errstate(divide="ignore"):
+                radius = 1.0 / kappa[idx]
+            keep = radius < 2 * span  # nearly straight: the circle would fill the view
+            idx, radius = idx[keep], radius[keep]
+            if idx.size:
+                centers = np.column_stack((x[idx] + radius * nx[idx], y[idx] + radius * ny[idx]))
+                circles = EllipseCollection(2 * radius, 2 * radius, 0.0, units="xy", offsets=centers,
+                                            offset_transform=ax.transData, facecolors="none",
+                                            edgecolors="tab:purple", linewidths=0.8, alpha=0.7)
+                self._artists.append(ax.add_collection(circles, autolim=False))
+
+
+# -----------------------------
+# Render scheduling
+# -----------------------------
+
+class RenderScheduler:
+    # Slider events only mark a render as dirty; at most one redraw per
+    # display frame runs, with whatever the Tk variables hold at that point.
+    # Renders whose data is computed in the background call finish() once
+    # their pixels are drawn; latency runs from the first unanswered event.
+    def __init__(self, widget, frame_ms=16, on_report=None):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.on_report = on_report
+        self.after_id = None
+        self.first_event = {}   # render -> perf_counter() of first event since last redraw
+        self.events = {}        # render -> events since last redraw
+        self.in_flight = {}     # render -> (first event time, coalesced events) until finish()
+        self.total_events = 0
+        self.total_renders = 0
+
+    def request(self, render):
+        if render not in self.first_event:
+            self.first_event[render] = time.perf_counter()
+            self.events[render] = 0
+        self.events[render] += 1
+        self.total_events += 1
+        if self.after_id is None:
+            self.after_id = self.widget.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        self.after_id = None
+        first_event, self.first_event = self.first_event, {}
+        events, self.events = self.events, {}
+        for render, t0 in first_event.items():
+            # A render still waiting on the worker is superseded: its events count as coalesced
+            t_prev, coalesced = self.in_flight.get(render, (t0, -1))
+            self.in_flight[render] = (min(t_prev, t0), coalesced + events[render])
+            render()
+
+    def finish(self, render):
+        pending = self.in_flight.pop(render, None)
+        if pending is None:
+            return  # not a slider-driven render
+        t0, coalesced = pending
+        # Let Tk push the new canvas image before taking the timestamp
+        self.widget.update_idletasks()
+        latency_ms = 1000.0 * (time.perf_counter() - t0)
+        self.total_renders += 1
+        if self.on_report is not None:
+            self.on_report(render, coalesced, latency_ms)
+
+
+class FrameClock:
+    # Wall-clock pacing for the animation. Simulated time advances by the
+    # measured time between frames, frames are due on a fixed grid of
+    # deadlines, and deadlines already missed are skipped, not made up.
+    def __init__(self, fps=30.0, max_step=0.25, clock=time.perf_counter):
+        self.max_step = max_step  # cap one step after a stall (window drag, breakpoint)
+        self.clock = clock        # a virtual clock makes replays deterministic
+        self.set_fps(fps)
+        self.reset()
+
+    def set_fps(self, fps):
+        self.target_fps = min(max(float(fps), 1.0), 240.0)
+        self.period = 1.0 / self.target_fps
+
+    def reset(self):
+        now = self.clock()
+        self.last = now
+        self.next_deadline = now
+        self.frames = 0
+        self.skipped = 0
+        self.stamps = deque(maxlen=32)
+
+    def tick(self):
+        # Call once per rendered frame; returns the elapsed wall time to simulate
+        now = self.clock()
+        elapsed = min(now - self.last, self.max_step)
+        self.last = now
+        self.frames += 1
+        self.stamps.append(now)
+
+        self.next_deadline += self.period
+        if now > self.next_deadline:
+            missed = int((now - self.next_deadline) / self.period) + 1
+            self.skipped += missed
+            self.next_deadline += missed * self.period
+        return elapsed
+
+    def delay_ms(self):
+        # Never 0 ms: Tk needs a chance to process input between frames
+        return max(1, int(round(1000.0 * (self.next_deadline - self.clock()))))
+
+    def real_fps(self):
+        if len(self.stamps) < 2:
+            return 0.0
+        return (len(self.stamps) - 1) / max(self.stamps[-1] - self.stamps[0], 1e-9)
+
+RENDER_CACHE_MB = 64   # default memory cap of the Transform tab's render cache
+RENDER_QUANTUM = 1e-3  # slider values closer than this share a cache entry
+
+class RenderCache:
+    # Transform tab states keyed by their quantized parameters: the sampled
+    # curves and, once drawn, the pixels of the axes region together with the
+    # axes limits they were drawn at (pixels only apply to the same view).
+    # Scrubbing back to a state blits its pixels instead of sampling and
+    # redrawing. Least recently used entries go first past max_bytes; a
+    # canvas resize clears everything (both the pixels and the
+    # pixel-tolerance samples depend on its size).
+    def __init__(self, max_bytes=RENDER_CACHE_MB << 20, pixels=True):
+        self.max_bytes = max_bytes
+        self.pixels = pixels
+        self.entries = OrderedDict()  # key -> (data, pixels, limits, nbytes)
+        self.nbytes = 0
+        self.size = None
+        self.hits = 0       # pixels blitted
+        self.data_hits = 0  # samples reused, figure redrawn
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key_for(spec):
+        q = lambda v: round(v / RENDER_QUANTUM)
+        conic = tuple(q(c) for c in spec["conic"]) if spec["ctype"] == GENERAL_CONIC else None
+        return (spec["ctype"], q(spec["h"]), q(spec["k"]), q(spec["a"]), q(spec["b"]), spec["branch"],
+                spec["show_family"], spec["rmin"], spec["rmax"], spec["view"], spec["overlays"], conic)
+
+    def check_size(self, size):
+        # size = (width, height, dpi) of the canvas
+        if size != self.size:
+            if self.entries:
+                self.invalidations += 1
+            self.clear()
+            self.size = size
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def lookup(self, key):
+        # -> (data, pixels, limits); pixels and limits are None for data-only entries
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None, None
+        self.entries.move_to_end(key)
+        if entry[1] is not None:
+            self.hits += 1
+        else:
+            self.data_hits += 1
+        return entry[0], entry[1], entry[2]
+
+    def store(self, key, data, pixels=None, limits=None):
+        # limits: the axes' (xlim, ylim) when the pixels were captured.
+        # The entry keeps its own copy of the arrays (renders reuse buffers).
+        if not self.pixels:
+            pixels = limits = None
+        data = _copy_arrays(data)
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[3]
+        nbytes = sum(arr.nbytes for arr in _flat_arrays(data))
+        if pixels is not None:
+            nbytes += memoryview(pixels).nbytes
+        self.entries[key] = (data, pixels, limits, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes and self.entries:
+            _key, (_data, _pixels, _limits, evicted) = self.entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def summary(self):
+        return (f"cache {self.hits} blit / {self.data_hits} data hits, {self.misses} misses, "
+                f"{len(self.entries)} states, {self.nbytes / 2**20:.1f} MB")
+
+def _flat_arrays(data):
+    for item in data:
+        if isinstance(item, tuple):
+            yield from _flat_arrays(item)
+        elif item is not None:
+            yield item
+
+def _copy_arrays(data):
+    return tuple(_copy_arrays(item) if isinstance(item, tuple) else None if item is None else np.array(item)
+                 for item in data)
+
+
+# -----------------------------
+# Background compute
+# -----------------------------
+# Sampling, evaluation and table building run on a worker thread (NumPy
+# releases the GIL in the heavy loops), so Tk keeps handling input and the
+# Stop button. Renders submit a job and only touch artists when its result
+# comes back.
+
+class ComputeWorker:
+    # One background thread. Each channel ("transform", "motion") keeps only
+    # its newest job: every submit bumps the channel's generation, a queued
+    # job that has not started yet is replaced, and results from an older
+    # generation are dropped instead of drawn. Results reach the Tk thread
+    # through a queue polled with widget.after().
+    def __init__(self, widget, poll_ms=8, name="sdl2-compute"):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.generation = {}  # channel -> newest generation submitted
+        self.delivered = {}   # channel -> newest generation handed back
+        self.pending = {}     # channel -> job not started yet
+        self.results = queue.Queue()
+        self.dropped = 0      # stale jobs skipped or results discarded
+        self._cond = threading.Condition()
+        self._poll_id = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, channel, func, args, on_done, on_error):
+        # on_done(result, seconds) / on_error(exception) run on the Tk thread
+        with self._cond:
+            gen = self.generation.get(channel, 0) + 1
+            self.generation[channel] = gen
+            if channel in self.pending:
+                self.dropped += 1
+            self.pending[channel] = (gen, func, args, on_done, on_error)
+            self._cond.notify()
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self.poll)
+        return gen
+
+    def cancel(self, channel):
+        # The channel was answered without the worker (e.g. from a cache):
+        # anything queued or running for it is now stale
+        with self._cond:
+            gen = self.generation.get(channel, 0) + 1
+            self.generation[channel] = self.delivered[channel] = gen
+            if self.pending.pop(channel, None) is not None:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.pending:
+                    self._cond.wait()
+                channel = next(iter(self.pending))
+                gen, func, args, on_done, on_error = self.pending.pop(channel)
+            t0 = time.perf_counter()
+            try:
+                result, error = func(*args), None
+            except Exception as e:
+                result, error = None, e
+            self.results.put((channel, gen, time.perf_counter() - t0, result, error, on_done, on_error))
+
+    def poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                channel, gen, seconds, result, error, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if gen != self.generation[channel]:
+                self.dropped += 1
+                continue
+            self.delivered[channel] = gen
+            if error is not None:
+                on_error(error)
+            else:
+                on_done(result, seconds)
+        if any(self.delivered.get(channel) != gen for channel, gen in self.generation.items()):
+            self._poll_id = self.widget.after(self.poll_ms, self.poll)
+
+class InlineCompute:
+    # Same interface, run on the spot (headless views, benchmarks)
+    def submit(self, channel, func, args, on_done, on_error):
+        t0 = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception as e:
+            on_error(e)
+            return
+        on_done(result, time.perf_counter() - t0)
+
+    def cancel(self, channel):
+        pass
+
+def a_family_xy(ctype, b, h, k, branch, xmin, xmax, n_curves=12):
+    # Teaching overlay: the transformed curve for a spread of a values,
+    # evaluated in one batched call (drawn as a single LineCollection)
+    a_vals = np.linspace(0.5, 6, n_curves)
+    if ctype == "Parabola":
+        return parabola_xy_batch(np.linspace(xmin, xmax, 400), a=a_vals, h=h, k=k)
+    if ctype == "Ellipse":
+        return ellipse_xy_batch(np.linspace(0, 2*np.pi, 400), a=a_vals, b=b, h=h, k=k)
+    return hyperbola_xy_batch(np.linspace(-3, 3, 400), a=a_vals, b=b, h=h, k=k, branch=branch)
+
+def transform_data(spec, buffers=_new_buffers):
+    # Original (centered) + transformed (shifted) curves for the Transform tab.
+    # Samples are refined by curvature to PIXEL_TOL and clipped to the view
+    # (the axes limits, zoomed or not); curves with the same shape share one
+    # cached unit table.
+    ctype, a, b, h, k, branch = (spec[name] for name in ("ctype", "a", "b", "h", "k", "branch"))
+    xlim, ylim = spec["view"]
+    ppu = spec["ppu"]
+    if ctype == "Parabola":
+        wx, wy = ppu, abs(a) * ppu
+        # Original y = a x^2
+        table = clipped_table("parabola", parabola_t_range(a, 0.0, 0.0, xlim, ylim), wx, wy)
+        x0, y0 = curve_xy_into("parabola", table, *buffers("original", table[0].size), a=a)
+        # Transformed y = a(x-h)^2 + k
+        table = clipped_table("parabola", parabola_t_range(a, h, k, xlim, ylim), wx, wy)
+        x1, y1 = curve_xy_into("parabola", table, *buffers("transformed", table[0].size), a=a, h=h, k=k)
+
+    elif ctype == "Ellipse":
+        # Same shape for both, so one table (and one set of trig evaluations)
+        table = SAMPLE_TABLES.get_adaptive("ellipse", 0, 2*np.pi, abs(a) * ppu, abs(b) * ppu)
+        n = table[0].size
+        # Original centered ellipse
+        x0, y0 = curve_xy_into("ellipse", table, *buffers("original", n), a=a, b=b)
+        # Transformed
+        x1, y1 = curve_xy_into("ellipse", table, *buffers("transformed", n), a=a, b=b, h=h, k=k)
+
+    elif ctype == GENERAL_CONIC:
+        # Original as typed, transformed moved by (h, k); a, b and the branch
+        # don't apply (both hyperbola branches are drawn)
+        x0, y0, _name = conic_xy(spec["conic"], xlim, ylim, ppu)
+        x1, y1, _name = conic_xy(shift_conic(spec["conic"], h, k), xlim, ylim, ppu)
+
+    else:  # Hyperbola
+        wx, wy = abs(a) * ppu, abs(b) * ppu
+        # Original centered branch (t range solved from cosh/sinh against the plot range)
+        table = clipped_table("hyperbola", hyperbola_t_range(a, b, 0.0, 0.0, branch, xlim, ylim), wx, wy)
+        x0, y0 = curve_xy_into("hyperbola", table, *buffers("original", table[0].size), a=a, b=b, branch=branch)
+        # Transformed
+        table = clipped_table("hyperbola", hyperbola_t_range(a, b, h, k, branch, xlim, ylim), wx, wy)
+        x1, y1 = curve_xy_into("hyperbola", table, *buffers("transformed", table[0].size), a=a, b=b, h=h, k=k, branch=branch)
+
+    family = None
+    if spec["show_family"] and ctype != GENERAL_CONIC:
+        family = a_family_xy(ctype, b, h, k, branch, *xlim)
+    return x0, y0, x1, y1, family
+
+def motion_data(spec, trajectory=None, arc=None, buffers=_new_buffers):
+    # Tables and frame data for a static Motion frame; the tables passed in
+    # are reused when their key still matches
+    mtype, params = spec["mtype"], spec["params"]
+    trajectory = trajectory_for(mtype, params, spec["dt"], spec["force"], trajectory)
+    if spec["force"] is None:
+        arc = arc_length_for(mtype, params, arc)
+    physics = trajectory if spec["force"] is not None else None
+    frame = motion_frame_data(mtype, params, spec["t"], spec["ppu"], buffers, spec["path_speed"], physics,
+                              spec["view"])
+    return trajectory, arc, frame
+
+
+# -----------------------------
+# Views
+# -----------------------------
+# Rendering and animation for both tabs. Needs the Tk variables, figures
+# and canvases built by the app (or stand-ins from HeadlessViews), plus
+# after()/after_cancel() for scheduling.
+
+def _recorded(method):
+    # A user-level action: logged by an active SessionRecorder, unless it
+    # runs inside another logged action (stop_animation's final redraw)
+    name = method.__name__
+
+    def action(self, *args):
+        recorder = self.recorder
+        if recorder is None or recorder.depth:
+            return method(self, *args)
+        recorder.call(name)
+        recorder.depth += 1
+        try:
+            return method(self, *args)
+        finally:
+            recorder.depth -= 1
+
+    action.__name__ = name
+    return action
+
+class CurveViews:
+
+    def _init_view_state(self):
+        self.profiler = StageTimer(enabled=os.environ.get("SDL2_PROFILE", "") not in ("", "0"),
+                                   log_path=os.environ.get("SDL2_PROFILE_LOG") or None)
+        self._sample_buffers = {}
+        self.compute = InlineCompute()  # the app swaps in a ComputeWorker
+        self.export_compute = InlineCompute()  # and a second one, so exports don't hold up renders
+        self.render_cache = RenderCache()
+        self._transform_artists = None  # (line0, line1, family, spec) of the last full draw
+        self._view_homes = {}  # axes -> (xlim, ylim) it was last drawn from, before zoom or pan
+
+        # Animation state
+        self.anim_running = False
+        self.t_anim = 0.0
+        self.after_id = None
+        self._motion_blit = None  # persistent artists + cached background while animating
+        self._motion_pending = False  # tables for the animation requested from the worker
+        self._t_range = (MOTION_DEFAULTS["t_min"], MOTION_DEFAULTS["t_max"])  # last valid custom t interval
+        self._trajectory = None   # TrajectoryTable for the current motion parameters
+        self._arc = None          # ArcLengthTable for the current motion parameters
+        self.trail = MotionTrail()
+        self._trail_mtype = None
+        self.swarm = None
+        self.frame_clock = FrameClock()
+        self.recorder = None  # SessionRecorder while an input session is being logged
+        self.hover1 = self.hover2 = None  # HoverReadouts, made with the figures
+        self.overlay1 = self.overlay2 = None  # CurveOverlays, likewise
+
+    def _report_error(self, title, message):
+        raise RuntimeError(f"{title}: {message}")
+
+    def _view_for(self, ax, home):
+        # The view to sample for: the live axes limits, so toolbar zoom and pan
+        # survive re-renders, unless the plot's own range changed since the
+        # last draw (or there was none)
+        if self._view_homes.get(ax) != home:
+            return home
+        return axes_limits(ax)
+
+    def _watch_limits(self, ax, home, render):
+        # After a draw (ax.clear() dropped earlier callbacks): a toolbar zoom
+        # or pan re-renders, so the curves are re-clipped and resampled for
+        # the new view
+        self._view_homes[ax] = home
+        changed = lambda _ax: self._request_render(render)
+        ax.callbacks.connect("xlim_changed", changed)
+        ax.callbacks.connect("ylim_changed", changed)
+
+    def _request_render(self, render):
+        # Hook: the app queues this on its render scheduler
+        self.after(0, render)
+
+    def _buffers(self, name, n):
+        # Preallocated output arrays reused across renders (Line2D copies its data).
+        # Capacity grows in powers of two since adaptive sample counts vary.
+        bufs = self._sample_buffers.get(name)
+        if bufs is None or bufs[0].size < n:
+            size = 1 << max(n - 1, 1).bit_length()
+            bufs = self._sample_buffers[name] = (np.empty(size), np.empty(size))
+        return bufs[0][:n], bufs[1][:n]
+
+    def _channel_buffers(self, channel):
+        # _buffers for one worker channel. The worker refills them job after
+        # job: a result is drawn (the artists copy it) before the channel's
+        # next submit, or that submit makes it stale and it is dropped.
+        # Anything kept past the draw (render cache, overlays) copies.
+        return lambda name, n: self._buffers(f"{channel}/{name}", n)
+
+    @_recorded
+    def render_transform(self):
+        # Reads the controls here, computes the curves on the worker, then
+        # _draw_transform updates the artists
+        t0 = time.perf_counter()
+        try:
+            ctype = self.curve_type.get()
+            rmin, rmax = float(self.rmin1.get()), float(self.rmax1.get())
+            if rmin >= rmax:
+                raise ValueError("Range min must be less than range max.")
+            spec = {
+                "ctype": ctype,
+                "h": float(self.h_var.get()), "k": float(self.k_var.get()),
+                "a": float(self.a_var.get()), "b": float(self.b_var.get()),
+                "branch": int(self.branch_var.get()),
+                "conic": tuple(float(getattr(self, f"conic_{c}_var").get()) for c in CONIC_COEFS),
+                "show_family": bool(self.family_var.get()),
+                "overlays": self._read_overlays(1),
+                "rmin": rmin, "rmax": rmax,
+            }
+            spec["view"] = self._view_for(self.ax1, ((rmin, rmax), (rmin, rmax)))
+            spec["ppu"] = view_ppu(self.ax1, spec["view"])
+        except Exception as e:
+            self._transform_failed(e)
+            return
+        params_s = time.perf_counter() - t0
+
+        # States already visited come from the render cache
+        key = RenderCache.key_for(spec)
+        cache = self.render_cache
+        cache.check_size((*self.canvas1.get_width_height(), self.fig1.dpi))
+        data, pixels, limits = cache.lookup(key)
+        if data is not None:
+            self.compute.cancel("transform")
+            if pixels is None or not self._blit_transform(spec, data, pixels, limits):
+                self._draw_transform(spec, data, params_s, 0.0, key)
+            return
+        self.compute.submit("transform", transform_data, (spec, self._channel_buffers("transform")),
+                            lambda data, eval_s: self._draw_transform(spec, data, params_s, eval_s, key),
+                            self._transform_failed)
+
+    def _blit_transform(self, spec, data, pixels, limits):
+        # Cached pixels onto the canvas. The line artists get the cached data
+        # too, so toolbar and resize redraws still show this state. Returns
+        # False when the artists on the axes cannot take it (family shown or
+        # hidden, other range) or the axes limits moved since the pixels were
+        # captured (toolbar zoom or pan): the caller redraws instead.
+        drawn = self._transform_artists
+        if drawn is None or drawn[3] != (spec["show_family"], spec["rmin"], spec["rmax"], spec["overlays"]):
+            return False
+        if limits != axes_limits(self.ax1):
+            return False
+        prof = self.profiler
+        prof.begin("transform")
+        try:
+            line0, line1, lines, _shape = drawn
+            x0, y0, x1, y1, family = data
+            with prof.stage("artists"):
+                line0.set_data(x0, y0)
+                line1.set_data(x1, y1)
+                if lines is not None:
+                    lines.set_segments(np.stack(family, axis=-1))
+                self._overlay_transform(spec, data)
+            with prof.stage("blit"):
+                self.canvas1.restore_region(pixels)
+                self.canvas1.blit(self.ax1.bbox)
+            self.hover1.background = pixels
+            self._hover_transform(spec, data)
+            self._transform_status(spec, "Rendered (cached).")
+        finally:
+            prof.end()
+            self._show_profile("transform", self.profile1)
+            self._rendered(self.render_transform)
+        return True
+
+    def _draw_transform(self, spec, data, params_s, eval_s, key=None):
+        prof = self.profiler
+        prof.begin("transform")
+        prof.add("params", params_s)
+        prof.add("eval", eval_s)
+        self._transform_artists = None
+        try:
+            x0, y0, x1, y1, family = data
+            rmin, rmax = spec["rmin"], spec["rmax"]
+            (xmin, xmax), (ymin, ymax) = spec["view"]
+
+            # Use light styling differences (no custom colors needed)
+            with prof.stage("artists"):
+                self.ax1.clear()
+                self.ax1.grid(True)
+                self.ax1.set_aspect("equal", adjustable="box")
+                self.ax1.set_title("Curve Transformations (Translation + Stretching)")
+
+                line0, = self.ax1.plot(x0, y0, linestyle="--", linewidth=1, label="original (centered)")
+                line1, = self.ax1.plot(x1, y1, linewidth=2, label="transformed")
+                lines = None
+                if family is not None:
+                    lines = curve_family_collection(*family, colors="0.65", linewidths=0.7, label="a-family")
+                    self.ax1.add_collection(lines, autolim=False)
+
+                self.ax1.set_xlim(xmin, xmax)
+                self.ax1.set_ylim(ymin, ymax)
+                self.ax1.set_xlabel("x")
+                self.ax1.set_ylabel("y")
+                self._overlay_transform(spec, data)
+
+            with prof.stage("legend"):
+                self.ax1.legend(loc="upper right")
+
+            with prof.stage("draw"):
+                self.canvas1.draw()
+            self._watch_limits(self.ax1, ((rmin, rmax), (rmin, rmax)), self.render_transform)
+            self._transform_artists = (line0, line1, lines, (spec["show_family"], rmin, rmax, spec["overlays"]))
+            if key is not None:
+                self.render_cache.store(key, data, self.canvas1.copy_from_bbox(self.ax1.bbox), axes_limits(self.ax1))
+            self._hover_transform(spec, data)
+            self._transform_status(spec, "Rendered.")
+        except Exception as e:
+            self.status1.set("Error.")
+            self._report_error("Transform Render Error", str(e))
+        finally:
+            prof.end()
+            self._show_profile("transform", self.profile1)
+            self._rendered(self.render_transform)
+
+    def _transform_status(self, spec, text):
+        # A general conic also reports what kind of curve it turned out to be
+        if spec["ctype"] == GENERAL_CONIC:
+            name, form = classify_conic(spec["conic"])
+            text += f" {name.capitalize()}"
+            text += f", axis at {conic_axis_angle(form):.1f}°." if form is not None and form[0] not in ("point", "line") else "."
+        self.status1.set(text)
+
+    def _make_hover(self, ax, canvas):
+        # The Motion tab's readout is drawn by the animation while it runs
+        deferred = (lambda: self.anim_running) if ax is self.ax2 else None
+        hover = HoverReadout(ax, canvas, deferred)
+        hover.connect()
+        return hover
+
+    def _hover_transform(self, spec, data):
+        # Hover snaps to either drawn curve; t and curvature come from the
+        # curve's own parametrization, so the readout is exact
+        x0, y0, x1, y1, _family = data
+        n0 = len(x0)
+        x = np.concatenate((x0, [np.nan], x1))
+        y = np.concatenate((y0, [np.nan], y1))
+        ctype, a, b, branch = spec["ctype"], spec["a"], spec["b"], spec["branch"]
+
+        def describe(i, f):
+            h, k, name = (0.0, 0.0, "original") if i < n0 else (spec["h"], spec["k"], "transformed")
+            j = min(i + 1, len(x) - 1)
+            if ctype == GENERAL_CONIC:
+                # No single parameter: the curvature comes from the equation
+                px, py = float(x[i] + f * (x[j] - x[i])), float(y[i] + f * (y[j] - y[i]))
+                kappa = float(conic_frame(shift_conic(spec["conic"], h, k), px, py)[6])
+                return px, py, f"{name}\nx={px:.3f}  y={py:.3f}\ncurvature={kappa:.3f}"
+            t = float(curve_parameter(ctype, x[i] + f * (x[j] - x[i]), y[i] + f * (y[j] - y[i]), a, b, h, k))
+            px, py, vx, vy, ax, ay = (float(v) for v in curve_state(ctype, t, a, b, h, k, branch))
+            return px, py, f"{name}\nx={px:.3f}  y={py:.3f}\nt={t:.3f}  curvature={curvature(vx, vy, ax, ay):.3f}"
+
+        self.hover1.set_samples(x, y, describe)
+
+    def _overlay_transform(self, spec, data):
+        # Overlays follow the transformed curve, with derivatives from the
+        # curve's parametrization (the samples' t, unwrapped around the ellipse)
+        shown, t, evaluate = spec["overlays"], None, None
+        if shown:
+            _x0, _y0, x1, y1, _family = data
+            x1, y1 = np.array(x1), np.array(y1)  # kept past this render; data may be reused buffers
+            ctype, a, b, h, k = (spec[name] for name in ("ctype", "a", "b", "h", "k"))
+            if ctype == GENERAL_CONIC:
+                # Along the samples by index, with the frame from the equation
+                # (none when the curve misses the view)
+                coefs = shift_conic(spec["conic"], h, k)
+                t = np.arange(len(x1), dtype=float) if len(x1) else None
+                evaluate = lambda u: conic_frame(coefs, np.interp(u, t, x1), np.interp(u, t, y1))
+                self.overlay1.show(t, evaluate, shown)
+                return
+            t = curve_parameter(ctype, np.asarray(x1), np.asarray(y1), a, b, h, k)
+            if ctype == "Ellipse":
+                t = np.unwrap(t)
+            evaluate = lambda t: frenet_frame(*curve_state(ctype, t, a, b, h, k, spec["branch"]))
+        self.overlay1.show(t, evaluate, shown)
+
+    def _overlay_motion(self, table, mtype, params):
+        # Along the trajectory table: motion_state's derivatives, or the
+        # integrated rows (interpolated) with a force model
+        shown = self._read_overlays(2)
+        t = table.t0 + table.step * np.arange(table.n)
+        if isinstance(table, PhysicsTable):
+            evaluate = lambda u: frenet_frame(*(np.interp(u, t, table.rows[:, col]) for col in range(6)))
+        else:
+            evaluate = lambda u: frenet_frame(*motion_state(mtype, params, u))
+        self.overlay2.show(t, evaluate, shown)
+
+    def _read_overlays(self, tab):
+        return tuple(name for name, _label in OVERLAYS if getattr(self, f"{name}_var{tab}").get())
+
+    def _transform_failed(self, error):
+        self.status1.set("Error.")
+        try:
+            self._report_error("Transform Render Error", str(error))
+        finally:
+            self._rendered(self.render_transform)
+
+    def _rendered(self, render):
+        # Hook: a render's pixels are on the canvas (the app tells its scheduler)
+        pass
+
+    def _show_profile(self, scope, var):
+        if self.profiler.enabled:
+            summary = self.profiler.summary(scope)
+            if scope == "transform":
+                summary += "\n" + self.render_cache.summary()
+            var.set(summary)
+
+    def _read_motion_params(self):
+        params = {name: float(getattr(self, var).get()) for var, name in MOTION_VARS.items()}
+        params.update({name: getattr(self, var).get().strip() for var, name in MOTION_TEXT_VARS.items()})
+        return params
+
+    @_recorded
+    def render_motion_static(self):
+        # Full redraw; tables and frame data are computed on the worker, then
+        # _draw_motion_static updates the artists. While animating, the
+        # result brings fresh tables and the blitted artists are rebuilt
+        # from it.
+        if not self.anim_running:
+            self._motion_blit = None
+        self._submit_motion()
+
+    def _submit_motion(self):
+        t0 = time.perf_counter()
+        try:
+            mtype = self.motion_type.get()
+            spec = {
+                "mtype": mtype,
+                "params": self._read_motion_params(),
+                "t": self.t_anim,
+                "view": self._view_for(self.ax2, MOTION_VIEW),
+                "dt": self._read_dt(),
+                "force": self._read_force(),
+                "path_speed": self._read_path_speed(),
+            }
+        except Exception as e:
+            self._motion_failed(e)
+            return
+        spec["ppu"] = view_ppu(self.ax2, spec["view"])
+        params_s = time.perf_counter() - t0
+        self._motion_pending = True
+        self.compute.submit("motion", motion_data, (spec, self._trajectory, self._arc, self._channel_buffers("motion")),
+                            lambda data, eval_s: self._draw_motion_static(spec, data, params_s, eval_s),
+                            self._motion_failed)
+
+    def _draw_motion_static(self, spec, data, params_s, eval_s):
+        self._motion_pending = False
+        self._trajectory, arc, frame = data
+        self._hover_motion(self._trajectory)
+        if arc is not None:
+            self._arc = arc
+        if self.anim_running:
+            try:
+                self._init_motion_blit(spec, frame)
+            except Exception as e:
+                self.anim_running = False
+                self.status2.set("Error.")
+                self._report_error("Motion Render Error", str(e))
+            finally:
+                self._rendered(self.render_motion_static)
+            return
+        mtype, params = spec["mtype"], spec["params"]
+        prof = self.profiler
+        prof.begin("motion")
+        prof.add("params", params_s)
+        prof.add("eval", eval_s)
+        try:
+            swarm = self._read_swarm()
+            trail = self._read_trail(mtype) if swarm is None else None
+            physics = self._trajectory if spec["force"] is not None else None
+            _point, _qv, _qa, speed = draw_motion_frame(self.ax2, mtype, params, spec["t"], spec["ppu"],
+                                                        timer=prof, path_speed=spec["path_speed"], trail=trail,
+                                                        swarm=swarm, physics=physics, data=frame, view=spec["view"])
+            self._watch_limits(self.ax2, MOTION_VIEW, self.render_motion_static)
+            self._overlay_motion(self._trajectory, mtype, params)
+
+            self.readout.set(self._motion_readout(mtype, params, speed))
+            with prof.stage("draw"):
+                self.canvas2.draw()
+            self.status2.set("Rendered.")
+        except Exception as e:
+            self.status2.set("Error.")
+            self._report_error("Motion Render Error", str(e))
+        finally:
+            prof.end()
+            self._show_profile("motion", self.profile2)
+            self._rendered(self.render_motion_static)
+
+    def _hover_motion(self, table):
+        # Hover snaps to the trajectory table (the integrated path with a force model)
+        def describe(i, f):
+            t = table.t0 + (i + f) * table.step
+            px, py, vx, vy, ax, ay, speed = table.lookup(t)
+            return px, py, (f"t={t:.3f}\nx={px:.3f}  y={py:.3f}\n"
+                            f"v=({vx:.2f}, {vy:.2f})  |v|={speed:.2f}\n"
+                            f"a=({ax:.2f}, {ay:.2f})\ncurvature={curvature(vx, vy, ax, ay):.3f}")
+
+        self.hover2.set_samples(table.rows[:, 0], table.rows[:, 1], describe)
+
+    def _motion_failed(self, error):
+        # A running animation stops too, rather than asking for the same tables every tick
+        self._motion_pending = False
+        self.anim_running = False
+        self.status2.set("Error.")
+        try:
+            self._report_error("Motion Render Error", str(error))
+        finally:
+            self._rendered(self.render_motion_static)
+
+    # ---------- Export ----------
+    def export_transform(self, path, rows=10001):
+        # The transformed curve, over the plot range for a parabola
+        def read():
+            ctype = self.curve_type.get()
+            if ctype not in CURVE_T_RANGES:
+                raise ValueError("Export works for the parabola, ellipse and hyperbola.")
+            t_start, t_end = CURVE_T_RANGES[ctype]
+            if ctype == "Parabola":
+                t_start, t_end = float(self.rmin1.get()), float(self.rmax1.get())
+            return (ctype, float(self.a_var.get()), float(self.b_var.get()), float(self.h_var.get()),
+                    float(self.k_var.get()), int(self.branch_var.get()), t_start, t_end, (t_end - t_start) / (rows - 1))
+        self._export(path, transform_export, read, self.status1, "Transform Export Error")
+
+    def export_motion(self, path):
+        # One cycle of the current path at the animation's dt (integrated with a force model)
+        def read():
+            return (self.motion_type.get(), self._read_motion_params(), None, None, self._read_dt(), self._read_force())
+        self._export(path, motion_export, read, self.status2, "Motion Export Error")
+
+    def _export(self, path, source, read, status, title):
+        # Controls are read here; rows are generated and written on the worker
+        def done(rows, seconds):
+            status.set(f"Exported {rows} rows to {os.path.basename(path)} ({seconds:.1f} s).")
+
+        def failed(error):
+            status.set("Error.")
+            self._report_error(title, str(error))
+
+        try:
+            args = read()
+        except Exception as e:
+            failed(e)
+            return
+        status.set("Exporting...")
+        self.export_compute.submit("export", lambda: write_export(path, *source(*args)), (), done, failed)
+
+    # ---------- Blitted animation ----------
+    def _init_motion_blit(self, spec, frame):
+        # Build the path, point and both quivers once, from the worker's
+        # frame data and tables; only the point and arrows are animated,
+        # everything else lives in the cached background.
+        mtype, params = spec["mtype"], spec["params"]
+        with self.profiler.stage("params"):
+            swarm = self._read_swarm()
+            trail = self._read_trail(mtype) if swarm is None else None
+        physics = self._trajectory if spec["force"] is not None else None
+        point, qv, qa, _speed = draw_motion_frame(self.ax2, mtype, params, spec["t"], spec["ppu"], animated=True,
+                                                  timer=self.profiler, path_speed=spec["path_speed"], trail=trail,
+                                                  swarm=swarm, physics=physics, data=frame, view=spec["view"])
+        self._watch_limits(self.ax2, MOTION_VIEW, self.render_motion_static)
+        self._overlay_motion(self._trajectory, mtype, params)
+
+        self._motion_blit = {
+            "mtype": mtype,
+            "params": params,
+            "dt": spec["dt"],
+            "force": spec["force"],
+            "point": point,
+            "qv": qv,
+            "qa": qa,
+            "trail": trail,
+            "trail_by_speed": bool(self.trail_speed_var.get()),
+            "swarm": swarm,
+            "background": None,
+        }
+        # draw_event handler grabs the background
+        with self.profiler.stage("draw"):
+            self.canvas2.draw()
+
+    def _on_motion_draw(self, _event):
+        # Any full draw (first frame, resize, toolbar pan/zoom) invalidates the
+        # cached background, so grab it again and put the animated artists back.
+        blit = self._motion_blit
+        if blit is None:
+            return
+        blit["background"] = self.canvas2.copy_from_bbox(self.ax2.bbox)
+        self._draw_motion_artists()
+
+    def _draw_motion_artists(self):
+        blit = self._motion_blit
+        if blit["trail"] is not None:
+            self.ax2.draw_artist(blit["trail"].collection)
+        for artist in (blit["point"], blit["qv"], blit["qa"]):
+            if artist is not None:
+                self.ax2.draw_artist(artist)
+        self.hover2.draw_artists()
+
+    def _current_motion_blit(self):
+        # The animated artists, or None until the worker's first result. A
+        # new path type, dt or force model asks the worker for fresh tables;
+        # the current ones keep animating until they arrive.
+        blit = self._motion_blit
+        if blit is None or (blit["mtype"], blit["dt"], blit["force"]) != (
+                self.motion_type.get(), self._read_dt(), self._read_force()):
+            if not self._motion_pending:
+                self._submit_motion()
+            blit = self._motion_blit  # already there from an inline worker
+        return blit
+
+    def _render_motion_frame(self, blit, path_speed=None, connect=True):
+        # Per-frame cost: point offsets + quiver U/V (+ one trail segment and
+        # the trail colors), restore background, blit
+        prof = self.profiler
+        params = blit["params"]
+        if blit["swarm"] is not None:
+            self._render_swarm_frame(blit)
+            return
+        with prof.stage("eval"):
+            px, py, vx, vy, ax, ay, speed = self._trajectory.lookup(self.t_anim)
+            if path_speed is not None:
+                vx, vy, ax, ay = constant_speed_state(vx, vy, ax, ay, path_speed)
+                speed = path_speed
+        vs, ac = params["v_scale"], params["a_scale"]
+
+        with prof.stage("artists"):
+            xy = [[px, py]]
+            blit["point"].set_offsets(xy)
+            blit["qv"].set_offsets(xy)
+            blit["qv"].set_UVC(vs*vx, vs*vy)
+            blit["qa"].set_offsets(xy)
+            blit["qa"].set_UVC(ac*ax, ac*ay)
+            trail = blit["trail"]
+            if trail is not None:
+                trail.push(px, py, speed, connect)
+                trail.update_colors(blit["trail_by_speed"])
+                trail.sync()
+
+        with prof.stage("draw"):
+            if blit["background"] is None:
+                self.canvas2.draw()
+            else:
+                self.canvas2.restore_region(blit["background"])
+                self._draw_motion_artists()
+                self.canvas2.blit(self.ax2.bbox)
 
-import numpy as np
+        self.readout.set(self._motion_readout(blit["mtype"], params, speed))
+
+    def _render_swarm_frame(self, blit):
+        # Particle mode: one vectorized evaluation, one scatter + one quiver update
+        params = blit["params"]
+        with self.profiler.stage("eval"):
+            speed = blit["swarm"].sync(blit["mtype"], params, self.t_anim, params["v_scale"])
+        with self.profiler.stage("draw"):
+            if blit["background"] is None:
+                self.canvas2.draw()
+            else:
+                self.canvas2.restore_region(blit["background"])
+                self._draw_motion_artists()
+                self.canvas2.blit(self.ax2.bbox)
+        self.readout.set(self._motion_readout(blit["mtype"], params, speed))
+
+    def _motion_readout(self, mtype, params, speed):
+        # From the tables of the last worker result
+        physics = self._trajectory
+        if isinstance(physics, PhysicsTable):
+            error = "n/a" if physics.error is None else f"{physics.error:.1e}"
+            return (f"t={self.t_anim:.2f}   speed={speed:.3f}\n"
+                    f"energy drift={physics.drift:.1e}   |x - exact|={error}")
+        arc = self._arc
+        return (f"t={self.t_anim:.2f}   speed={speed:.3f}\n"
+                f"s={arc.s_at(self.t_anim):.3f} of {arc.total:.3f} "
+                f"({'perimeter' if arc.periodic else 'path length'})")
+
+    def _read_dt(self):
+        try:
+            dt = float(self.dt_var.get())
+            if dt <= 0:
+                dt = 0.03
+        except Exception:
+            dt = 0.03
+        return dt
+
+    @_recorded
+    def start_animation(self):
+        if self.anim_running:
+            return
+        self.anim_running = True
+        self.status2.set("Animating...")
+        self.frame_clock.set_fps(self._read_fps())
+        self.frame_clock.reset()
+        self._tick()
+
+    @_recorded
+    def stop_animation(self):
+        was_running = self.anim_running
+        self.anim_running = False
+        if self.after_id is not None:
+            try:
+                self.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+        if was_running:
+            # Animated artists are skipped by a normal draw; leave a static frame behind
+            self.render_motion_static()
+        self.status2.set("Stopped.")
+
+    def _tick(self):
+        if not self.anim_running:
+            return
+
+        prof = self.profiler
+        prof.begin("tick")
+        try:
+            # Advance by real elapsed time, so omega is radians per wall-clock second
+            # (wraps at the ellipse period / parabola end)
+            clock = self.frame_clock
+            with prof.stage("params"):
+                clock.set_fps(self._read_fps())
+                mtype = self.motion_type.get()
+                omega = float(self.omega_var.get())
+                t_range = self._read_t_range() if mtype == CUSTOM_PATH else None
+                path_speed = self._read_path_speed()
+            elapsed = clock.tick()
+            blit = self._current_motion_blit()
+            t_prev = self.t_anim
+            if path_speed is None:
+                self.t_anim = advance_motion_time(mtype, self.t_anim, elapsed, omega, t_range)
+            elif blit is not None and blit["force"] is None:
+                # Constant speed: step the distance travelled, then look up t
+                # (t holds until the worker has built the arc-length table)
+                self.t_anim = self._arc.advance(self.t_anim, path_speed * elapsed)
+            # Only periodic tables (the ellipse) are continuous where t wraps;
+            # the others jump back to the start
+            connect = self.t_anim >= t_prev or (self._trajectory is not None and self._trajectory.periodic)
+
+            if blit is not None:
+                self._render_motion_frame(blit, path_speed, connect)
+        except Exception as e:
+            self.anim_running = False
+            self.after_id = None
+            self.status2.set("Error.")
+            self._report_error("Motion Render Error", str(e))
+            return
+        finally:
+            prof.end()
+        if clock.frames % 15 == 0:
+            self._show_profile("tick", self.profile2)
+        self.fps_readout.set(f"fps={clock.real_fps():.1f} / {clock.target_fps:.0f}   skipped={clock.skipped}")
+        self.after_id = self.after(clock.delay_ms(), self._tick)
+
+    def _read_t_range(self):
+        # The custom path's t interval; a blank or half-typed entry keeps the last valid one
+        try:
+            t_min, t_max = float(self.tmin_var.get()), float(self.tmax_var.get())
+            if t_min < t_max:
+                self._t_range = (t_min, t_max)
+        except Exception:
+            pass
+        return self._t_range
+
+    def _read_fps(self):
+        try:
+            fps = float(self.fps_var.get())
+            if fps <= 0:
+                fps = 30.0
+        except Exception:
+            fps = 30.0
+        return fps
+
+    def _read_swarm(self):
+        # The ParticleSwarm to animate, or None for the single point
+        if not self.particles_var.get():
+            return None
+        try:
+            n = int(float(self.n_particles_var.get()))
+            spread = float(self.rate_spread_var.get())
+            if n < 1 or not 0 <= spread <= 1:
+                raise ValueError
+        except Exception:
+            n, spread = 1000, 0.0
+        if self.swarm is None or (self.swarm.n, self.swarm.spread) != (n, spread):
+            self.swarm = ParticleSwarm(n, spread)
+        return self.swarm
+
+    def _read_trail(self, mtype):
+        # The MotionTrail to draw, or None. Changing the length or the path
+        # type starts a fresh trail.
+        if not self.trail_var.get():
+            return None
+        try:
+            length = int(float(self.trail_len_var.get()))
+            if length < 2:
+                length = 500
+        except Exception:
+            length = 500
+        if length != self.trail.length:
+            self.trail = MotionTrail(length)
+        elif mtype != self._trail_mtype:
+            self.trail.clear()
+        self._trail_mtype = mtype
+        return self.trail
+
+    def _read_force(self):
+        # (force model, drag coefficient), or None for kinematic motion
+        model = self.force_var.get()
+        if model == "Off":
+            return None
+        try:
+            drag = float(self.drag_var.get())
+            if drag <= 0:
+                drag = 0.2
+        except Exception:
+            drag = 0.2
+        return model, drag
+
+    def _read_path_speed(self):
+        # Units per second along the path, or None for the path's own timing
+        # (always the path's own timing under a force)
+        if not self.const_speed_var.get() or self._read_force() is not None:
+            return None
+        try:
+            speed = float(self.path_speed_var.get())
+            if speed < 0:
+                speed = 2.0
+        except Exception:
+            speed = 2.0
+        return speed
+
+
+# Motion tab variable -> MOTION_DEFAULTS key
+MOTION_VARS = {
+    "mh_var": "h", "mk_var": "k",
+    "ma_var": "a", "mb_var": "b", "omega_var": "omega",
+    "p_motion_var": "p", "speed_motion_var": "speed",
+    "tmin_var": "t_min", "tmax_var": "t_max",
+    "v_scale": "v_scale", "a_scale": "a_scale",
+}
+MOTION_TEXT_VARS = {"x_expr_var": "x_expr", "y_expr_var": "y_expr"}
+
+# Initial values of every other variable the views read
+VIEW_DEFAULTS = {
+    # Transform tab
+    "curve_type": "Ellipse", "h_var": 0.0, "k_var": 0.0, "a_var": 3.0, "b_var": 2.0,
+    "branch_var": 1, "family_var": False, "rmin1": -6.0, "rmax1": 6.0,
+    "tangent_var1": False, "normal_var1": False, "osculating_var1": False, "curvature_var1": False,
+    **{f"conic_{c}_var": value for c, value in CONIC_DEFAULTS.items()},
+    "status1": "Ready.", "profile1": "",
+    # Motion tab
+    "motion_type": MOTION_PATHS[0], "dt_var": 0.03, "fps_var": 30.0,
+    "const_speed_var": False, "path_speed_var": 2.0,
+    "trail_var": False, "trail_len_var": 500, "trail_speed_var": False,
+    "particles_var": False, "n_particles_var": 1000, "rate_spread_var": 0.0,
+    "force_var": FORCE_MODELS[0], "drag_var": 0.2,
+    "tangent_var2": False, "normal_var2": False, "osculating_var2": False, "curvature_var2": False,
+    "status2": "Ready.", "readout": "t=0.00   speed=0.00", "fps_readout": "", "profile2": "",
+}
+
+class _Var:
+    # Stand-in for a Tk variable
+    def __init__(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
 
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
+    def set(self, value):
+        self._value = value
+
+class HeadlessViews(CurveViews):
+    # Both tabs on Agg canvases with plain variables: no display, no Tk.
+    # after() only queues the callback; run_pending() fires whatever is queued,
+    # so animation ticks run back to back instead of on a timer.
+    def __init__(self, figsize=(7.6, 6.2), dpi=100):
+        self._init_view_state()
+        for name, value in VIEW_DEFAULTS.items():
+            setattr(self, name, _Var(value))
+        for var, name in (*MOTION_VARS.items(), *MOTION_TEXT_VARS.items()):
+            setattr(self, var, _Var(MOTION_DEFAULTS[name]))
+
+        self.fig1, self.ax1, self.canvas1 = self._make_agg_figure(figsize, dpi)
+        self.fig2, self.ax2, self.canvas2 = self._make_agg_figure(figsize, dpi)
+        self.hover1 = self._make_hover(self.ax1, self.canvas1)
+        self.overlay1 = CurveOverlays(self.ax1)
+        self.hover2 = self._make_hover(self.ax2, self.canvas2)
+        self.overlay2 = CurveOverlays(self.ax2)
+        self.canvas2.mpl_connect("draw_event", self._on_motion_draw)
+
+        self._pending = {}
+        self._next_after = 0
+
+    def _make_agg_figure(self, figsize, dpi):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize, dpi=dpi)
+        ax = fig.add_subplot(111)
+        ax.grid(True)
+        ax.set_aspect("equal", adjustable="box")
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        return fig, ax, canvas
+
+    def after(self, _ms, func, *args):
+        self._next_after += 1
+        after_id = f"after#{self._next_after}"
+        self._pending[after_id] = (func, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._pending.pop(after_id, None)
+
+    def run_pending(self):
+        pending, self._pending = self._pending, {}
+        for func, args in pending.values():
+            func(*args)
+        return len(pending)
 
 
 # -----------------------------
-# Math helpers (Unit 2 focused)
+# Session recording and replay
 # -----------------------------
+# The app can log every input (variable writes from sliders, entries,
+# comboboxes, radio and check buttons) and every top-level action (renders,
+# Start/Stop) to a JSON-lines file. replay_session feeds the log through
+# headless views and times each action, so interactive slowness can be
+# reproduced and profiled.
 
-def parabola_xy(t, a=1.0, h=0.0, k=0.0):
-    # y = a(x-h)^2 + k, param x = t
-    x = t
-    y = a * (t - h) ** 2 + k
-    return x, y
+SESSION_FORMAT = "sdl2-session"
+VIEW_OUTPUTS = ("status1", "profile1", "status2", "readout", "fps_readout", "profile2")
+SESSION_VARS = (*MOTION_VARS, *MOTION_TEXT_VARS, *(name for name in VIEW_DEFAULTS if name not in VIEW_OUTPUTS))
+SESSION_ACTIONS = ("render_transform", "render_motion_static", "start_animation", "stop_animation")
 
-def ellipse_xy(theta, a=3.0, b=2.0, h=0.0, k=0.0):
-    # (x-h)^2/a^2 + (y-k)^2/b^2 = 1
-    x = h + a * np.cos(theta)
-    y = k + b * np.sin(theta)
-    return x, y
+class SessionRecorder:
+    # One JSON value per line: a header, then [t, "set", name, value] for
+    # each variable write and [t, "call", action] for each logged action,
+    # t in seconds since the recording started.
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", buffering=1)  # line buffered: a crash keeps the log
+        self.t0 = time.perf_counter()
+        self.depth = 0  # > 0 while a logged action runs
+        self.events = 0
+        self._watched = set()
+        self._traces = []  # (var, trace id)
+        self.file.write(json.dumps({"format": SESSION_FORMAT, "version": 1,
+                                    "started": time.strftime("%Y-%m-%dT%H:%M:%S")}) + "\n")
 
-def hyperbola_xy(t, a=2.0, b=1.5, h=0.0, k=0.0, branch=1):
-    # (x-h)^2/a^2 - (y-k)^2/b^2 = 1
-    # param: x = h + branch*a*cosh(t), y = k + b*sinh(t)
-    x = h + branch * a * np.cosh(t)
-    y = k + b * np.sinh(t)
-    return x, y
+    def watch(self, widget):
+        # Trace the input variables that exist so far (tabs are built lazily),
+        # logging their current values first
+        for name in SESSION_VARS:
+            var = getattr(widget, name, None)
+            if var is None or name in self._watched:
+                continue
+            self._watched.add(name)
+            read = lambda var=var: _var_value(widget, var)
+            self.set(name, read())
+            trace = var.trace_add("write", lambda *_args, name=name, read=read: self.set(name, read()))
+            self._traces.append((var, trace))
 
-def motion_ellipse(t, a=3.0, b=2.0, omega=1.0, h=0.0, k=0.0):
-    # x = h + a cos(omega t), y = k + b sin(omega t)
-    x = h + a * np.cos(omega * t)
-    y = k + b * np.sin(omega * t)
-    return x, y
+    def set(self, name, value):
+        self._write([round(time.perf_counter() - self.t0, 4), "set", name, value])
 
-def motion_ellipse_v(t, a=3.0, b=2.0, omega=1.0):
-    # dx/dt = -a*omega*sin(omega t), dy/dt = b*omega*cos(omega t)
-    vx = -a * omega * np.sin(omega * t)
-    vy =  b * omega * np.cos(omega * t)
-    return vx, vy
+    def call(self, action):
+        self._write([round(time.perf_counter() - self.t0, 4), "call", action])
 
-def motion_ellipse_a(t, a=3.0, b=2.0, omega=1.0):
-    # d2x/dt2 = -a*omega^2*cos(omega t), d2y/dt2 = -b*omega^2*sin(omega t)
-    ax = -a * (omega ** 2) * np.cos(omega * t)
-    ay = -b * (omega ** 2) * np.sin(omega * t)
-    return ax, ay
+    def _write(self, event):
+        self.file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self.events += 1
 
-def motion_parabola_param(t, p=1.0, speed=1.0, h=0.0, k=0.0):
-    # A simple param curve shaped like a parabola:
-    # x = h + speed*t, y = k + p*(speed*t)^2
-    u = speed * t
-    x = h + u
-    y = k + p * (u ** 2)
-    return x, y
+    def close(self):
+        for var, trace in self._traces:
+            try:
+                var.trace_remove("write", trace)
+            except Exception:
+                pass  # widget already destroyed
+        self._traces = []
+        self.file.close()
 
-def motion_parabola_v(t, p=1.0, speed=1.0):
-    # x = speed*t, y = p*(speed*t)^2
-    # vx = speed
-    # vy = 2p*(speed*t)*speed = 2p*speed^2*t
-    vx = speed
-    vy = 2.0 * p * (speed ** 2) * t
-    return vx, vy
+def _var_value(widget, var):
+    # Typed value, or the raw text while an entry holds something unparsable
+    try:
+        return var.get()
+    except Exception:
+        return widget.getvar(str(var))
 
-def motion_parabola_a(t, p=1.0, speed=1.0):
-    # ax = 0
-    # ay = 2p*speed^2
-    ax = 0.0
-    ay = 2.0 * p * (speed ** 2)
-    return ax, ay
+def load_session(path):
+    with open(path) as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != SESSION_FORMAT:
+            raise ValueError(f"{path} is not a recorded session.")
+        events = [json.loads(line) for line in f if line.strip()]
+    return header, events
+
+class ReplayViews(HeadlessViews):
+    # Headless views with timed after() callbacks. Fast replays run on a
+    # virtual clock that only moves to the next due callback or logged
+    # event, so the animation's t values (and the work done) are the same
+    # on every run; realtime replays use the wall clock.
+    def __init__(self, realtime=False, **kwargs):
+        super().__init__(**kwargs)
+        self.realtime = realtime
+        self.now = 0.0
+        self.clock = time.perf_counter if realtime else (lambda: self.now)
+        self.frame_clock = FrameClock(clock=self.clock)
+        self.errors = []
+        self._timers = {}  # after id -> (due, func, args)
+
+    def _report_error(self, title, message):
+        self.errors.append(f"{title}: {message}")
+
+    def after(self, ms, func, *args):
+        self._next_after += 1
+        after_id = f"after#{self._next_after}"
+        self._timers[after_id] = (self.clock() + ms / 1000.0, func, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._timers.pop(after_id, None)
+
+    def run_due(self, until):
+        # Fire callbacks due by `until`, in order: [(name, seconds)]
+        timings = []
+        while self._timers:
+            after_id, (due, func, args) = min(self._timers.items(), key=lambda item: item[1][0])
+            if due > until:
+                break
+            if self.realtime:
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            else:
+                self.now = due
+            del self._timers[after_id]
+            t0 = time.perf_counter()
+            func(*args)
+            timings.append((func.__name__, time.perf_counter() - t0))
+        if self.realtime:
+            wait = until - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        else:
+            self.now = max(self.now, until)
+        return timings
+
+def replay_session(path, realtime=False, figsize=(7.6, 6.2), dpi=100):
+    # Replay a recorded session headlessly. Each logged action is timed; its
+    # latency runs from the first input since the previous action (realtime)
+    # or is just its own duration (fast). Animation ticks are timed too.
+    _header, events = load_session(path)
+    views = ReplayViews(realtime, figsize=figsize, dpi=dpi)
+    views.render_transform()  # the app draws each tab when it is first shown
+    views.render_motion_static()
+    calls, ticks = [], []
+    first_input = None
+    start = time.perf_counter()
+    for event in events:
+        t, kind = event[0], event[1]
+        ticks.extend(views.run_due(start + t if realtime else t))
+        if kind == "set":
+            var = getattr(views, event[2], None)
+            if var is not None:
+                var.set(event[3])
+                if first_input is None:
+                    first_input = t
+        elif kind == "call" and event[2] in SESSION_ACTIONS:
+            t0 = time.perf_counter()
+            getattr(views, event[2])()
+            t1 = time.perf_counter()
+            trigger = t if first_input is None else first_input
+            latency = t1 - (start + trigger) if realtime else t1 - t0
+            calls.append({"t": t, "action": event[2], "seconds": t1 - t0, "latency": latency})
+            first_input = None
+    views.anim_running = False
+    return {
+        "session_seconds": events[-1][0] if events else 0.0,
+        "seconds": time.perf_counter() - start,
+        "realtime": realtime,
+        "events": len(events),
+        "calls": calls,
+        "ticks": [{"name": name, "seconds": seconds} for name, seconds in ticks],
+        "errors": views.errors,
+    }
+
+def replay_summary(result):
+    # Per-action latency percentiles (ms), one line each
+    groups = {}
+    for call in result["calls"]:
+        groups.setdefault(call["action"], []).append(1000.0 * call["latency"])
+    for tick in result["ticks"]:
+        groups.setdefault(tick["name"], []).append(1000.0 * tick["seconds"])
+    lines = []
+    for name, ms in groups.items():
+        p50, p95 = np.percentile(ms, [50, 95])
+        lines.append(f"{name:22s} n={len(ms):5d}   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   max {max(ms):7.1f} ms")
+    return lines
 
 
 # -----------------------------
 # GUI App
 # -----------------------------
 
-class SDL2CurvedMotionApp(tk.Tk):
+class SDL2CurvedMotionApp(CurveViews, tk.Tk):
 
     def _build_help_tab(self):
         # Scrollable text area
@@ -110,6 +3609,7 @@ class SDL2CurvedMotionApp(tk.Tk):
     * Parabola
     * Ellipse
     * Hyperbola
+    * General conic
 
     - Translation (h, k):
     * h shifts left/right:
@@ -132,9 +3632,42 @@ class SDL2CurvedMotionApp(tk.Tk):
     * Right (+) shows the right branch
     * Left (-) shows the left branch
 
+    - General conic (Ax² + Bxy + Cy² + Dx + Ey + F = 0):
+    Set A to F with their sliders. The status line names the curve
+    (circle, ellipse, parabola, hyperbola, or a special case such as a
+    pair of lines) and the angle of its axis; B ≠ 0 tilts it. h and k
+    still shift it, a, b and the branch don't apply, and a hyperbola
+    always shows both branches. Try A=1, B=1, C=1, F=-9 (tilted ellipse),
+    then change C to -1 (hyperbola) and F to 0 (pair of lines).
+
+    - Show a-family:
+    Draws the same curve (same h, k, b) for a = 0.5 up to 6 in light gray,
+    so you can see how a changes the shape all at once.
+
+    - Overlays (drawn on the transformed curve):
+    * Unit tangent (green arrows) and unit normal (red arrows, pointing
+      toward the inside of the bend)
+    * Osculating circles (purple): the circle that best fits the curve at
+      a point; its radius is 1 / curvature
+    * Curvature colors: purple where the curve is nearly straight, yellow
+      where it bends most sharply
+    Arrows and circles are spread along the visible part of the curve, so
+    zooming in with the toolbar shows more of them per unit of length.
+
     - Plot Range:
     Use this to zoom in/out. Hyperbolas can grow fast, so increasing the range helps.
 
+    - Dragging a slider back to a setting you already saw is instant: recent
+    pictures are kept in memory and shown again ("Rendered (cached).").
+
+    - Export data...:
+    Saves the transformed curve as a table of t, x, y, vx, vy, ax, ay and
+    speed (CSV or NumPy .npy), where t is the curve parameter.
+
+    - Hover:
+    Move the mouse over the plot to snap to the nearest point on either
+    curve and read its x, y, parameter t and curvature.
+
     How to interpret:
     - Translation moves the curve without changing its shape.
     - Stretching changes width/height/steepness.
@@ -176,6 +3709,7 @@ class SDL2CurvedMotionApp(tk.Tk):
     - Motion Path:
     * Ellipse/Circle
     * Parabola-like
+    * Custom x(t), y(t)
 
     - Center (h, k):
     Shifts the entire path.
@@ -188,13 +3722,69 @@ class SDL2CurvedMotionApp(tk.Tk):
     * p = how “curved” the parabola is
     * speed = how fast x increases
 
+    - Custom x(t), y(t):
+    Type any path, e.g. x(t) = a*cos(omega*t), y(t) = b*sin(2*omega*t),
+    and press Enter. You can use t, a, b, omega, p, speed, pi, e, + - * / ^
+    and sin, cos, tan, sinh, cosh, tanh, exp, log, sqrt, atan, abs.
+    The point runs from t = "t from" to "to" and then starts over.
+    Velocity and acceleration are worked out from your formulas exactly
+    (by differentiating them), not estimated.
+
     - v_scale and a_scale:
     These only scale arrow size so they’re easier to see.
 
+    - Overlays:
+    The same tangent, normal, osculating circle and curvature overlays as
+    on the Transform tab, along the whole path. Compare them with the
+    moving arrows: velocity always points along the tangent.
+
     - Render Path:
     Updates the plot once.
     - Start / Stop:
     Animates the moving point.
+    - Export data...:
+    Saves one cycle of the motion (every dt) as a table of t, x, y, vx, vy,
+    ax, ay and speed (CSV or NumPy .npy). With a force model the rows come
+    from the integrator.
+    - Hover:
+    Move the mouse over the path to read t, x, y, velocity, acceleration
+    and curvature at the nearest tabulated point (also while animating).
+    - Time step (dt) / Target fps:
+    The animation runs in real time: t advances by the actual time between
+    frames, so omega is radians per second even on a slow computer. If
+    drawing falls behind, frames are skipped (see the fps readout) instead
+    of the motion slowing down. dt sets how finely the path is tabulated.
+    - Constant speed:
+    Moves the point along the same path at a fixed speed (units per second,
+    the box next to it) instead of the path's own timing. The velocity arrow
+    keeps the same length, and the acceleration arrow only turns the point.
+    - Trail:
+    Leaves a fading trail of the last N positions (N in the box, thousands
+    are fine). "Color trail by speed" colors it from slow (purple) to fast
+    (yellow).
+    - Particles:
+    Animates many points (the box sets how many) on the same path, spread
+    evenly around one cycle. With a rate
+    spread above 0, each particle also runs at its own rate between
+    1 - spread and 1 + spread times normal, so they drift in and out of
+    phase. Velocity arrows are drawn for a sample of them. The trail is off
+    in this mode.
+    - Force model:
+    Instead of following the formula, the point starts where the path
+    starts (same position and velocity) and is pushed by a force, step by
+    step (a numerical integrator). The dashed curve is the result.
+    * Uniform field: the parabola's own constant acceleration. It retraces
+      the parabola exactly.
+    * + linear / quadratic drag: the same field plus air resistance
+      (the Drag box sets how strong), so the point falls short.
+    * Central force: a spring pulling toward (h, k) with strength omega^2.
+      It retraces the ellipse exactly.
+    The readout shows the energy drift (how far the computed energy
+    wanders, relative to the start; drag losses are counted) and the
+    largest distance from the exact answer, when there is one.
+    - Readout s:
+    Distance travelled along the path since the start of the cycle, out of
+    the perimeter (ellipse) or the length of the drawn path.
 
     How to interpret:
     - Velocity arrow should look tangent to the curve (it points the direction you’re moving).
@@ -213,10 +3803,18 @@ class SDL2CurvedMotionApp(tk.Tk):
     - Faster motion:
     Same as above but omega=2.5
 
+    - Ellipse at constant speed:
+    Motion: Ellipse/Circle, a=5, b=2, Constant speed on, 2.0
+    The speed readout stays 2.000; perimeter reads 23.013.
+
     - Parabola-like motion:
     Motion: Parabola-like
     p=0.25, speed=1.0
 
+    - Custom spiral:
+    Motion: Custom x(t), y(t)
+    x(t) = 0.5*t*cos(t), y(t) = 0.5*t*sin(t), t from 0 to 12
+
     Tips:
     - If arrows look too small: increase v_scale or a_scale.
     - If the curve goes off-screen: adjust parameters or change the plot range in the Transform tab.
@@ -226,26 +3824,40 @@ class SDL2CurvedMotionApp(tk.Tk):
     --------------------------------------------------------------------
     - This tool is made to support Unit 2 topics (curve graphs, transformations, and parametric motion).
     - It focuses on visual understanding, not perfect physical modeling.
+    - Tools > Profile rendering shows how long each drawing step takes
+    (p50/p95 in milliseconds) under the status line of each tab.
     """
 
         text.insert("1.0", help_text.strip())
         text.config(state="disabled")  # read-only
 
     
-    def __init__(self):
+    def __init__(self, render_cache_mb=RENDER_CACHE_MB):
         super().__init__()
         self.title("SDL 2 — Curved Motion Visualizer (Unit 2)")
         self.geometry("1200x720")
 
+        self._init_view_state()
+        self.render_cache = RenderCache(int(render_cache_mb * 2**20))
+        self.compute = ComputeWorker(self)
+        self.export_compute = ComputeWorker(self, name="sdl2-export")
+        self.scheduler = RenderScheduler(self, on_report=self._report_render)
         self._build_ui()
 
-        # Animation state
-        self.anim_running = False
-        self.t_anim = 0.0
-        self.after_id = None
+    def _report_error(self, title, message):
+        messagebox.showerror(title, message)
 
     # ---------- UI ----------
     def _build_ui(self):
+        menubar = tk.Menu(self)
+        tools = tk.Menu(menubar, tearoff=False)
+        self.profile_var = tk.BooleanVar(value=self.profiler.enabled)
+        tools.add_checkbutton(label="Profile rendering", variable=self.profile_var, command=self._toggle_profiling)
+        self.record_var = tk.BooleanVar(value=False)
+        tools.add_checkbutton(label="Record session...", variable=self.record_var, command=self._toggle_recording)
+        menubar.add_cascade(label="Tools", menu=tools)
+        self.config(menu=menubar)
+
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True)
 
@@ -257,12 +3869,83 @@ class SDL2CurvedMotionApp(tk.Tk):
 
         self.tab_help = ttk.Frame(self.notebook, padding=10)
         self.notebook.add(self.tab_help, text="Help")
-        self._build_help_tab()
 
-        self._build_transform_tab()
-        self._build_motion_tab()
+        # Tabs (and their figures) are built the first time they are shown;
+        # the first one waits until the window is on screen.
+        self._tab_builders = {
+            str(self.tab_transform): self._build_transform_tab,
+            str(self.tab_motion): self._build_motion_tab,
+            str(self.tab_help): self._build_help_tab,
+        }
+        self._mapped = False
+        self.first_paint_ms = None  # set when the first render's pixels are on screen
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.bind("<Map>", self._on_first_map)
+
+    def _on_first_map(self, event):
+        if event.widget is not self:
+            return
+        self.unbind("<Map>")
+        self._mapped = True
+        self.after_idle(self._show_current_tab)
+
+    def _on_tab_changed(self, _event):
+        if self._mapped:
+            self._show_current_tab()
+
+    def _show_current_tab(self):
+        build = self._tab_builders.pop(self.notebook.select(), None)
+        if build is not None:
+            if self.recorder is None:
+                build()
+            else:
+                # The tab's first render is not an input; its variables are logged from here on
+                self.recorder.depth += 1
+                try:
+                    build()
+                finally:
+                    self.recorder.depth -= 1
+                self.recorder.watch(self)
+
+    def _toggle_profiling(self):
+        self.profiler.enabled = bool(self.profile_var.get())
+        if not self.profiler.enabled:
+            for name in ("profile1", "profile2"):
+                if hasattr(self, name):  # tab may not be built yet
+                    getattr(self, name).set("")
+
+    def _toggle_recording(self):
+        if not self.record_var.get():
+            self.stop_recording()
+            return
+        path = filedialog.asksaveasfilename(parent=self, title="Record session", defaultextension=".jsonl",
+                                            filetypes=[("Session log", "*.jsonl")])
+        if path:
+            self.start_recording(path)
+        else:
+            self.record_var.set(False)
+
+    def start_recording(self, path):
+        self.stop_recording()
+        self.recorder = SessionRecorder(path)
+        self.recorder.watch(self)
+        self.record_var.set(True)
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        self.recorder.close()
+        print(f"Recorded {self.recorder.events} events to {self.recorder.path}", file=sys.stderr)
+        self.recorder = None
+        try:
+            self.record_var.set(False)
+        except tk.TclError:
+            pass  # window already destroyed
 
     def _make_figure(self, parent):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+
         fig = Figure(figsize=(7.6, 6.2), dpi=100)
         ax = fig.add_subplot(111)
         ax.grid(True)
@@ -287,11 +3970,13 @@ class SDL2CurvedMotionApp(tk.Tk):
         # Plot
         self.fig1, self.ax1, self.canvas1 = self._make_figure(right)
         self.ax1.set_title("Curve Transformations (Translation + Stretching)")
+        self.hover1 = self._make_hover(self.ax1, self.canvas1)
+        self.overlay1 = CurveOverlays(self.ax1)
 
         # Controls
         ttk.Label(left, text="Curve Type").pack(anchor="w")
         self.curve_type = tk.StringVar(value="Ellipse")
-        curve_box = ttk.Combobox(left, textvariable=self.curve_type, values=["Parabola", "Ellipse", "Hyperbola"], state="readonly")
+        curve_box = ttk.Combobox(left, textvariable=self.curve_type, values=CURVE_TYPES, state="readonly")
         curve_box.pack(anchor="w", fill=tk.X, pady=(0, 10))
         curve_box.bind("<<ComboboxSelected>>", lambda e: self.render_transform())
 
@@ -318,6 +4003,16 @@ class SDL2CurvedMotionApp(tk.Tk):
         ttk.Radiobutton(branch_row, text="Right (+)", variable=self.branch_var, value=1, command=self.render_transform).pack(side=tk.LEFT)
         ttk.Radiobutton(branch_row, text="Left (-)", variable=self.branch_var, value=-1, command=self.render_transform).pack(side=tk.LEFT)
 
+        ttk.Label(left, text="General conic: Ax² + Bxy + Cy² + Dx + Ey + F = 0").pack(anchor="w", pady=(0, 2))
+        for c, span in zip(CONIC_COEFS, (5, 5, 5, 10, 10, 20)):
+            var = tk.DoubleVar(value=CONIC_DEFAULTS[c])
+            setattr(self, f"conic_{c}_var", var)
+            self._slider(left, c, var, -span, span, self.render_transform)
+
+        self.family_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(left, text="Show a-family (a = 0.5 to 6)", variable=self.family_var, command=self.render_transform).pack(anchor="w", pady=(0, 6))
+        self._overlay_checks(left, 1, self.render_transform)
+
         ttk.Label(left, text="Plot Range").pack(anchor="w", pady=(5, 2))
         range_row = ttk.Frame(left)
         range_row.pack(anchor="w", pady=(0, 10))
@@ -327,11 +4022,17 @@ class SDL2CurvedMotionApp(tk.Tk):
         ttk.Label(range_row, text=" to ").pack(side=tk.LEFT)
         ttk.Entry(range_row, textvariable=self.rmax1, width=6).pack(side=tk.LEFT)
 
-        ttk.Button(left, text="Render", command=self.render_transform).pack(anchor="w", pady=(10, 0))
+        render_row = ttk.Frame(left)
+        render_row.pack(anchor="w", pady=(10, 0))
+        ttk.Button(render_row, text="Render", command=self.render_transform).pack(side=tk.LEFT)
+        ttk.Button(render_row, text="Export data...", command=lambda: self._ask_export(self.export_transform)).pack(side=tk.LEFT, padx=6)
 
         self.status1 = tk.StringVar(value="Ready.")
         ttk.Label(left, textvariable=self.status1, foreground="#005").pack(anchor="w", pady=(10, 0))
 
+        self.profile1 = tk.StringVar(value="")
+        ttk.Label(left, textvariable=self.profile1, foreground="#555", wraplength=260).pack(anchor="w")
+
         # First render
         self.render_transform()
 
@@ -342,71 +4043,47 @@ class SDL2CurvedMotionApp(tk.Tk):
         entry = ttk.Entry(row, textvariable=var, width=6)
         entry.pack(side=tk.LEFT, padx=(4, 6))
 
-        s = ttk.Scale(row, variable=var, from_=vmin, to=vmax, command=lambda _x: cmd())
+        s = ttk.Scale(row, variable=var, from_=vmin, to=vmax, command=lambda _x: self.scheduler.request(cmd))
         s.pack(side=tk.LEFT, fill=tk.X, expand=True)
         return s
 
-    def render_transform(self):
-        try:
-            self.ax1.clear()
-            self.ax1.grid(True)
-            self.ax1.set_aspect("equal", adjustable="box")
-            self.ax1.set_title("Curve Transformations (Translation + Stretching)")
+    def _overlay_checks(self, parent, tab, command):
+        # One checkbox per curve overlay (tangent_var1 etc. on the Transform tab)
+        ttk.Label(parent, text="Overlays").pack(anchor="w", pady=(5, 2))
+        row = ttk.Frame(parent)
+        row.pack(anchor="w", pady=(0, 6))
+        for i, (name, label) in enumerate(OVERLAYS):
+            var = tk.BooleanVar(value=False)
+            setattr(self, f"{name}_var{tab}", var)
+            ttk.Checkbutton(row, text=label, variable=var, command=command).grid(row=i // 2, column=i % 2, sticky="w", padx=(0, 8))
 
-            ctype = self.curve_type.get()
-            h, k = float(self.h_var.get()), float(self.k_var.get())
-            a = float(self.a_var.get())
-            b = float(self.b_var.get())
-            rmin, rmax = float(self.rmin1.get()), float(self.rmax1.get())
-            if rmin >= rmax:
-                raise ValueError("Range min must be less than range max.")
+    def _rendered(self, render):
+        self.scheduler.finish(render)
+        if self.first_paint_ms is None:
+            # The plot is drawn on the worker's result, after the tab is built
+            self.first_paint_ms = 1000.0 * (time.perf_counter() - _T_START)
+            print(f"time-to-first-paint: {self.first_paint_ms:.0f} ms", file=sys.stderr)
 
-            # Plot original (centered) + transformed (shifted)
-            # Use light styling differences (no custom colors needed)
-            if ctype == "Parabola":
-                t = np.linspace(rmin, rmax, 600)
-                # Original y = a x^2
-                x0 = t
-                y0 = a * (t ** 2)
-                # Transformed y = a(x-h)^2 + k
-                x1, y1 = parabola_xy(t, a=a, h=h, k=k)
-
-                self.ax1.plot(x0, y0, linestyle="--", linewidth=1, label="original (centered)")
-                self.ax1.plot(x1, y1, linewidth=2, label="transformed")
-
-            elif ctype == "Ellipse":
-                th = np.linspace(0, 2*np.pi, 600)
-                # Original centered ellipse
-                x0, y0 = ellipse_xy(th, a=a, b=b, h=0.0, k=0.0)
-                # Transformed
-                x1, y1 = ellipse_xy(th, a=a, b=b, h=h, k=k)
-
-                self.ax1.plot(x0, y0, linestyle="--", linewidth=1, label="original (centered)")
-                self.ax1.plot(x1, y1, linewidth=2, label="transformed")
-
-            else:  # Hyperbola
-                tt = np.linspace(0, 2.2, 500)  # cosh grows fast
-                branch = int(self.branch_var.get())
-
-                # Original centered branch
-                x0, y0 = hyperbola_xy(tt, a=a, b=b, h=0.0, k=0.0, branch=branch)
-                # Transformed
-                x1, y1 = hyperbola_xy(tt, a=a, b=b, h=h, k=k, branch=branch)
-
-                self.ax1.plot(x0, y0, linestyle="--", linewidth=1, label="original (centered)")
-                self.ax1.plot(x1, y1, linewidth=2, label="transformed")
-
-            self.ax1.set_xlim(rmin, rmax)
-            self.ax1.set_ylim(rmin, rmax)
-            self.ax1.set_xlabel("x")
-            self.ax1.set_ylabel("y")
-            self.ax1.legend(loc="upper right")
-
-            self.canvas1.draw()
-            self.status1.set("Rendered.")
-        except Exception as e:
-            self.status1.set("Error.")
-            messagebox.showerror("Transform Render Error", str(e))
+    def _request_render(self, render):
+        self.scheduler.request(render)
+
+    def _ask_export(self, export):
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export data", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NumPy array", "*.npy")])
+        if path:
+            export(path)
+
+    def _report_render(self, render, coalesced, latency_ms):
+        # Scheduler callback: how many slider events were dropped, and input-to-pixels latency
+        # appended to what the render reported (e.g. the general conic's name)
+        status = self.status1 if render == self.render_transform else self.status2
+        text = status.get()
+        if text == "Error.":
+            return
+        if text.endswith(" ms)"):  # already carries an earlier report
+            text = text[:text.rindex(" (")]
+        status.set(f"{text} ({coalesced} events coalesced, {latency_ms:.0f} ms)")
 
     # ---------- Tab 2: Parametric Motion ----------
     def _build_motion_tab(self):
@@ -418,27 +4095,30 @@ class SDL2CurvedMotionApp(tk.Tk):
 
         # Plot
         self.fig2, self.ax2, self.canvas2 = self._make_figure(right)
-        self.ax2.set_title("Parametric Motion (Position, Velocity, Acceleration)")
+        self.ax2.set_title(MOTION_TITLE)
+        self.hover2 = self._make_hover(self.ax2, self.canvas2)
+        self.overlay2 = CurveOverlays(self.ax2)
+        self.canvas2.mpl_connect("draw_event", self._on_motion_draw)
 
         # Controls
         ttk.Label(left, text="Motion Path").pack(anchor="w")
         self.motion_type = tk.StringVar(value="Ellipse/Circle")
-        motion_box = ttk.Combobox(left, textvariable=self.motion_type, values=["Ellipse/Circle", "Parabola-like"], state="readonly")
+        motion_box = ttk.Combobox(left, textvariable=self.motion_type, values=MOTION_PATHS, state="readonly")
         motion_box.pack(anchor="w", fill=tk.X, pady=(0, 10))
         motion_box.bind("<<ComboboxSelected>>", lambda e: self.render_motion_static())
 
         ttk.Label(left, text="Center (h, k)").pack(anchor="w", pady=(0, 2))
-        self.mh_var = tk.DoubleVar(value=0.0)
-        self.mk_var = tk.DoubleVar(value=0.0)
+        self.mh_var = tk.DoubleVar(value=MOTION_DEFAULTS["h"])
+        self.mk_var = tk.DoubleVar(value=MOTION_DEFAULTS["k"])
         self._slider(left, "h", self.mh_var, -5, 5, self.render_motion_static)
         self._slider(left, "k", self.mk_var, -5, 5, self.render_motion_static)
 
         ttk.Label(left, text="Parameters").pack(anchor="w", pady=(10, 2))
 
         # For ellipse/circle
-        self.ma_var = tk.DoubleVar(value=3.0)      # a radius
-        self.mb_var = tk.DoubleVar(value=2.0)      # b radius
-        self.omega_var = tk.DoubleVar(value=1.0)   # angular speed
+        self.ma_var = tk.DoubleVar(value=MOTION_DEFAULTS["a"])      # a radius
+        self.mb_var = tk.DoubleVar(value=MOTION_DEFAULTS["b"])      # b radius
+        self.omega_var = tk.DoubleVar(value=MOTION_DEFAULTS["omega"])   # angular speed
 
         self._slider(left, "a", self.ma_var, 0.5, 6, self.render_motion_static)
         self._slider(left, "b", self.mb_var, 0.5, 6, self.render_motion_static)
@@ -446,18 +4126,38 @@ class SDL2CurvedMotionApp(tk.Tk):
 
         # For parabola-like
         ttk.Label(left, text="Parabola p & speed").pack(anchor="w", pady=(10, 2))
-        self.p_motion_var = tk.DoubleVar(value=0.25)
-        self.speed_motion_var = tk.DoubleVar(value=1.0)
+        self.p_motion_var = tk.DoubleVar(value=MOTION_DEFAULTS["p"])
+        self.speed_motion_var = tk.DoubleVar(value=MOTION_DEFAULTS["speed"])
         self._slider(left, "p", self.p_motion_var, 0.05, 2.0, self.render_motion_static)
         self._slider(left, "speed", self.speed_motion_var, 0.2, 3.0, self.render_motion_static)
 
+        # For custom x(t), y(t): a, b, omega, p and speed above can be used by name
+        ttk.Label(left, text="Custom x(t), y(t)").pack(anchor="w", pady=(10, 2))
+        self.x_expr_var = tk.StringVar(value=MOTION_DEFAULTS["x_expr"])
+        self.y_expr_var = tk.StringVar(value=MOTION_DEFAULTS["y_expr"])
+        self.tmin_var = tk.DoubleVar(value=MOTION_DEFAULTS["t_min"])
+        self.tmax_var = tk.DoubleVar(value=MOTION_DEFAULTS["t_max"])
+        expr_row = ttk.Frame(left)
+        expr_row.pack(anchor="w", fill=tk.X)
+        for row, (label, var) in enumerate((("x(t) =", self.x_expr_var), ("y(t) =", self.y_expr_var))):
+            ttk.Label(expr_row, text=label).grid(row=row, column=0, sticky="w")
+            entry = ttk.Entry(expr_row, textvariable=var, width=24)
+            entry.grid(row=row, column=1, columnspan=3, sticky="we", pady=1)
+            entry.bind("<Return>", lambda e: self.render_motion_static())
+        for col, (label, var) in enumerate((("t from", self.tmin_var), ("to", self.tmax_var))):
+            ttk.Label(expr_row, text=label).grid(row=2, column=2 * col, sticky="w")
+            entry = ttk.Entry(expr_row, textvariable=var, width=7)
+            entry.grid(row=2, column=2 * col + 1, sticky="w", pady=1)
+            entry.bind("<Return>", lambda e: self.render_motion_static())
+
         ttk.Separator(left).pack(fill=tk.X, pady=10)
 
         ttk.Label(left, text="Vector display scale").pack(anchor="w")
-        self.v_scale = tk.DoubleVar(value=1.0)
-        self.a_scale = tk.DoubleVar(value=0.3)
+        self.v_scale = tk.DoubleVar(value=MOTION_DEFAULTS["v_scale"])
+        self.a_scale = tk.DoubleVar(value=MOTION_DEFAULTS["a_scale"])
         self._slider(left, "v_scale", self.v_scale, 0.1, 5.0, self.render_motion_static)
         self._slider(left, "a_scale", self.a_scale, 0.05, 2.0, self.render_motion_static)
+        self._overlay_checks(left, 2, self.render_motion_static)
 
         ttk.Separator(left).pack(fill=tk.X, pady=10)
 
@@ -467,10 +4167,64 @@ class SDL2CurvedMotionApp(tk.Tk):
         ttk.Button(btn_row, text="Render Path", command=self.render_motion_static).pack(side=tk.LEFT)
         ttk.Button(btn_row, text="Start", command=self.start_animation).pack(side=tk.LEFT, padx=6)
         ttk.Button(btn_row, text="Stop", command=self.stop_animation).pack(side=tk.LEFT)
+        ttk.Button(btn_row, text="Export data...", command=lambda: self._ask_export(self.export_motion)).pack(side=tk.LEFT, padx=6)
 
+        timing_row = ttk.Frame(left)
+        timing_row.pack(anchor="w", pady=(0, 6))
         self.dt_var = tk.DoubleVar(value=0.03)
-        ttk.Label(left, text="Time step (dt)").pack(anchor="w")
-        ttk.Entry(left, textvariable=self.dt_var, width=8).pack(anchor="w", pady=(0, 6))
+        self.fps_var = tk.DoubleVar(value=30.0)
+        ttk.Label(timing_row, text="Time step (dt)").grid(row=0, column=0, sticky="w")
+        ttk.Entry(timing_row, textvariable=self.dt_var, width=8).grid(row=1, column=0, sticky="w", padx=(0, 10))
+        ttk.Label(timing_row, text="Target fps").grid(row=0, column=1, sticky="w")
+        ttk.Entry(timing_row, textvariable=self.fps_var, width=8).grid(row=1, column=1, sticky="w")
+
+        # Constant speed along the path (arc-length timing)
+        self.const_speed_var = tk.BooleanVar(value=False)
+        self.path_speed_var = tk.DoubleVar(value=2.0)
+        ttk.Checkbutton(timing_row, text="Constant speed", variable=self.const_speed_var,
+                        command=self.render_motion_static).grid(row=2, column=0, sticky="w", pady=(6, 0))
+        speed_entry = ttk.Entry(timing_row, textvariable=self.path_speed_var, width=8)
+        speed_entry.grid(row=2, column=1, sticky="w", pady=(6, 0))
+        speed_entry.bind("<Return>", lambda e: self.render_motion_static())
+
+        # Fading trail of recent positions
+        self.trail_var = tk.BooleanVar(value=False)
+        self.trail_len_var = tk.IntVar(value=500)
+        self.trail_speed_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(timing_row, text="Trail (points)", variable=self.trail_var,
+                        command=self.render_motion_static).grid(row=3, column=0, sticky="w", pady=(6, 0))
+        trail_entry = ttk.Entry(timing_row, textvariable=self.trail_len_var, width=8)
+        trail_entry.grid(row=3, column=1, sticky="w", pady=(6, 0))
+        trail_entry.bind("<Return>", lambda e: self.render_motion_static())
+        ttk.Checkbutton(timing_row, text="Color trail by speed", variable=self.trail_speed_var,
+                        command=self.render_motion_static).grid(row=4, column=0, columnspan=2, sticky="w")
+
+        # Many particles on the same path
+        self.particles_var = tk.BooleanVar(value=False)
+        self.n_particles_var = tk.IntVar(value=1000)
+        self.rate_spread_var = tk.DoubleVar(value=0.0)
+        ttk.Checkbutton(timing_row, text="Particles", variable=self.particles_var,
+                        command=self.render_motion_static).grid(row=5, column=0, sticky="w", pady=(6, 0))
+        particles_entry = ttk.Entry(timing_row, textvariable=self.n_particles_var, width=8)
+        particles_entry.grid(row=5, column=1, sticky="w", pady=(6, 0))
+        particles_entry.bind("<Return>", lambda e: self.render_motion_static())
+        ttk.Label(timing_row, text="Rate spread (0-1)").grid(row=6, column=0, sticky="w")
+        spread_entry = ttk.Entry(timing_row, textvariable=self.rate_spread_var, width=8)
+        spread_entry.grid(row=6, column=1, sticky="w")
+        spread_entry.bind("<Return>", lambda e: self.render_motion_static())
+
+        # Force-based (integrated) motion
+        self.force_var = tk.StringVar(value=FORCE_MODELS[0])
+        self.drag_var = tk.DoubleVar(value=0.2)
+        ttk.Label(timing_row, text="Force model").grid(row=7, column=0, sticky="w", pady=(6, 0))
+        ttk.Label(timing_row, text="Drag").grid(row=7, column=1, sticky="w", pady=(6, 0))
+        force_box = ttk.Combobox(timing_row, textvariable=self.force_var, values=FORCE_MODELS,
+                                 state="readonly", width=22)
+        force_box.grid(row=8, column=0, sticky="w", padx=(0, 10))
+        force_box.bind("<<ComboboxSelected>>", lambda e: self.render_motion_static())
+        drag_entry = ttk.Entry(timing_row, textvariable=self.drag_var, width=8)
+        drag_entry.grid(row=8, column=1, sticky="w")
+        drag_entry.bind("<Return>", lambda e: self.render_motion_static())
 
         self.status2 = tk.StringVar(value="Ready.")
         ttk.Label(left, textvariable=self.status2, foreground="#005").pack(anchor="w", pady=(6, 0))
@@ -478,118 +4232,323 @@ class SDL2CurvedMotionApp(tk.Tk):
         self.readout = tk.StringVar(value="t=0.00   speed=0.00")
         ttk.Label(left, textvariable=self.readout).pack(anchor="w", pady=(6, 0))
 
+        self.fps_readout = tk.StringVar(value="")
+        ttk.Label(left, textvariable=self.fps_readout).pack(anchor="w")
+
+        self.profile2 = tk.StringVar(value="")
+        ttk.Label(left, textvariable=self.profile2, foreground="#555", wraplength=260).pack(anchor="w")
+
         # Initial render
         self.render_motion_static()
 
-    def render_motion_static(self):
-        try:
-            self.ax2.clear()
-            self.ax2.grid(True)
-            self.ax2.set_aspect("equal", adjustable="box")
-            self.ax2.set_title("Parametric Motion (Position, Velocity, Acceleration)")
 
-            mtype = self.motion_type.get()
-            h, k = float(self.mh_var.get()), float(self.mk_var.get())
-            rmin, rmax = -7, 7
-
-            # Draw the path curve
-            if mtype == "Ellipse/Circle":
-                a = float(self.ma_var.get())
-                b = float(self.mb_var.get())
-                th = np.linspace(0, 2*np.pi, 800)
-                x, y = ellipse_xy(th, a=a, b=b, h=h, k=k)
-                self.ax2.plot(x, y, linewidth=2, label="path (ellipse)")
-
-                # Draw a sample instantaneous vectors at current t_anim
-                t0 = self.t_anim
-                omega = float(self.omega_var.get())
-                px, py = motion_ellipse(t0, a=a, b=b, omega=omega, h=h, k=k)
-                vx, vy = motion_ellipse_v(t0, a=a, b=b, omega=omega)
-                ax, ay = motion_ellipse_a(t0, a=a, b=b, omega=omega)
+# -----------------------------
+# Benchmarks
+# -----------------------------
+# Headless timings of the math helpers, both render paths and a simulated
+# animation run. Every result is seconds per operation (lower is better),
+# so a saved run can be used as a baseline for regression checks.
 
-            else:
-                p = float(self.p_motion_var.get())
-                spd = float(self.speed_motion_var.get())
-                t = np.linspace(-3, 3, 800)
-                x, y = motion_parabola_param(t, p=p, speed=spd, h=h, k=k)
-                self.ax2.plot(x, y, linewidth=2, label="path (parabola-like)")
-
-                t0 = self.t_anim
-                px, py = motion_parabola_param(t0, p=p, speed=spd, h=h, k=k)
-                vx, vy = motion_parabola_v(t0, p=p, speed=spd)
-                ax, ay = motion_parabola_a(t0, p=p, speed=spd)
-
-            # Point + vectors
-            self.ax2.scatter([px], [py], s=40, label="moving point")
-
-            vs = float(self.v_scale.get())
-            ac = float(self.a_scale.get())
-
-            self.ax2.quiver(px, py, vs*vx, vs*vy, angles="xy", scale_units="xy", scale=1)
-            self.ax2.quiver(px, py, ac*ax, ac*ay, angles="xy", scale_units="xy", scale=1)
-
-            speed = float(np.sqrt(vx*vx + vy*vy))
-            self.readout.set(f"t={self.t_anim:.2f}   speed={speed:.3f}")
-            self.ax2.set_xlim(rmin, rmax)
-            self.ax2.set_ylim(rmin, rmax)
-            self.ax2.set_xlabel("x")
-            self.ax2.set_ylabel("y")
-            self.ax2.legend(loc="upper right")
+BENCH_SIZES = (1, 100, 10_000, 1_000_000)
 
-            self.canvas2.draw()
-            self.status2.set("Rendered.")
-        except Exception as e:
-            self.status2.set("Error.")
-            messagebox.showerror("Motion Render Error", str(e))
+def _seconds_per_call(func, min_time=0.05, repeat=5):
+    # Best of `repeat` rounds; each round repeats func until it takes >= min_time
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1 << 22:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(int(min_time / elapsed) + 1, 100))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
 
-    def start_animation(self):
-        if self.anim_running:
-            return
-        self.anim_running = True
-        self.status2.set("Animating...")
-        self._tick()
+def bench_math(sizes=BENCH_SIZES):
+    helpers = [
+        ("parabola_xy", parabola_xy, {"a": 1.5, "h": 1.0, "k": -1.0}),
+        ("ellipse_xy", ellipse_xy, {"a": 3.0, "b": 2.0, "h": 1.0, "k": -1.0}),
+        ("hyperbola_xy", hyperbola_xy, {"a": 2.0, "b": 1.5, "h": 1.0, "k": -1.0}),
+        ("motion_ellipse", motion_ellipse, {"a": 3.0, "b": 2.0, "omega": 1.3}),
+        ("motion_ellipse_v", motion_ellipse_v, {"a": 3.0, "b": 2.0, "omega": 1.3}),
+        ("motion_ellipse_a", motion_ellipse_a, {"a": 3.0, "b": 2.0, "omega": 1.3}),
+        ("motion_parabola_param", motion_parabola_param, {"p": 0.25, "speed": 1.2}),
+        ("motion_parabola_v", motion_parabola_v, {"p": 0.25, "speed": 1.2}),
+        ("motion_parabola_a", motion_parabola_a, {"p": 0.25, "speed": 1.2}),
+    ]
+    results = {}
+    for name, func, kwargs in helpers:
+        for n in sizes:
+            t = 0.7 if n == 1 else np.linspace(0.0, 2.0, n)  # n == 1: the scalar call the animation makes
+            seconds = _seconds_per_call(lambda: func(t, **kwargs))
+            results[f"math.{name}[{n}]"] = {"seconds": seconds, "samples_per_s": n / seconds}
+    # Grid extraction of a degenerate conic (a pair of lines) over the default view
+    results["math.conic_contour[lines]"] = {
+        "seconds": _seconds_per_call(lambda: conic_contour((1.0, 1.0, -2.0, 0.0, 0.0, 0.0), (-6, 6), (-6, 6), 40.0))}
+    return results
 
-    def stop_animation(self):
-        self.anim_running = False
-        self.status2.set("Stopped.")
-        if self.after_id is not None:
-            try:
-                self.after_cancel(self.after_id)
-            except Exception:
-                pass
-            self.after_id = None
+def bench_render(views):
+    results = {}
+    cache, views.render_cache = views.render_cache, RenderCache(0)  # full renders only
+    try:
+        for ctype in CURVE_TYPES:
+            views.curve_type.set(ctype)
+            seconds = _seconds_per_call(views.render_transform, min_time=0.2, repeat=3)
+            results[f"render.transform[{ctype}]"] = {"seconds": seconds}
+    finally:
+        views.render_cache = cache
+    for mtype in MOTION_PATHS:
+        views.motion_type.set(mtype)
+        seconds = _seconds_per_call(views.render_motion_static, min_time=0.2, repeat=3)
+        results[f"render.motion_static[{mtype}]"] = {"seconds": seconds}
+    return results
 
-    def _tick(self):
-        if not self.anim_running:
-            return
+def bench_scrub(views, positions=40, passes=3):
+    # Drag the h slider across `positions` values and back, `passes` times:
+    # the first sweep renders, later ones revisit cached states
+    views.curve_type.set("Ellipse")
+    saved, cache = views.render_cache, RenderCache()
+    views.render_cache = cache
+    values = np.linspace(-3.0, 3.0, positions)
+    sweep = np.concatenate((values, values[::-1]))
+    results = {}
+    try:
+        for label, count in (("cold", 1), ("warm", passes - 1)):
+            t0 = time.perf_counter()
+            for _ in range(count):
+                for h in sweep:
+                    views.h_var.set(float(h))
+                    views.render_transform()
+            seconds = (time.perf_counter() - t0) / (count * sweep.size)
+            results[f"render.scrub[{label}]"] = {"seconds": seconds}
+    finally:
+        views.render_cache = saved
+        views.h_var.set(VIEW_DEFAULTS["h_var"])
+    results["render.scrub[warm]"]["hit_rate"] = cache.hits / max(cache.hits + cache.data_hits + cache.misses, 1)
+    return results
 
-        try:
-            dt = float(self.dt_var.get())
-            if dt <= 0:
-                dt = 0.03
-        except Exception:
-            dt = 0.03
+def bench_animation(views, ticks=1000):
+    results = {}
+    for mtype in MOTION_PATHS:
+        views.motion_type.set(mtype)
+        views.t_anim = 0.0
+        views.render_motion_static()
+        views.start_animation()
+        done = 0
+        t0 = time.perf_counter()
+        while done < ticks and views.anim_running:
+            done += views.run_pending()
+        elapsed = time.perf_counter() - t0
+        views.stop_animation()
+        results[f"anim.ticks[{mtype}]"] = {"seconds": elapsed / max(done, 1), "fps": done / elapsed}
+    return results
+
+def bench_particles(views, n_particles=10000, ticks=200):
+    views.motion_type.set(MOTION_PATHS[0])
+    views.particles_var.set(True)
+    views.n_particles_var.set(n_particles)
+    try:
+        views.render_motion_static()
+        views.start_animation()
+        done = 0
+        t0 = time.perf_counter()
+        while done < ticks and views.anim_running:
+            done += views.run_pending()
+        elapsed = time.perf_counter() - t0
+        views.stop_animation()
+    finally:
+        views.particles_var.set(False)
+    return {f"anim.particles[{n_particles}]": {"seconds": elapsed / max(done, 1), "fps": done / elapsed}}
+
+def run_benchmarks(quick=False):
+    import matplotlib
+
+    sizes = (1, 1000) if quick else BENCH_SIZES
+    views = HeadlessViews()
+    results = {}
+    results.update(bench_math(sizes))
+    results.update(bench_render(views))
+    results.update(bench_scrub(views, passes=2 if quick else 3))
+    results.update(bench_animation(views, ticks=200 if quick else 1000))
+    results.update(bench_particles(views, ticks=50 if quick else 200))
+    meta = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "quick": quick,
+    }
+    return {"meta": meta, "results": results}
+
+def compare_benchmarks(current, baseline, tolerance=0.25):
+    # [(name, baseline_s, current_s, ratio, regressed)] for results present in both
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = cur["seconds"] / base["seconds"] if base["seconds"] > 0 else float("inf")
+        rows.append((name, base["seconds"], cur["seconds"], ratio, ratio > 1.0 + tolerance))
+    return rows
+
+def _format_seconds(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.3f} ms"
+    return f"{seconds * 1e6:9.3f} us"
+
+
+# -----------------------------
+# Command line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SDL 2 — Curved Motion Visualizer (Unit 2)")
+    parser.add_argument("--render-cache-mb", type=float, default=RENDER_CACHE_MB,
+                        help=f"memory cap of the Transform tab's render cache (default {RENDER_CACHE_MB}; 0 disables it)")
+    parser.add_argument("--record", metavar="SESSION", help="log every input to this file (replay it with the replay command)")
+    sub = parser.add_subparsers(dest="command")
+
+    frames = sub.add_parser("frames", help="render the Parametric Motion animation headlessly (PNG sequence or GIF)")
+    frames.add_argument("out", help="output directory for PNG frames, or a file ending in .gif")
+    frames.add_argument("-n", "--n-frames", type=int, default=120)
+    frames.add_argument("--path", choices=MOTION_PATHS, default=MOTION_PATHS[0])
+    for name, default in MOTION_DEFAULTS.items():
+        frames.add_argument(f"--{name.replace('_', '-')}", dest=name, type=type(default), default=default)
+    frames.add_argument("--dt", type=float, default=0.03)
+    frames.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    frames.add_argument("--fps", type=float, default=None, help="GIF frame rate (default: 1/dt)")
+    frames.add_argument("--dpi", type=int, default=100)
 
-        # Advance time
-        self.t_anim += dt
+    physics = sub.add_parser("physics", help="check the force integrator against the exact solutions")
+    physics.add_argument("--model", choices=FORCE_MODELS[1:], default="Central force")
+    physics.add_argument("-n", "--conditions", type=int, default=1000, help="random initial conditions, integrated together")
+    physics.add_argument("--steps", type=int, default=1000, help="integrator steps per cycle")
+    physics.add_argument("--method", choices=["auto", "rk4", "verlet"], default="auto")
+    physics.add_argument("--drag", type=float, default=0.2)
+    physics.add_argument("--seed", type=int, default=0)
 
-        # Keep time from growing forever (wrap)
-        if self.motion_type.get() == "Ellipse/Circle":
-            # Wrap by 2π/omega (period)
-            omega = float(self.omega_var.get())
-            period = (2*np.pi / omega) if omega != 0 else 2*np.pi
-            if self.t_anim > period:
-                self.t_anim -= period
+    export = sub.add_parser("export", help="stream a motion trajectory or a Transform curve to CSV or .npy")
+    export.add_argument("out", help="output file ending in .csv or .npy")
+    export.add_argument("--curve", choices=list(CURVE_T_RANGES), help="export this Transform curve instead of a motion path")
+    export.add_argument("--path", choices=MOTION_PATHS, default=MOTION_PATHS[0])
+    for name, default in MOTION_DEFAULTS.items():
+        export.add_argument(f"--{name.replace('_', '-')}", dest=name, type=type(default), default=default)
+    export.add_argument("--branch", type=int, choices=[1, -1], default=1, help="hyperbola branch")
+    export.add_argument("--start", type=float, default=None, help="first t (default: start of the cycle or curve)")
+    export.add_argument("--end", type=float, default=None, help="last t (default: end of the cycle or curve)")
+    export.add_argument("--dt", type=float, default=0.01)
+    export.add_argument("--force", choices=FORCE_MODELS[1:], default=None, help="integrate this force model")
+    export.add_argument("--drag", type=float, default=0.2)
+    export.add_argument("--chunk", type=int, default=EXPORT_CHUNK, help="rows generated and written at a time")
+
+    replay = sub.add_parser("replay", help="replay a recorded input session headlessly and report render latency")
+    replay.add_argument("session", help="file written with --record or Tools > Record session")
+    replay.add_argument("--realtime", action="store_true", help="keep the recorded timing (default: as fast as possible)")
+    replay.add_argument("--out", help="write every action and tick timing as JSON")
+
+    bench = sub.add_parser("bench", help="run the headless benchmark suite")
+    bench.add_argument("--out", help="write results as JSON to this file")
+    bench.add_argument("--compare", metavar="BASELINE", help="compare against a saved JSON run; exit 1 on regressions")
+    bench.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a regression (default 0.25 = 25%%)")
+    bench.add_argument("--quick", action="store_true", help="fewer sizes and ticks, for smoke runs")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "frames":
+        params = {name: getattr(args, name) for name in MOTION_DEFAULTS}
+        t0 = time.perf_counter()
+        written = render_motion_frames(args.out, args.n_frames, args.path, params, dt=args.dt,
+                                       workers=args.workers, dpi=args.dpi, fps=args.fps)
+        print(f"Wrote {args.n_frames} frames to {args.out} in {time.perf_counter() - t0:.2f} s"
+              f" ({len(written)} file(s)).")
+        return 0
+
+    if args.command == "physics":
+        try:
+            result = physics_check(args.model, args.conditions, args.steps, args.method, args.drag, args.seed)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"{result['model']}: {result['conditions']} conditions x {result['steps']} steps "
+              f"({result['method']}) in {result['seconds']:.3f} s")
+        print(f"energy drift    max {result['max_drift']:.2e}   median {result['median_drift']:.2e}")
+        if result["max_error"] is None:
+            print("position error  n/a (no closed form)")
         else:
-            # Keep parabola time bounded for display
-            if self.t_anim > 3:
-                self.t_anim = -3
+            print(f"position error  max {result['max_error']:.2e}   median {result['median_error']:.2e}")
+        return 0
 
-        self.render_motion_static()
-        self.after_id = self.after(int(1000 * dt), self._tick)
+    if args.command == "export":
+        t0 = time.perf_counter()
+        try:
+            if args.curve:
+                n_rows, chunks = transform_export(args.curve, args.a, args.b, args.h, args.k, args.branch,
+                                                  args.start, args.end, args.dt, args.chunk)
+            else:
+                params = {name: getattr(args, name) for name in MOTION_DEFAULTS}
+                force = (args.force, args.drag) if args.force else None
+                n_rows, chunks = motion_export(args.path, params, args.start, args.end, args.dt, force, args.chunk)
+            written = write_export(args.out, n_rows, chunks)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Wrote {written} rows ({', '.join(EXPORT_COLUMNS)}) to {args.out} in {time.perf_counter() - t0:.2f} s.")
+        return 0
+
+    if args.command == "replay":
+        try:
+            result = replay_session(args.session, realtime=args.realtime)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        mode = "in real time" if args.realtime else "as fast as possible"
+        print(f"Replayed {result['events']} events ({result['session_seconds']:.1f} s session) "
+              f"{mode} in {result['seconds']:.2f} s.")
+        for line in replay_summary(result):
+            print(line)
+        for error in result["errors"]:
+            print(f"error: {error}")
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(result, f, indent=2)
+        return 0
 
+    if args.command == "bench":
+        run = run_benchmarks(quick=args.quick)
+        for name, result in run["results"].items():
+            extra = f"   {result['fps']:8.1f} fps" if "fps" in result else ""
+            if "hit_rate" in result:
+                extra = f"   {100 * result['hit_rate']:6.1f}% cache hits"
+            print(f"{name:45s} {_format_seconds(result['seconds'])}{extra}")
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(run, f, indent=2)
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            rows = compare_benchmarks(run, baseline, args.tolerance)
+            print()
+            for name, base_s, cur_s, ratio, regressed in rows:
+                flag = "  REGRESSION" if regressed else ""
+                print(f"{name:45s} {_format_seconds(base_s)} -> {_format_seconds(cur_s)}  x{ratio:5.2f}{flag}")
+            regressions = sum(1 for row in rows if row[4])
+            print(f"\n{regressions} regression(s) over {len(rows)} compared result(s).")
+            return 1 if regressions else 0
+        return 0
 
-if __name__ == "__main__":
-    app = SDL2CurvedMotionApp()
+    app = SDL2CurvedMotionApp(render_cache_mb=args.render_cache_mb)
+    if args.record:
+        app.start_recording(args.record)
     app.mainloop()
+    app.stop_recording()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
  
\ No newline at end of file
@@ -0,0 +1,17 @@
+import importlib.util
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def sdl2():
+    # "SDL 2.py" is not an importable module name, so load it from its path
+    spec = importlib.util.spec_from_file_location("sdl2", ROOT / "SDL 2.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["sdl2"] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+CASES = [
+    ((1, 0, 1, 0, 0, -9), "circle"),
+    ((1, 1, 1, 0, 0, -9), "ellipse"),
+    ((1, 3, -1, 2, 0, -4), "hyperbola"),
+    ((0, 1, 0, 0, 0, -4), "hyperbola"),
+    ((1, -2, 1, -3, -3, 0), "parabola"),
+    ((1, 0, 1, 0, 0, 0), "point"),
+    ((1, 0, -1, 0, 0, 0), "pair of lines"),
+    ((1, 1, -2, 0, 0, 0), "pair of lines"),
+    ((1, 0, 0, 0, 0, -4), "parallel lines"),
+    ((1, 0, 0, 0, 0, 0), "line"),
+    ((0, 0, 0, 1, 1, -1), "line"),
+    ((1, 0, 1, 0, 0, 4), "no real points"),
+    ((1, 0, 0, 0, 0, 4), "no real points"),
+    ((0, 0, 0, 0, 0, 1), "not a curve"),
+]
+LIM = (-6.0, 6.0)
+
+
+@pytest.mark.parametrize("coefs, name", CASES)
+def test_classify_conic(sdl2, coefs, name):
+    assert sdl2.classify_conic(coefs)[0] == name
+
+
+CURVES = [case for case in CASES if case[1] not in ("point", "no real points", "not a curve")]
+MOVES = [(0.0, 0.0, 40.0), (0.37, -1.2, 51.7)]  # (h, k, ppu): the second keeps grid nodes off the curve
+
+
+@pytest.mark.parametrize("h, k, ppu", MOVES)
+@pytest.mark.parametrize("coefs, name", CURVES)
+def test_conic_samples_lie_on_the_curve(sdl2, coefs, name, h, k, ppu):
+    coefs = sdl2.shift_conic(coefs, h, k)
+    x, y, drawn = sdl2.conic_xy(coefs, LIM, LIM, ppu)
+    assert drawn == name
+    ok = np.isfinite(x)
+    assert ok.any()
+    # Grid-traced cases are exact only to the grid's linear interpolation
+    assert np.abs(sdl2.conic_value(coefs, x[ok], y[ok])).max() < 1e-2
+
+
+@pytest.mark.parametrize("h, k, ppu", MOVES)
+def test_point_conic_is_drawn_as_a_dot(sdl2, h, k, ppu):
+    x, y, drawn = sdl2.conic_xy(sdl2.shift_conic((1, 0, 1, 0, 0, 0), h, k), LIM, LIM, ppu)
+    assert drawn == "point"
+    assert x.size
+    np.testing.assert_allclose(np.hypot(x - h, y - k), 0.5 * sdl2.CONIC_DOT_PX / ppu)
+
+
+@pytest.mark.parametrize("h, k, ppu", MOVES)
+@pytest.mark.parametrize("coefs", [(1, 0, 0, 0, 0, 0), (1, -2, 1, 0, 0, 0), (1, 2, 1, 2, 2, 1)])
+def test_double_line_spans_the_view(sdl2, coefs, h, k, ppu):
+    coefs = sdl2.shift_conic(coefs, h, k)
+    x, y, drawn = sdl2.conic_xy(coefs, LIM, LIM, ppu)
+    assert drawn == "line"
+    assert np.abs(sdl2.conic_value(coefs, x, y)).max() < 1e-9
+    # Reaches past the view on both sides
+    assert max(np.ptp(x), np.ptp(y)) > LIM[1] - LIM[0]
+
+
+def test_conics_out_of_view_draw_nothing(sdl2):
+    for coefs in [(1, 0, 1, -20, 0, 100), (1, 0, 0, -20, 0, 100)]:  # point and line at x = 10
+        x, _y, _name = sdl2.conic_xy(coefs, LIM, LIM, 40.0)
+        assert x.size == 0
+
+
+def test_tilted_ellipse_axis(sdl2):
+    _name, form = sdl2.classify_conic((1, 1, 1, 0, 0, -9))
+    assert sdl2.conic_axis_angle(form) == pytest.approx(135.0)
+
+
+def test_marching_squares_matches_contourpy(sdl2):
+    contourpy = pytest.importorskip("contourpy")
+    xs = np.linspace(-6, 6, 241)
+    ys = np.linspace(-6, 6, 201)
+    X, Y = np.meshgrid(xs, ys)
+    F = np.sin(X) * np.cos(Y) + 0.1 * X - 0.05
+    x, y = sdl2.marching_squares(F, xs, ys)
+    lines = contourpy.contour_generator(xs, ys, F).lines(0.0)
+
+    ok = np.isfinite(x)
+    assert np.count_nonzero(~ok) + 1 == len(lines)
+    ours = np.unique(np.round(np.column_stack((x[ok], y[ok])), 9), axis=0)
+    theirs = np.unique(np.round(np.concatenate(lines), 9), axis=0)
+    np.testing.assert_allclose(ours, theirs)
+    length = np.nansum(np.hypot(np.diff(x), np.diff(y)))
+    expected = sum(np.hypot(*np.diff(line, axis=0).T).sum() for line in lines)
+    assert length == pytest.approx(expected)
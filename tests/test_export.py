@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+
+def collect(export):
+    n_rows, chunks = export
+    chunks = list(chunks)
+    rows = np.concatenate(chunks)
+    assert len(rows) == n_rows
+    return rows, [len(c) for c in chunks]
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 100, 101, 1000])
+def test_transform_chunks_match_one_pass(sdl2, chunk):
+    # 101 rows: chunk boundaries inside, on the last row, and past the end
+    whole, _ = collect(sdl2.transform_export("Ellipse", 3.0, 2.0, 1.0, -1.0, t_start=0.0, t_end=1.0, dt=0.01,
+                                             chunk=10**6))
+    rows, sizes = collect(sdl2.transform_export("Ellipse", 3.0, 2.0, 1.0, -1.0, t_start=0.0, t_end=1.0, dt=0.01,
+                                                chunk=chunk))
+    assert len(whole) == 101
+    assert sizes == [min(chunk, 101 - i) for i in range(0, 101, chunk)]
+    np.testing.assert_array_equal(rows, whole)
+    np.testing.assert_array_equal(rows[:, 0], 0.01 * np.arange(101))
+
+
+def test_motion_rows_are_the_closed_form_state(sdl2):
+    params = dict(sdl2.MOTION_DEFAULTS, a=4.0, b=1.5, omega=1.3)
+    rows, sizes = collect(sdl2.motion_export("Ellipse/Circle", params, 0.25, 2.0, 0.05, chunk=8))
+    assert sizes == [8, 8, 8, 8, 4]
+    t = 0.25 + 0.05 * np.arange(36)
+    np.testing.assert_array_equal(rows[:, 0], t)
+    state = sdl2.motion_state("Ellipse/Circle", params, t)
+    np.testing.assert_allclose(rows[:, 1:7], np.column_stack(state), atol=1e-12)
+    np.testing.assert_allclose(rows[:, 7], np.hypot(rows[:, 3], rows[:, 4]), atol=1e-12)
+
+
+@pytest.mark.parametrize("model", ["Uniform field", "Uniform + quadratic drag", "Central force"])
+@pytest.mark.parametrize("chunk", [5, 64, 10**6])
+def test_physics_chunks_match_a_single_integrate(sdl2, model, chunk):
+    mtype = "Ellipse/Circle" if model == "Central force" else "Parabola-like"
+    params = dict(sdl2.MOTION_DEFAULTS)
+    rows, _ = collect(sdl2.motion_export(mtype, params, None, None, 0.02, (model, 0.3), chunk=chunk))
+    t0, _t1, _periodic = sdl2.motion_cycle(mtype, params)
+    field = sdl2.force_field(model, mtype, params, 0.3)
+    px, py, vx, vy, _ax, _ay = sdl2.motion_state(mtype, params, t0)
+    state0 = np.array([[px], [py], [vx], [vy], [0.0]])
+    states = sdl2.integrate(field, state0, 0.02, len(rows) - 1, "verlet" if field.drag is None else "rk4")
+    np.testing.assert_allclose(rows[:, 1:5], states[:, :4, 0], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("t_start", [-1.0, -0.737, 0.0129])
+def test_physics_export_starts_at_t_start(sdl2, t_start):
+    # A uniform field without drag is integrated exactly, on the dt grid or off it
+    params = dict(sdl2.MOTION_DEFAULTS, p=0.3, speed=1.4)
+    rows, _ = collect(sdl2.motion_export("Parabola-like", params, t_start, 1.5, 0.05, ("Uniform field", 0.2),
+                                         chunk=9))
+    t = t_start + 0.05 * np.arange(len(rows))
+    np.testing.assert_array_equal(rows[:, 0], t)
+    state = sdl2.motion_state("Parabola-like", params, t)
+    np.testing.assert_allclose(rows[:, 1:3], np.column_stack(state[:2]), atol=1e-9)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".npy"])
+def test_write_export_streams_every_chunk(sdl2, tmp_path, suffix):
+    path = str(tmp_path / f"motion{suffix}")
+    expected, _ = collect(sdl2.motion_export("Parabola-like", None, dt=0.1))
+    written = sdl2.write_export(path, *sdl2.motion_export("Parabola-like", None, dt=0.1, chunk=16))
+    assert written == len(expected)
+    if suffix == ".npy":
+        np.testing.assert_array_equal(np.load(path), expected)
+    else:
+        with open(path) as f:
+            assert f.readline().strip() == ",".join(sdl2.EXPORT_COLUMNS)
+        np.testing.assert_allclose(np.loadtxt(path, delimiter=",", skiprows=1), expected, rtol=1e-9, atol=1e-12)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+PARAMS = (1.3, 0.7, 1.1, 0.4, 0.9)  # a, b, omega, p, speed
+EXPRS = [
+    "a*cos(omega*t)",
+    "b*sin(2*omega*t) + t^3 - 2*t",
+    "exp(-0.3*t)*sin(t)",
+    "log(1 + t^2) / (2 + cos(t))",
+    "sqrt(t + 4) * atan(speed*t)",
+    "tanh(t) - cosh(0.5*t) + sinh(p*t)",
+    "tan(0.4*t) + abs(t - 0.2)",
+    "(t + 3)^(0.5*t)",
+    "1 / (t^2 + p)",
+]
+
+
+def central(f, t, h):
+    return (f(t + h, *PARAMS) - f(t - h, *PARAMS)) / (2 * h)
+
+
+@pytest.mark.parametrize("text", EXPRS)
+def test_diff_expr_matches_central_differences(sdl2, text):
+    tree = sdl2.parse_expr(text)
+    d1 = sdl2.diff_expr(tree)
+    d2 = sdl2.diff_expr(d1)
+    f, df, d2f = (sdl2._compile_tree(u) for u in (tree, d1, d2))
+    t = np.linspace(-1.5, 1.5, 41) + 0.0123  # off the kink of abs()
+    np.testing.assert_allclose(df(t, *PARAMS), central(f, t, 1e-5), rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(d2f(t, *PARAMS), central(df, t, 1e-5), rtol=1e-6, atol=1e-6)
+
+
+def test_constant_expression_is_shaped_like_t(sdl2):
+    c = sdl2.CompiledExpr("2*pi + a")
+    t = np.linspace(0, 1, 5)
+    np.testing.assert_allclose(c.f(t, *PARAMS), np.full(5, 2*np.pi + PARAMS[0]))
+    np.testing.assert_allclose(c.df(t, *PARAMS), np.zeros(5))
+
+
+@pytest.mark.parametrize("text", ["1e999*t", "10^400*t", "2^2000", "0^-1 + t", "1e308*10*t"])
+def test_out_of_range_constants_are_rejected(sdl2, text):
+    with pytest.raises(ValueError):
+        sdl2.CompiledExpr(text)
+
+
+@pytest.mark.parametrize("text", ["__import__('os')", "t.real", "foo(t)", "sin(t, t)", "t +"])
+def test_rejects_anything_outside_the_whitelist(sdl2, text):
+    with pytest.raises(ValueError):
+        sdl2.parse_expr(text)
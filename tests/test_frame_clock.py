@@ -0,0 +1,64 @@
+import pytest
+
+PERIOD = 1 / 32  # exact in binary, so the deadlines are too
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make(sdl2, fps=32.0):
+    # The first frame is due at once, as start_animation ticks right away
+    fake = FakeClock()
+    clock = sdl2.FrameClock(fps, clock=fake)
+    assert clock.tick() == 0.0
+    return clock, fake
+
+
+def test_frames_on_time_skip_nothing(sdl2):
+    clock, fake = make(sdl2)
+    for i in range(10):
+        assert clock.delay_ms() == 31  # the next deadline is one period away
+        fake.now += PERIOD
+        assert clock.tick() == PERIOD
+    assert clock.skipped == 0 and clock.frames == 11
+    assert clock.real_fps() == pytest.approx(32.0)
+
+
+def test_late_frames_skip_the_missed_deadlines(sdl2):
+    clock, fake = make(sdl2)
+    # The frame due at 1 period comes at 3.5: the deadlines at 2 and 3 are skipped
+    fake.now += 3.5 * PERIOD
+    assert clock.tick() == 3.5 * PERIOD
+    assert clock.skipped == 2
+    # Back on the grid, half a period before the next deadline, not catching up
+    assert clock.next_deadline == 100.0 + 4 * PERIOD
+    assert clock.delay_ms() == 16
+    fake.now = clock.next_deadline
+    clock.tick()
+    assert clock.skipped == 2
+
+
+def test_stalls_are_capped(sdl2):
+    clock, fake = make(sdl2)
+    fake.now += 5.0 + PERIOD / 2  # a window drag
+    assert clock.tick() == clock.max_step
+    assert clock.skipped == 159
+    assert clock.delay_ms() == 16
+
+
+def test_delay_is_never_zero(sdl2):
+    clock, fake = make(sdl2)
+    fake.now = clock.next_deadline  # due right now
+    assert clock.delay_ms() == 1
+
+
+def test_fps_is_clamped(sdl2):
+    clock, _fake = make(sdl2, fps=1000)
+    assert clock.target_fps == 240.0
+    clock.set_fps(0)
+    assert clock.target_fps == 1.0 and clock.period == 1.0
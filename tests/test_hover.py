@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+
+def brute_nearest(x, y, qx, qy):
+    return np.nanmin((x - qx) ** 2 + (y - qy) ** 2)
+
+
+@pytest.mark.parametrize("n", [1, 5, 259, 839, 4000])
+def test_point_grid_finds_the_nearest_sample(sdl2, n):
+    rng = np.random.default_rng(n)
+    t = np.sort(rng.uniform(0, 2 * np.pi, n))
+    x, y = 3 * np.cos(t), 2 * np.sin(2 * t)
+    if n > 2:
+        x[n // 3] = np.nan  # a gap between curves
+    grid = sdl2.PointGrid(x, y)
+    # Near the curve, anywhere in the view, and outside the samples' box
+    near = np.column_stack((x, y))[rng.integers(0, n, 200)] + rng.normal(0, 0.1, (200, 2))
+    queries = np.concatenate((near, rng.uniform(-4, 4, (200, 2)), rng.uniform(-20, 20, (50, 2))))
+    for qx, qy in queries[np.isfinite(queries).all(axis=1)]:
+        i = grid.nearest(qx, qy)
+        assert (x[i] - qx) ** 2 + (y[i] - qy) ** 2 == pytest.approx(brute_nearest(x, y, qx, qy), abs=1e-12)
+
+
+def test_point_grid_without_finite_points(sdl2):
+    assert sdl2.PointGrid([np.nan], [1.0]).nearest(0.0, 0.0) is None
+
+
+def test_point_grid_on_a_line(sdl2):
+    # A zero-height bounding box
+    grid = sdl2.PointGrid(np.linspace(0, 1, 101), np.zeros(101))
+    assert grid.nearest(0.505, 3.0) in (50, 51)
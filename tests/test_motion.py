@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+
+def params(sdl2, **overrides):
+    full = dict(sdl2.MOTION_DEFAULTS)
+    full.update(overrides)
+    return full
+
+
+@pytest.mark.parametrize("mtype", ["Ellipse/Circle", "Parabola-like"])
+def test_trajectory_lookup_matches_motion_state(sdl2, mtype):
+    p = params(sdl2, a=4.0, b=1.5, omega=1.3, p=0.4, speed=1.7, h=0.6, k=-0.8)
+    table = sdl2.TrajectoryTable(mtype, p, 0.01)
+    t0, t1, _periodic = sdl2.motion_cycle(mtype, p)
+    for t in np.linspace(t0, t1, 37):
+        px, py, vx, vy, ax, ay, speed = table.lookup(t)
+        exact = np.broadcast_arrays(*sdl2.motion_state(mtype, p, t))
+        # Linear interpolation on a grid of step/4 of dt = 0.01
+        assert [px, py, vx, vy, ax, ay] == pytest.approx([float(v) for v in exact], abs=1e-4)
+        assert speed == pytest.approx(np.hypot(vx, vy), abs=1e-4)
+
+
+def test_periodic_lookup_wraps(sdl2):
+    p = params(sdl2, omega=2.0)
+    table = sdl2.TrajectoryTable("Ellipse/Circle", p, 0.03)
+    period = np.pi
+    for t in (0.3, 1.1, 2.9):
+        assert table.lookup(t + period) == pytest.approx(table.lookup(t), abs=1e-12)
+        assert table.lookup(t - 2 * period) == pytest.approx(table.lookup(t), abs=1e-12)
+
+
+def test_open_lookup_clamps_to_the_ends(sdl2):
+    p = params(sdl2)
+    table = sdl2.TrajectoryTable("Parabola-like", p, 0.03)
+    assert table.lookup(-10.0) == table.lookup(-3.0) == table.rows[0].tolist()
+    assert table.lookup(10.0) == pytest.approx(table.rows[-1].tolist(), abs=1e-12)
+    assert table.lookup(3.0) == pytest.approx(table.rows[-1].tolist(), abs=1e-12)
+
+
+def test_ellipse_perimeter(sdl2):
+    circle = sdl2.ArcLengthTable("Ellipse/Circle", params(sdl2, a=2.0, b=2.0, omega=0.7))
+    assert circle.total == pytest.approx(4 * np.pi, rel=1e-12)
+    a, b = 5.0, 2.0
+    ellipse = sdl2.ArcLengthTable("Ellipse/Circle", params(sdl2, a=a, b=b))
+    # Ramanujan's second approximation, good to ~1e-7 at this eccentricity
+    h = ((a - b) / (a + b)) ** 2
+    assert ellipse.total == pytest.approx(np.pi * (a + b) * (1 + 3 * h / (10 + np.sqrt(4 - 3 * h))), rel=1e-6)
+
+
+def test_parabola_path_length(sdl2):
+    p, speed = 0.4, 1.5
+    table = sdl2.ArcLengthTable("Parabola-like", params(sdl2, p=p, speed=speed))
+    # y = p x^2 for x in [-3 speed, 3 speed]
+    x = 3 * speed
+    half = x / 2 * np.sqrt(1 + 4 * p * p * x * x) + np.arcsinh(2 * p * x) / (4 * p)
+    assert table.total == pytest.approx(2 * half, rel=1e-5)
+
+
+@pytest.mark.parametrize("mtype", ["Ellipse/Circle", "Parabola-like"])
+def test_arc_length_round_trip(sdl2, mtype):
+    table = sdl2.ArcLengthTable(mtype, params(sdl2, a=4.0, b=1.0))
+    t0, t1, periodic = sdl2.motion_cycle(mtype, params(sdl2))
+    # The end of a closed path is its start again
+    for t in np.linspace(t0, t1, 29, endpoint=not periodic):
+        assert table.t_at(table.s_at(t)) == pytest.approx(t, abs=1e-9)
+    s = np.linspace(0, table.total, 31, endpoint=not periodic)
+    assert [table.s_at(table.t_at(v)) for v in s] == pytest.approx(s, abs=1e-9)
+    assert table.times(s) == pytest.approx([table.t_at(v) for v in s], abs=1e-12)
+
+
+def test_arc_length_wraps_and_clamps(sdl2):
+    ellipse = sdl2.ArcLengthTable("Ellipse/Circle", params(sdl2))
+    assert ellipse.t_at(ellipse.total + 1.0) == pytest.approx(ellipse.t_at(1.0), abs=1e-12)
+    parabola = sdl2.ArcLengthTable("Parabola-like", params(sdl2))
+    assert parabola.t_at(-1.0) == -3.0
+    assert parabola.t_at(parabola.total + 1.0) == pytest.approx(3.0, abs=1e-12)
+    # An open path starts over past its end
+    assert parabola.advance(2.9, parabola.total) == -3.0
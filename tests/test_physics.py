@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+FIELDS = [
+    ("uniform", dict(g=(0.4, -9.8))),
+    ("uniform", dict(g=(0.4, -9.8), drag="linear", c=0.7)),
+    ("central", dict(w2=2.25, center=(0.5, -1.0))),
+]
+
+
+def starts():
+    # Three initial conditions integrated together: x, y, vx, vy, dissipated energy
+    return np.array([[0.0, 1.0, -2.0], [0.0, 0.5, 3.0], [1.0, -1.0, 0.2], [2.0, 0.0, -0.5], [0.0, 0.0, 0.0]])
+
+
+@pytest.mark.parametrize("kind, kw, method", [f + (m,) for f in FIELDS for m in ("rk4", "verlet")
+                                                if m == "rk4" or "drag" not in f[1]])
+def test_integrate_matches_the_analytic_solution(sdl2, kind, kw, method):
+    field = sdl2.ForceField(kind, **kw)
+    state0 = starts()
+    dt, n = 0.01, 300
+    states = sdl2.integrate(field, state0, dt, n, method, record_every=10)
+    t = dt * 10 * np.arange(len(states))[:, None]
+    x, y = field.analytic(state0, t)
+    tol = 1e-8 if method == "rk4" else 1e-3
+    np.testing.assert_allclose(states[:, 0], x, atol=tol)
+    np.testing.assert_allclose(states[:, 1], y, atol=tol)
+
+
+def test_rk4_is_fourth_order(sdl2):
+    field = sdl2.ForceField("central", w2=4.0)
+    state0 = starts()
+
+    def error(dt):
+        s = sdl2.integrate(field, state0, dt, int(round(2.0 / dt)))[-1]
+        x, _y = field.analytic(state0, 2.0)
+        return np.abs(s[0] - x).max()
+
+    assert error(0.04) / error(0.02) == pytest.approx(16, rel=0.1)
+
+
+def test_energy_is_conserved_with_quadratic_drag(sdl2):
+    # No closed form, but kinetic + potential + dissipated stays constant
+    field = sdl2.ForceField("uniform", g=(0.0, -9.8), drag="quadratic", c=0.3)
+    assert field.analytic(starts(), 1.0) is None
+    states = sdl2.integrate(field, starts(), 0.005, 400)
+    energy = field.energy(states)
+    np.testing.assert_allclose(energy, np.broadcast_to(energy[0], energy.shape), atol=1e-8)
+    assert (states[-1, 4] > 0).all()
+
+
+def test_verlet_refuses_drag(sdl2):
+    field = sdl2.ForceField("uniform", g=(0.0, -9.8), drag="linear", c=0.2)
+    with pytest.raises(ValueError):
+        sdl2.integrate(field, starts(), 0.01, 10, "verlet")
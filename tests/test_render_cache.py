@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def data(n, value=0.0):
+    # Shaped like transform_data: nested tuples of arrays, with gaps
+    return (np.full(n, value), (np.zeros(n), None), None)
+
+
+def test_size_accounting(sdl2):
+    cache = sdl2.RenderCache(max_bytes=10**6)
+    cache.store("a", data(100))
+    assert cache.nbytes == 2 * 100 * 8
+    cache.store("b", data(50), pixels=bytes(300), limits=((0, 1), (0, 1)))
+    assert cache.nbytes == 1600 + 800 + 300
+    # Replacing an entry swaps its size instead of adding to it
+    cache.store("a", data(10))
+    assert cache.nbytes == 160 + 1100
+    assert cache.nbytes == sum(entry[3] for entry in cache.entries.values())
+
+
+def test_entries_keep_their_own_arrays(sdl2):
+    cache = sdl2.RenderCache()
+    source = data(4, 1.0)
+    cache.store("k", source)
+    source[0][:] = 7.0  # the render reuses its buffers
+    stored, pixels, limits = cache.lookup("k")
+    np.testing.assert_array_equal(stored[0], np.ones(4))
+    assert stored[1][1] is None and stored[2] is None
+    assert pixels is None and limits is None
+
+
+def test_least_recently_used_entries_go_first(sdl2):
+    entry = 2 * 100 * 8
+    cache = sdl2.RenderCache(max_bytes=3 * entry)
+    for key in "abc":
+        cache.store(key, data(100))
+    cache.lookup("a")  # now the most recent
+    cache.store("d", data(100))
+    assert list(cache.entries) == ["c", "a", "d"]
+    assert cache.nbytes == 3 * entry
+    # An entry over the whole budget evicts everything, itself included
+    cache.store("huge", data(1000))
+    assert not cache.entries and cache.nbytes == 0
+
+
+def test_hit_counts(sdl2):
+    cache = sdl2.RenderCache()
+    cache.store("data", data(3))
+    cache.store("pixels", data(3), pixels=bytes(12), limits=((0, 1), (0, 1)))
+    assert cache.lookup("missing") == (None, None, None)
+    cache.lookup("data")
+    _data, pixels, limits = cache.lookup("pixels")
+    assert pixels == bytes(12) and limits == ((0, 1), (0, 1))
+    assert (cache.hits, cache.data_hits, cache.misses) == (1, 1, 1)
+
+
+def test_pixels_can_be_turned_off(sdl2):
+    cache = sdl2.RenderCache(pixels=False)
+    cache.store("k", data(3), pixels=bytes(12), limits=((0, 1), (0, 1)))
+    assert cache.lookup("k")[1:] == (None, None)
+    assert cache.nbytes == 48
+
+
+def test_canvas_resize_clears(sdl2):
+    cache = sdl2.RenderCache()
+    cache.check_size((640, 480, 100))
+    assert cache.invalidations == 0  # nothing to drop yet
+    cache.store("k", data(3))
+    cache.check_size((640, 480, 100))
+    assert "k" in cache.entries
+    cache.check_size((800, 480, 100))
+    assert not cache.entries and cache.nbytes == 0 and cache.invalidations == 1
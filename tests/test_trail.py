@@ -0,0 +1,70 @@
+import numpy as np
+
+
+def points(trail):
+    # Stored points (vertex 0 of a run repeats the previous run's last point)
+    xy = trail.runs[:, 1:].reshape(-1, 2)
+    return xy[~np.isnan(xy[:, 0])]
+
+
+def test_ring_keeps_the_newest_points(sdl2):
+    trail = sdl2.MotionTrail(10, max_paths=5)
+    assert (trail.chunk, trail.n_runs) == (2, 5)
+    for i in range(23):
+        trail.push(float(i), 0.0, 1.0)
+    # Whole runs are overwritten: 14..21 in full runs, 22 starting the next
+    assert sorted(points(trail)[:, 0]) == list(range(14, 23))
+    assert trail.head == 3 and trail.filled_runs == 5
+    # Each run starts where the one before it ended, across the wrap too
+    np.testing.assert_array_equal(trail.runs[0, 0], (19.0, 0.0))
+    np.testing.assert_array_equal(trail.runs[1, :2], [(21.0, 0.0), (22.0, 0.0)])
+
+
+def test_jump_starts_a_new_run(sdl2):
+    trail = sdl2.MotionTrail(12, max_paths=4)
+    for i in range(4):
+        trail.push(float(i), 0.0, 1.0)
+    trail.push(-3.0, 5.0, 1.0, connect=False)
+    # Run 1 stops at point 3; the jump opens run 2 with nothing joining it
+    assert np.isnan(trail.runs[2, 0]).all()
+    np.testing.assert_array_equal(trail.runs[2, 1], (-3.0, 5.0))
+    assert trail.head == 7
+    trail.push(-2.0, 5.0, 1.0)
+    np.testing.assert_array_equal(trail.runs[2, 2], (-2.0, 5.0))
+
+
+def test_alpha_fades_with_run_age(sdl2):
+    trail = sdl2.MotionTrail(8, max_paths=4)
+    for i in range(5):
+        trail.push(float(i), 0.0, float(i))
+    trail.update_colors()
+    # Runs 0, 1 full, run 2 newest; run 3 empty
+    np.testing.assert_allclose(trail.rgba[:, 3], [1 / 3, 2 / 3, 1.0, 0.0])
+    np.testing.assert_allclose(trail.rgba[:, :3], np.broadcast_to(sdl2.TRAIL_RGB, (4, 3)))
+
+
+def test_colors_by_speed(sdl2):
+    trail = sdl2.MotionTrail(8, max_paths=4)
+    trail.make_collection()
+    for i, speed in enumerate([1.0, 1.0, 2.0, 2.0, 4.0]):
+        trail.push(float(i), 0.0, speed)
+    trail.update_colors(by_speed=True)
+    lut = trail._lut
+    np.testing.assert_array_equal(trail.rgba[:, :3], lut[[63, 127, 255, 0], :3])
+
+
+def test_clear_and_collection_follow_the_ring(sdl2):
+    trail = sdl2.MotionTrail(6, max_paths=3)
+    lc = trail.make_collection()
+    for i in range(8):
+        trail.push(float(i), 1.0, 1.0)
+    trail.update_colors()
+    trail.sync()
+    segments = lc.get_segments()
+    assert len(segments) == trail.n_runs
+    for seg, run in zip(segments, trail.runs):
+        np.testing.assert_array_equal(seg, run)
+    trail.clear()
+    assert len(points(trail)) == 0 and trail.head == 0 and trail.filled_runs == 0
+    trail.push(9.0, 9.0, 1.0)
+    assert np.isnan(trail.runs[0, 0]).all()  # nothing to connect to after a clear